@@ -1,5 +1,9 @@
+import codecs
+import hashlib
+import os
 import time
-from PyQt5.QtWidgets import QMessageBox
+from collections import OrderedDict
+from typing import NamedTuple
 
 # 导入必要的类，以便进行类型检查和方法调用
 try:
@@ -45,254 +49,504 @@ except ImportError:
         pass
 
 
-class DSLHandler:
-    def __init__(self, visualizer):
-        """
-        :param visualizer: 当前激活的可视化窗口实例 (如 StackVisualizer, BinaryTreeVisualizer)
-        """
-        self.vis = visualizer
-        self.ds = visualizer.data_structure
+# ==================== 编译：脚本 -> 指令列表 ====================
+# 脚本先整体编译为 Operation 列表（指令名规范化、参数预先解析、按结构类型校验，错误带行号），
+# 执行时按结构类型的跳转表分派，不再逐行切分字符串、走 if/elif 链。
 
-    def execute_script(self, script_text, flag):
-        lines = script_text.strip().split('\n')
-        errors = []
+COMPILE_CACHE_SIZE = 64  # 按内容哈希缓存的编译结果个数
+PROGRESS_EVERY = 10000  # 流式执行时每隔多少行回报一次进度
 
-        # flag=1 表示禁用动画 (由 BaseVisualizer.run_dsl 传入)
-        if flag == 1:
-            # 暂停动画计时器
-            if hasattr(self.vis, 'anim_timer'):
-                self.vis.anim_timer.stop()
-                self.vis.visual_area.anim_state = {}
+COMMAND_ALIASES = {'REMOVE': 'DELETE'}
+KNOWN_COMMANDS = ('BUILD', 'ENQUEUE', 'DEQUEUE', 'INSERT', 'DELETE')
 
-            # 对于 BST/Tree/AVL，直接执行操作
-            is_tree_visualizer = self.vis.__class__.__name__ in ['BinaryTreeVisualizer', 'BinarySearchTreeVisualizer',
-                                                                 'HuffmanTreeVisualizer', 'AVLTreeVisualizer']
 
-            # 对于线性结构，需要清空动画状态，否则绘图会出错
-            if hasattr(self.vis.visual_area, 'anim_state'):
-                self.vis.visual_area.anim_state = {}
+class Operation(NamedTuple):
+    """编译后的一条指令：opcode 为规范化的指令名，args 为解析好的参数，line 为源脚本中的行号"""
+    opcode: str
+    args: tuple
+    line: int
 
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
 
-            try:
-                self._parse_and_run_line(line)
-            except Exception as e:
-                errors.append(f"Line {line_num}: {str(e)}")
+class RunStats(NamedTuple):
+    """流式执行的进度 / 结果：已处理到的行号、成功执行的指令数、错误数、已读字节数与文件总字节数（未知时为 None）"""
+    lines: int
+    operations: int
+    errors: int
+    bytes_read: int
+    total_bytes: object
 
-        # 确保执行完毕后刷新显示
-        self.vis.update_display()
+    @property
+    def fraction(self):
+        """按字节计算的完成比例，总大小未知时为 None"""
+        if not self.total_bytes:
+            return None
+        return min(1.0, self.bytes_read / self.total_bytes)
 
-        if errors:
-            return "\n".join(errors)
-        return "执行成功"
 
-    def _get_val_from_str(self, val_str):
-        """尝试将字符串转换为数字，否则保留为字符串"""
-        val_str = val_str.strip()
+class CompiledScript:
+    """一段脚本针对某种结构的编译结果（只读，可在多次执行间共享）"""
+
+    def __init__(self, structure_type, operations, errors):
+        self.structure_type = structure_type
+        self.operations = tuple(operations)
+        self.errors = tuple(errors)  # ((行号, 错误信息), ...)
+
+    def __len__(self):
+        return len(self.operations)
+
+
+def _to_value(text):
+    """尝试将字符串转换为整数，否则保留为字符串"""
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+# --- 参数解析函数：(指令名, 参数字符串列表) -> 参数元组，参数不合法时抛出 ValueError ---
+def _parse_none(cmd, args):
+    return ()
+
+
+def _parse_values(cmd, args):
+    """逗号分隔的一组值，忽略空项"""
+    return tuple(_to_value(arg) for arg in args if arg)
+
+
+def _parse_keys(cmd, args):
+    """BST / AVL 的插入、删除：每一项都是一个键"""
+    return tuple(_to_value(arg) for arg in args)
+
+
+def _parse_count(cmd, args):
+    """DEQUEUE: n，缺省或不是数字时为 1"""
+    if args and args[0]:
+        try:
+            return (int(args[0]),)
+        except ValueError:
+            pass
+    return (1,)
+
+
+def _parse_index(cmd, args):
+    try:
+        return (int(args[0]),)
+    except (ValueError, IndexError):
+        raise ValueError(f"{cmd} 索引参数必须为整数")
+
+
+def _parse_linear_insert(cmd, args):
+    """INSERT: value[, index]，缺省 index 为 -1（尾插）"""
+    index = -1
+    if len(args) == 2:
         try:
-            return int(val_str)
+            index = int(args[1])
         except ValueError:
-            return val_str
-
-    def _parse_and_run_line(self, line):
-        # 分割指令和参数，例如 "INSERT: 50" -> ["INSERT", "50"]
-        if ':' not in line:
-            # 特殊情况：DEQUEUE 可能没有参数，但为了统一格式，建议还是带冒号
-            # 或者在这里做一个宽容处理，如果指令是 DEQUEUE 且没冒号，视为无参
-            if line.strip().upper() == 'DEQUEUE':
-                cmd = 'DEQUEUE'
-                args = []
-            else:
-                raise ValueError("语法错误，缺少冒号 (格式: COMMAND: args)")
+            raise ValueError("INSERT 索引参数必须为整数")
+    return _to_value(args[0]), index
+
+
+def _parse_child_insert(cmd, args):
+    """BinaryTree INSERT: p_idx, value, L/R"""
+    if len(args) != 3:
+        raise ValueError("BinaryTree INSERT 格式: INSERT: p_idx, value, L/R")
+    try:
+        parent_index = int(args[0])
+    except ValueError:
+        raise ValueError("父节点索引必须为整数")
+    direction = args[2].strip().upper()
+    if direction not in ('L', 'R'):
+        raise ValueError("方向参数必须是 L 或 R")
+    return parent_index, _to_value(args[1]), direction
+
+
+def _parse_weights(cmd, args):
+    """HuffmanTree BUILD: A:10, B:20"""
+    weights = {}
+    for item in args:
+        if ':' in item:
+            key, value = item.split(':', 1)
+            try:
+                weights[key.strip()] = int(value.strip())
+            except ValueError:
+                raise ValueError(f"BUILD 参数错误: 哈夫曼树权重必须为整数 ({item})")
+    return tuple(weights.items())
+
+
+_LINEAR_LIST_GRAMMAR = {'BUILD': _parse_values, 'INSERT': _parse_linear_insert, 'DELETE': _parse_index}
+_SEARCH_TREE_GRAMMAR = {'BUILD': _parse_values, 'INSERT': _parse_keys, 'DELETE': _parse_keys}
+
+# 结构类型 -> {指令: 参数解析函数}；执行期的跳转表（DSLHandler._JUMP_TABLE）与之一一对应
+GRAMMAR = {
+    'Stack': {'BUILD': _parse_values, 'INSERT': _parse_linear_insert, 'DELETE': _parse_none},
+    'Queue': {'BUILD': _parse_values, 'ENQUEUE': _parse_values, 'DEQUEUE': _parse_count},
+    'SequenceList': _LINEAR_LIST_GRAMMAR,
+    'LinkedList': _LINEAR_LIST_GRAMMAR,
+    'BinaryTree': {'BUILD': _parse_values, 'INSERT': _parse_child_insert, 'DELETE': _parse_index},
+    'BinarySearchTree': _SEARCH_TREE_GRAMMAR,
+    'AVLTree': _SEARCH_TREE_GRAMMAR,
+    'HuffmanTree': {'BUILD': _parse_weights},
+}
+_DEFAULT_GRAMMAR = {'BUILD': _parse_none}  # 其他结构只支持 BUILD（清空）
+
+
+def _split_line(line):
+    """'INSERT: 50, 2' -> ('INSERT', ['50', '2'])；指令名规范化为大写并展开别名"""
+    if ':' not in line:
+        # DEQUEUE 允许不带冒号和参数
+        if line.upper() == 'DEQUEUE':
+            return 'DEQUEUE', []
+        raise ValueError("语法错误，缺少冒号 (格式: COMMAND: args)")
+    cmd, args_str = line.split(':', 1)
+    cmd = cmd.strip().upper()
+    return COMMAND_ALIASES.get(cmd, cmd), [arg.strip() for arg in args_str.split(',')]
+
+
+def _compile_line(line, line_num, grammar, structure_type):
+    """编译一行（已去掉首尾空白且非空、非注释），参数不合法时抛出异常"""
+    cmd, args = _split_line(line)
+    parse = grammar.get(cmd)
+    if parse is None:
+        if cmd not in KNOWN_COMMANDS:
+            raise ValueError(f"未知指令: {cmd}")
+        raise ValueError(f"{cmd} 指令不适用于 {structure_type}")
+    return Operation(cmd, parse(cmd, args), line_num)
+
+
+def _compile(script_text, structure_type):
+    grammar = GRAMMAR.get(structure_type, _DEFAULT_GRAMMAR)
+    operations, errors = [], []
+    for line_num, line in enumerate(script_text.strip().split('\n'), 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            operations.append(_compile_line(line, line_num, grammar, structure_type))
+        except Exception as e:
+            errors.append((line_num, str(e)))
+    return CompiledScript(structure_type, operations, errors)
+
+
+_compile_cache = OrderedDict()  # (结构类型, 脚本内容的哈希) -> CompiledScript
+
+
+def compile_script(script_text, structure_type):
+    """
+    把脚本编译为针对 structure_type（结构的类名）的 CompiledScript。
+    结果按 (结构类型, 内容哈希) 缓存，重复执行同一脚本时跳过解析。
+    """
+    key = (structure_type, hashlib.sha1(script_text.encode('utf-8')).hexdigest())
+    compiled = _compile_cache.get(key)
+    if compiled is not None:
+        _compile_cache.move_to_end(key)
+        return compiled
+    compiled = _compile(script_text, structure_type)
+    _compile_cache[key] = compiled
+    if len(_compile_cache) > COMPILE_CACHE_SIZE:
+        _compile_cache.popitem(last=False)
+    return compiled
+
+
+# ==================== 流式读取与编译 ====================
+# 大文件按 读取 -> 编译 -> 执行 的生成器流水线逐行处理，内存占用与文件大小无关。
+
+def iter_script_lines(source):
+    """
+    逐行读取 DSL。source 为文件路径或已打开的文件对象（二进制或文本模式均可），
+    产出 (行号, 文本, 已读字节数)；文本模式下按文件编码重新编码每行来估算字节数
+    （换行符被转换过时略有偏小，只用于显示进度）。
+    """
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from iter_script_lines(f)
+        return
+    encoding = getattr(source, 'encoding', None) or 'utf-8'
+    try:
+        if codecs.lookup(encoding).name == 'utf-8-sig':
+            encoding = 'utf-8'  # utf-8-sig 每次编码都会带上 BOM，逐行估算时按 utf-8 计
+    except LookupError:
+        encoding = 'utf-8'
+    bytes_read = 0
+    for line_num, raw in enumerate(source, 1):
+        if isinstance(raw, bytes):
+            bytes_read += len(raw)
+            raw = raw.decode('utf-8')
         else:
-            cmd, args_str = line.split(':', 1)
-            cmd = cmd.strip().upper()
-            # 移除空参数，并保留所有参数，包括可能的空格
-            args = [x.strip() for x in args_str.split(',')]
+            bytes_read += len(raw.encode(encoding, errors='replace'))
+        if line_num == 1:
+            raw = raw.lstrip('\ufeff')  # 去掉 UTF-8 BOM
+        yield line_num, raw, bytes_read
+
+
+def iter_operations(numbered_lines, structure_type):
+    """
+    把 iter_script_lines 产出的行流编译为 (行号, Operation, 错误信息, 已读字节数)，
+    Operation 与错误信息二者恰有一个为 None；空行与注释直接跳过。
+    """
+    grammar = GRAMMAR.get(structure_type, _DEFAULT_GRAMMAR)
+    for line_num, line, bytes_read in numbered_lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            yield line_num, _compile_line(line, line_num, grammar, structure_type), None, bytes_read
+        except Exception as e:
+            yield line_num, None, str(e), bytes_read
+
+
+def _source_size(source):
+    """文件的总字节数，无法得知时返回 None"""
+    try:
+        if isinstance(source, (str, bytes, os.PathLike)):
+            return os.path.getsize(source)
+        return os.fstat(source.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+# ==================== 执行 ====================
+
+class DSLEngine:
+    """
+    不依赖界面的 DSL 执行核心：直接作用于 model 中的数据结构对象，可在没有显示环境的服务器上批量处理。
+    BinaryTree 的 BUILD 会换成新的树对象，执行后请从 engine.ds 取结果。
+    """
+
+    # 结构类型 -> {指令: 执行方法名}，与 GRAMMAR 一一对应
+    _JUMP_TABLE = {
+        'Stack': {'BUILD': '_build_stack', 'INSERT': '_push', 'DELETE': '_pop'},
+        'Queue': {'BUILD': '_build_queue', 'ENQUEUE': '_enqueue', 'DEQUEUE': '_dequeue'},
+        'SequenceList': {'BUILD': '_build_list', 'INSERT': '_insert_at', 'DELETE': '_remove_at'},
+        'LinkedList': {'BUILD': '_build_list', 'INSERT': '_insert_at', 'DELETE': '_remove_at'},
+        'BinaryTree': {'BUILD': '_build_binary_tree', 'INSERT': '_insert_child', 'DELETE': '_remove_subtree'},
+        'BinarySearchTree': {'BUILD': '_build_search_tree', 'INSERT': '_insert_keys', 'DELETE': '_delete_keys'},
+        'AVLTree': {'BUILD': '_bulk_load', 'INSERT': '_insert_keys', 'DELETE': '_delete_keys'},
+        'HuffmanTree': {'BUILD': '_build_huffman'},
+    }
+    _DEFAULT_JUMP_TABLE = {'BUILD': '_clear'}
+
+    def __init__(self, data_structure):
+        self.ds = data_structure
+
+    def _set_structure(self, ds):
+        """换成新的结构对象（BinaryTree 的 BUILD 需要重新创建根节点）"""
+        self.ds = ds
+
+    def run_script(self, script_text):
+        """执行一段脚本，返回按行号排序的错误 [(行号, 错误信息)]"""
+        compiled = compile_script(script_text, self.ds.__class__.__name__)
+        errors = list(compiled.errors) + self.run_compiled(compiled)
+        errors.sort(key=lambda item: item[0])
+        return errors
+
+    def _jump_table(self, structure_type):
+        names = self._JUMP_TABLE.get(structure_type, self._DEFAULT_JUMP_TABLE)
+        return {opcode: getattr(self, name) for opcode, name in names.items()}
+
+    def run_compiled(self, compiled):
+        """按跳转表依次执行编译好的指令，返回运行期错误 [(行号, 错误信息)]"""
+        table = self._jump_table(compiled.structure_type)
+        errors = []
+        for op in compiled.operations:
+            try:
+                table[op.opcode](*op.args)
+            except Exception as e:
+                errors.append((op.line, str(e)))
+        return errors
 
+    def run_file(self, source, on_progress=None, on_error=None, progress_every=PROGRESS_EVERY):
+        """
+        流式执行 DSL 文件（source 为路径或文件对象），适合回放很长的操作记录。
+        错误不会累积在内存中：每条错误调用一次 on_error(行号, 错误信息)；
+        每处理 progress_every 行以及结束时调用一次 on_progress(RunStats)。
+        Returns:
+            RunStats: 最终统计
+        """
         structure_type = self.ds.__class__.__name__
-
-        # === 1. BUILD 指令 (批量构建/初始化) ===
-        if cmd == 'BUILD':
-            if hasattr(self.ds, 'clear'):
-                self.ds.clear()
-
-            # HuffmanTree 需要特殊处理：BUILD: A:10, B:20
-            if structure_type == 'HuffmanTree':
-                weight_dict = {}
-                for item in args:
-                    if ':' in item:
-                        k, v = item.split(':', 1)
-                        try:
-                            weight_dict[k.strip()] = int(v.strip())
-                        except ValueError:
-                            raise ValueError(f"BUILD 参数错误: 哈夫曼树权重必须为整数 ({item})")
-                if weight_dict:
-                    self.ds.build_from_weights(weight_dict)
-                return
-
-            # 其他线性结构和树结构视为批量插入
-            vals = [self._get_val_from_str(val) for val in args if val]
-
-            if structure_type == 'Stack':
-                for val in vals: self.ds.push(val)
-            elif structure_type == 'Queue':  # [新增] 队列批量构建
-                for val in vals: self.ds.enqueue(val)
-            elif structure_type == 'SequenceList':
-                for i, val in enumerate(vals): self.ds.insert(self.ds.length(), val)  # 默认尾插
-            elif structure_type == 'LinkedList':
-                for val in vals: self.ds.append(val)
-
-            elif structure_type in ['BinaryTree', 'BinarySearchTree', 'AVLTree']:
-                if not vals: return
-
-                # 对于 BinaryTree，第一个元素视为根节点
-                if structure_type == 'BinaryTree':
-                    self.vis.data_structure = BinaryTree(vals[0])
-                    self.ds = self.vis.data_structure
-                    for i, val in enumerate(vals[1:]):
-                        parent_idx = (i + 1 - 1) // 2
-                        try:
-                            if (i + 1) % 2 != 0:
-                                self.ds.insert_left(parent_idx, val)
-                            else:
-                                self.ds.insert_right(parent_idx, val)
-                        except (IndexError, ValueError):
-                            pass
-
-                elif structure_type in ['BinarySearchTree', 'AVLTree']:
-                    for val in vals: self.ds.insert(val)
-
-        # === 2. ENQUEUE 指令 (Queue 专用) ===
-        elif cmd == 'ENQUEUE':
-            if structure_type != 'Queue':
-                raise ValueError("ENQUEUE 指令仅适用于队列 (Queue)")
-
-            for item in args:
-                if not item: continue
-                val = self._get_val_from_str(item)
-                self.ds.enqueue(val)
-
-        # === 3. DEQUEUE 指令 (Queue 专用) ===
-        elif cmd == 'DEQUEUE':
-            if structure_type != 'Queue':
-                raise ValueError("DEQUEUE 指令仅适用于队列 (Queue)")
-
-            # 默认出队 1 次，如果指定了参数 (如 DEQUEUE: 2)，则出队 n 次
-            count = 1
-            if args and args[0]:
-                try:
-                    count = int(args[0])
-                except ValueError:
-                    pass  # 如果参数不是数字，忽略，默认1次
-
-            for _ in range(count):
-                if self.ds.is_empty():
-                    # 队列空时停止或报错，这里选择安全停止
-                    break
-                self.ds.dequeue()
-
-        # === 4. INSERT 指令 ===
-        elif cmd == 'INSERT':
-            if not args:
-                raise ValueError("INSERT 缺少参数")
-
-            # --- 线性结构 ---
-            if structure_type in ['Stack', 'SequenceList', 'LinkedList']:
-                val = self._get_val_from_str(args[0])
-                idx = -1
-
-                if len(args) == 2:
-                    try:
-                        idx = int(args[1])
-                    except ValueError:
-                        raise ValueError("INSERT 索引参数必须为整数")
-
-                if structure_type == 'Stack':
-                    self.ds.push(val)
-                elif structure_type in ['SequenceList', 'LinkedList']:
-                    if idx == -1 or idx == self.ds.length():
-                        self.ds.insert(self.ds.length(), val)
-                    elif 0 <= idx < self.ds.length():
-                        self.ds.insert(idx, val)
-                    else:
-                        raise IndexError(f"INSERT 索引 {idx} 超出范围")
-
-            # --- 树结构 ---
-            elif structure_type in ['BinarySearchTree', 'AVLTree']:
-                for item in args:
-                    val = self._get_val_from_str(item)
-                    self.ds.insert(val)
-
-            elif structure_type == 'BinaryTree':
-                if len(args) != 3:
-                    raise ValueError("BinaryTree INSERT 格式: INSERT: p_idx, value, L/R")
+        table = self._jump_table(structure_type)
+        total_bytes = _source_size(source)
+        operations = errors = 0
+        next_report = progress_every
+        read = [0, 0]  # 最近读到的 (行号, 已读字节数)，空行与注释也计入
+
+        def numbered_lines():
+            for line_num, text, bytes_read in iter_script_lines(source):
+                read[0], read[1] = line_num, bytes_read
+                yield line_num, text, bytes_read
+
+        for line_num, op, error, _ in iter_operations(numbered_lines(), structure_type):
+            if op is not None:
                 try:
-                    p_idx = int(args[0])
-                except ValueError:
-                    raise ValueError("父节点索引必须为整数")
-                val = self._get_val_from_str(args[1])
-                direction = args[2].strip().upper()
-
-                if self.ds.is_empty() and p_idx == 0:
-                    raise ValueError("空树请使用 BUILD 命令创建根节点")
-
-                if direction == 'L':
-                    self.ds.insert_left(p_idx, val)
-                elif direction == 'R':
-                    self.ds.insert_right(p_idx, val)
+                    table[op.opcode](*op.args)
+                    operations += 1
+                except Exception as e:
+                    error = str(e)
+            if error is not None:
+                errors += 1
+                if on_error is not None:
+                    on_error(line_num, error)
+            if on_progress is not None and read[0] >= next_report:
+                next_report = read[0] + progress_every
+                on_progress(RunStats(read[0], operations, errors, read[1], total_bytes))
+
+        stats = RunStats(read[0], operations, errors, read[1], total_bytes)
+        if on_progress is not None:
+            on_progress(stats)
+        return stats
+
+    def _get_val_from_str(self, val_str):
+        """尝试将字符串转换为数字，否则保留为字符串"""
+        return _to_value(val_str)
+
+    # --- BUILD ---
+    def _clear(self):
+        if hasattr(self.ds, 'clear'):
+            self.ds.clear()
+
+    def _build_stack(self, *vals):
+        self._clear()
+        self.ds.push_many(vals)
+
+    def _build_queue(self, *vals):
+        self._clear()
+        self.ds.enqueue_many(vals)
+
+    def _build_list(self, *vals):
+        self._clear()
+        self.ds.extend(vals)  # 默认尾插
+
+    def _build_binary_tree(self, *vals):
+        self._clear()
+        if not vals: return
+        # 第一个元素视为根节点，其余按层序依次挂到左右孩子上
+        self._set_structure(BinaryTree(vals[0]))
+        for i, val in enumerate(vals[1:], 1):
+            parent_idx = (i - 1) // 2
+            try:
+                if i % 2 != 0:
+                    self.ds.insert_left(parent_idx, val)
                 else:
-                    raise ValueError("方向参数必须是 L 或 R")
-
-        # === 5. DELETE/REMOVE 指令 ===
-        elif cmd in ['DELETE', 'REMOVE']:
-            if not args and structure_type != 'Stack':
-                # Stack DELETE 可以无参(Pop)，其他通常需要参数
-                if structure_type not in ['Stack', 'Queue']:  # Queue has DEQUEUE, handled above
-                    raise ValueError(f"{cmd} 缺少参数")
-
-            if structure_type in ['Stack', 'SequenceList', 'LinkedList']:
-                if structure_type == 'Stack':
-                    if self.ds.is_empty():
-                        raise IndexError("栈为空，无法 pop")
-                    self.ds.pop()
-                    return
+                    self.ds.insert_right(parent_idx, val)
+            except (IndexError, ValueError):
+                pass
+
+    def _build_search_tree(self, *vals):
+        # BST 的形状取决于插入顺序，按脚本给出的顺序逐个插入
+        self._clear()
+        self.ds.insert_many(vals)
+
+    def _bulk_load(self, *vals):
+        # AVL 只要求平衡，直接按有序序列建成平衡树
+        self.ds.bulk_load(vals)
+
+    def _build_huffman(self, *weights):
+        self._clear()
+        if weights:
+            self.ds.build_from_weights(dict(weights))
+
+    # --- 线性结构 ---
+    def _push(self, val, idx):
+        self.ds.push(val)
+
+    def _pop(self):
+        if self.ds.is_empty():
+            raise IndexError("栈为空，无法 pop")
+        self.ds.pop()
+
+    def _enqueue(self, *vals):
+        self.ds.enqueue_many(vals)
+
+    def _dequeue(self, count):
+        for _ in range(count):
+            if self.ds.is_empty():
+                # 队列空时安全停止
+                break
+            self.ds.dequeue()
+
+    def _insert_at(self, val, idx):
+        length = self.ds.length()
+        if idx == -1 or idx == length:
+            self.ds.insert(length, val)
+        elif 0 <= idx < length:
+            self.ds.insert(idx, val)
+        else:
+            raise IndexError(f"INSERT 索引 {idx} 超出范围")
 
-                try:
-                    idx = int(args[0])
-                except ValueError:
-                    raise ValueError("DELETE 索引参数必须为整数")
+    def _remove_at(self, idx):
+        if 0 <= idx < self.ds.length():
+            self.ds.remove(idx)
+        else:
+            raise IndexError(f"DELETE 索引 {idx} 超出范围")
+
+    # --- 树结构 ---
+    def _insert_child(self, p_idx, val, direction):
+        if self.ds.is_empty() and p_idx == 0:
+            raise ValueError("空树请使用 BUILD 命令创建根节点")
+        if direction == 'L':
+            self.ds.insert_left(p_idx, val)
+        else:
+            self.ds.insert_right(p_idx, val)
 
-                if 0 <= idx < self.ds.length():
-                    self.ds.remove(idx)
-                else:
-                    raise IndexError(f"DELETE 索引 {idx} 超出范围")
+    def _remove_subtree(self, idx):
+        node_to_del = self.ds._get_node(idx)
+        if not node_to_del:
+            raise IndexError(f"BinaryTree 中索引 {idx} 节点不存在")
+        self.ds.remove_subtree(node_to_del)
 
-            elif structure_type in ['BinarySearchTree', 'AVLTree']:
-                for item in args:
-                    val = self._get_val_from_str(item)
-                    if not self.ds.delete(val):
-                        raise ValueError(f"BST/AVL 中未找到要删除的元素: {val}")
+    def _insert_keys(self, *vals):
+        self.ds.insert_many(vals)
 
-            elif structure_type == 'BinaryTree':
-                try:
-                    idx = int(args[0])
-                except ValueError:
-                    raise ValueError("BinaryTree DELETE 索引参数必须为整数")
-                node_to_del = self.ds._get_node(idx)
-                if not node_to_del:
-                    raise IndexError(f"BinaryTree 中索引 {idx} 节点不存在")
-                if node_to_del == self.ds.root:
-                    self.ds.clear()
-                else:
-                    if node_to_del.parent.left_child == node_to_del:
-                        node_to_del.parent.left_child = None
-                    else:
-                        node_to_del.parent.right_child = None
-                    self.ds._size -= 1
+    def _delete_keys(self, *vals):
+        missing = self.ds.delete_many(vals)
+        if missing:
+            raise ValueError(f"BST/AVL 中未找到要删除的元素: {', '.join(map(str, missing))}")
 
-        else:
-            raise ValueError(f"未知指令: {cmd}")
\ No newline at end of file
+
+class DSLHandler(DSLEngine):
+    """界面中的 DSL 执行器：在 DSLEngine 之上负责停止动画、同步可视化窗口的结构并刷新显示"""
+
+    def __init__(self, visualizer):
+        """
+        :param visualizer: 当前激活的可视化窗口实例 (如 StackVisualizer, BinaryTreeVisualizer)
+        """
+        super().__init__(visualizer.data_structure)
+        self.vis = visualizer
+
+    def _set_structure(self, ds):
+        self.vis.data_structure = ds
+        self.ds = ds
+
+    def _stop_animations(self):
+        # 暂停动画计时器
+        if hasattr(self.vis, 'stop_animations'):
+            self.vis.stop_animations()
+            self.vis.visual_area.anim_state = {}
+        elif hasattr(self.vis, 'anim_timer'):
+            self.vis.anim_timer.stop()
+            self.vis.visual_area.anim_state = {}
+
+        # 对于线性结构，需要清空动画状态，否则绘图会出错
+        if hasattr(self.vis.visual_area, 'anim_state'):
+            self.vis.visual_area.anim_state = {}
+
+    def execute_script(self, script_text, flag):
+        # flag=1 表示禁用动画 (由 BaseVisualizer.run_dsl 传入)
+        if flag == 1:
+            self._stop_animations()
+
+        errors = self.run_script(script_text)
+
+        # 确保执行完毕后刷新显示
+        self.vis.update_display()
+
+        if errors:
+            return "\n".join(f"Line {line_num}: {message}" for line_num, message in errors)
+        return "执行成功"
+
+    def run_file(self, source, on_progress=None, on_error=None, progress_every=PROGRESS_EVERY):
+        """流式执行 DSL 文件（不播放动画），结束后刷新显示；参数与返回值见 DSLEngine.run_file"""
+        self._stop_animations()
+        stats = super().run_file(source, on_progress, on_error, progress_every)
+        self.vis.update_display()
+        return stats
@@ -0,0 +1,339 @@
+"""
+时间驱动的动画引擎
+
+- AnimationClock：全局共享的时钟（一个约 60 FPS 的 QTimer），所有动画在同一帧内推进；
+- Tween：在 duration 毫秒内按真实流逝时间计算进度，经缓动函数映射后回调 on_update；
+- Timeline：顺序执行 Tween / 回调 / 等待，也可以用 parallel 并行一组 Tween；
+  上一步结束的时刻就是下一步开始的时刻，不会因为帧间隔而累积误差；
+- ClockTimer：与 QTimer 接口兼容（setInterval / start / stop / isActive / timeout），
+  由共享时钟驱动，供仍按“每次触发前进一步”编写的旧动画使用。
+
+掉帧处理：进度只取决于真实时间，帧间隔变长时直接跳到对应进度；ClockTimer 落后时最多补发
+max_catch_up 次，之后丢弃积压。动画回调中标记的控件在每帧末尾统一重绘一次
+（控件提供 update_animated 时只重绘动画所在的区域）。
+"""
+import time
+
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+try:
+    from PyQt5 import sip
+except ImportError:
+    import sip
+
+FRAME_INTERVAL = 16  # 共享时钟的帧间隔（毫秒）
+
+
+# ---------- 缓动函数：输入输出均为 0~1 ----------
+
+def linear(t):
+    return t
+
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_quad(t):
+    return t * t
+
+
+def _owner_deleted(animation):
+    """
+    动画所属的 Qt 对象是否已被销毁（例如关闭了正在播放动画的窗口）。
+    检查自身（ClockTimer）、重绘控件以及回调所绑定的对象，时间线递归到各步骤。
+    """
+    pending = [animation]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, QObject):
+            if sip.isdeleted(item):
+                return True
+            continue  # 存活的 QObject（ClockTimer）没有其他需要检查的属性
+        owners = [getattr(item, 'widget', None)]
+        owners += [getattr(getattr(item, name, None), '__self__', None) for name in ('on_update', 'on_finished', 'func')]
+        if any(isinstance(owner, QObject) and sip.isdeleted(owner) for owner in owners):
+            return True
+        pending.extend(getattr(item, 'steps', ()))
+    return False
+
+
+class AnimationClock(QObject):
+    """共享动画时钟：有动画运行时才启动定时器"""
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, frame_interval=FRAME_INTERVAL):
+        super().__init__()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(frame_interval)
+        self._timer.timeout.connect(self.tick)
+        self._animations = []
+        self._dirty = {}  # id(控件) -> 控件，本帧需要重绘的控件
+
+    @staticmethod
+    def now():
+        """当前时间（毫秒，单调递增）"""
+        return time.monotonic() * 1000.0
+
+    def add(self, animation):
+        if animation not in self._animations:
+            self._animations.append(animation)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def remove(self, animation):
+        if animation in self._animations:
+            self._animations.remove(animation)
+
+    def is_running(self, animation):
+        return animation in self._animations
+
+    def mark_dirty(self, widget):
+        """登记需要在本帧末尾重绘的控件（同一控件每帧只重绘一次）"""
+        if widget is not None:
+            self._dirty[id(widget)] = widget
+
+    def tick(self):
+        """推进所有动画一帧，然后统一重绘"""
+        now = self.now()
+        for animation in list(self._animations):
+            try:
+                running = animation not in self._animations or animation.advance(now)
+            except RuntimeError as e:
+                # 只吞掉“所属 Qt 对象已被销毁”的错误；其他异常（含 RecursionError）移除该动画后照常抛出
+                self.remove(animation)
+                if isinstance(e, RecursionError) or not _owner_deleted(animation):
+                    raise
+                running = False
+            if not running:
+                self.remove(animation)
+        dirty, self._dirty = self._dirty, {}
+        for widget in dirty.values():
+            if isinstance(widget, QObject) and sip.isdeleted(widget):
+                continue  # 控件已被销毁
+            # VisualArea 只重绘动画元素所在的区域
+            getattr(widget, 'update_animated', widget.update)()
+        if not self._animations:
+            self._timer.stop()
+
+
+class Tween:
+    """
+    补间动画：duration 毫秒内把值从 start 变到 end。
+    on_update(value) 每帧调用一次，on_finished() 在结束时调用；widget 为每帧需要重绘的控件。
+    """
+
+    def __init__(self, duration, on_update, start=0.0, end=1.0, easing=ease_in_out_quad,
+                 on_finished=None, widget=None):
+        self.duration = max(0.0, float(duration))
+        self.on_update = on_update
+        self.start_value = start
+        self.end_value = end
+        self.easing = easing
+        self.on_finished = on_finished
+        self.widget = widget
+        self.clock = None
+        self.begin_time = None
+        self.end_time = None
+
+    def value_at(self, t):
+        return self.start_value + (self.end_value - self.start_value) * self.easing(t)
+
+    def begin(self, begin_time):
+        self.begin_time = begin_time
+        self.end_time = begin_time + self.duration
+
+    def advance(self, now):
+        """推进到时刻 now；返回 False 表示动画已结束"""
+        if self.begin_time is None:
+            self.begin(now)
+        t = 1.0 if self.duration <= 0 else min(1.0, (now - self.begin_time) / self.duration)
+        self.on_update(self.value_at(t))
+        if self.clock is not None:
+            self.clock.mark_dirty(self.widget)
+        if t >= 1.0:
+            if self.on_finished is not None:
+                self.on_finished()
+            return False
+        return True
+
+    def start(self, clock=None):
+        self.clock = clock or AnimationClock.instance()
+        self.begin(self.clock.now())
+        self.on_update(self.value_at(0.0))
+        self.clock.mark_dirty(self.widget)
+        self.clock.add(self)
+        return self
+
+    def stop(self):
+        if self.clock is not None:
+            self.clock.remove(self)
+
+    def is_running(self):
+        return self.clock is not None and self.clock.is_running(self)
+
+
+class _Call:
+    """时间线中的即时回调步骤"""
+
+    def __init__(self, func):
+        self.func = func
+        self.clock = None
+        self.end_time = None
+
+    def begin(self, begin_time):
+        self.end_time = begin_time
+
+    def advance(self, now):
+        self.func()
+        return False
+
+
+class _Parallel:
+    """并行执行的一组步骤，全部结束后才算结束"""
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.clock = None
+        self.end_time = None
+        self._running = []
+
+    def begin(self, begin_time):
+        for step in self.steps:
+            step.clock = self.clock
+            step.begin(begin_time)
+        self._running = list(self.steps)
+        self.end_time = max((s.end_time for s in self.steps), default=begin_time)
+
+    def advance(self, now):
+        self._running = [s for s in self._running if s.advance(now)]
+        return bool(self._running)
+
+
+class Timeline:
+    """
+    顺序时间线：
+        Timeline().then(tween).wait(500).call(func).parallel(t1, t2).start()
+    """
+
+    def __init__(self, on_finished=None):
+        self.steps = []
+        self.on_finished = on_finished
+        self.clock = None
+        self._index = 0
+        self.end_time = None
+
+    def then(self, tween):
+        self.steps.append(tween)
+        return self
+
+    def call(self, func):
+        self.steps.append(_Call(func))
+        return self
+
+    def wait(self, duration):
+        self.steps.append(Tween(duration, lambda value: None, easing=linear))
+        return self
+
+    def parallel(self, *tweens):
+        self.steps.append(_Parallel(tweens))
+        return self
+
+    def begin(self, begin_time):
+        self._index = 0
+        self.end_time = begin_time
+        if self.steps:
+            self._begin_step(self.steps[0], begin_time)
+
+    def _begin_step(self, step, begin_time):
+        step.clock = self.clock
+        step.begin(begin_time)
+
+    def advance(self, now):
+        while self._index < len(self.steps):
+            step = self.steps[self._index]
+            if step.advance(now):
+                return True
+            # 下一步从上一步的结束时刻开始，落后时会在同一帧内连续推进多步
+            self.end_time = step.end_time
+            self._index += 1
+            if self._index < len(self.steps):
+                self._begin_step(self.steps[self._index], step.end_time)
+        if self.on_finished is not None:
+            self.on_finished()
+        return False
+
+    def start(self, clock=None):
+        self.clock = clock or AnimationClock.instance()
+        self.begin(self.clock.now())
+        self.clock.add(self)
+        return self
+
+    def stop(self):
+        if self.clock is not None:
+            self.clock.remove(self)
+
+    def is_running(self):
+        return self.clock is not None and self.clock.is_running(self)
+
+
+class ClockTimer(QObject):
+    """
+    由共享时钟驱动、接口与 QTimer 兼容的定时器。
+    speed 为播放速度倍率（2.0 表示两倍速，触发间隔减半）。
+    """
+
+    timeout = pyqtSignal()
+
+    def __init__(self, parent=None, max_catch_up=4):
+        super().__init__(parent)
+        self._interval = 0
+        self._active = False
+        self._last = 0.0
+        self._clock = AnimationClock.instance()
+        self.speed = 1.0
+        self.max_catch_up = max_catch_up
+
+    def setInterval(self, msec):
+        self._interval = max(0, int(msec))
+
+    def interval(self):
+        return self._interval
+
+    def isActive(self):
+        return self._active
+
+    def start(self, msec=None):
+        if msec is not None:
+            self.setInterval(msec)
+        self._active = True
+        self._last = self._clock.now()
+        self._clock.add(self)
+
+    def stop(self):
+        self._active = False
+        self._clock.remove(self)
+
+    def advance(self, now):
+        step = max(float(FRAME_INTERVAL), self._interval / max(self.speed, 1e-6))
+        fired = 0
+        while self._active and now - self._last >= step:
+            self._last += step
+            self.timeout.emit()
+            fired += 1
+            if fired >= self.max_catch_up:
+                self._last = now  # 落后太多：丢弃积压的帧
+                break
+        return self._active
@@ -0,0 +1,119 @@
+"""
+频率统计前端：从文件或目录统计字节 / 词频，直接生成 HuffmanTree 所需的权重字典。
+
+- 输入文件通过 mmap 映射，按固定大小切块，不会整体读入内存；
+- 各块在进程池中并行统计，最后合并计数；
+- mode='bytes' 统计 0~255 的字节值（可直接交给 HuffmanCodec 使用），
+  mode='tokens' 统计以空白分隔的词（切块边界会对齐到空白处，避免切断词）。
+
+注意：使用多进程时，调用方脚本需要放在 `if __name__ == '__main__':` 之下（Windows 要求）。
+"""
+import mmap
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from model import HuffmanTree
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MODE_BYTES = 'bytes'
+MODE_TOKENS = 'tokens'
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024  # 每个任务处理的字节数
+
+_TOKEN_RE = re.compile(rb'\S+')
+_SPACE_RE = re.compile(rb'\s')
+
+
+def _iter_files(paths):
+    """展开文件 / 目录列表，跳过空文件"""
+    if isinstance(paths, (str, bytes, os.PathLike)):
+        paths = [paths]
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                for name in sorted(filenames):
+                    full = os.path.join(dirpath, name)
+                    if os.path.getsize(full) > 0:
+                        yield full
+        elif os.path.isfile(path):
+            if os.path.getsize(path) > 0:
+                yield path
+        else:
+            raise FileNotFoundError(f"路径不存在: {path}")
+
+
+def _chunk_ranges(path, chunk_size, mode):
+    """把文件切分为 [start, end) 区间；词模式下把切分点后移到下一个空白字符"""
+    size = os.path.getsize(path)
+    if mode != MODE_TOKENS:
+        return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    ranges = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                match = _SPACE_RE.search(mm, end)
+                end = match.start() if match else size
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _count_chunk(path, start, end, mode):
+    """统计文件 [start, end) 区间（在子进程中执行，必须是模块级函数）"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mode == MODE_TOKENS:
+            return Counter(_TOKEN_RE.findall(mm, start, end))
+        if np is not None:
+            counts = np.bincount(np.frombuffer(mm, dtype=np.uint8, count=end - start, offset=start),
+                                 minlength=256)
+            return Counter({byte: int(c) for byte, c in enumerate(counts) if c})
+        return Counter(mm[start:end])
+
+
+def count_frequencies(paths, mode=MODE_BYTES, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=None):
+    """
+    统计一个或多个文件 / 目录的频率，返回按 (频率, 键) 升序排列的权重字典，
+    交给 HuffmanTree.build_from_weights 时可直接走已排序的双队列路径。
+    字节模式的键为 0~255 的整数，词模式的键为 UTF-8 解码后的字符串。
+    """
+    if mode not in (MODE_BYTES, MODE_TOKENS):
+        raise ValueError(f"不支持的统计模式: {mode}")
+    if chunk_size <= 0:
+        raise ValueError("分块大小必须为正整数")
+
+    tasks = [(path, start, end, mode)
+             for path in _iter_files(paths)
+             for start, end in _chunk_ranges(path, chunk_size, mode)]
+
+    total = Counter()
+    if len(tasks) <= 1 or max_workers == 1:
+        # 只有一个块时不值得启动进程池
+        for task in tasks:
+            total.update(_count_chunk(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for counts in pool.map(_count_chunk, *zip(*tasks)):
+                total.update(counts)
+
+    if mode == MODE_TOKENS:
+        merged = Counter()
+        for token, count in total.items():
+            merged[token.decode('utf-8', errors='replace')] += count
+        total = merged
+    return dict(sorted(total.items(), key=lambda kv: (kv[1], kv[0])))
+
+
+def build_huffman_tree(paths, mode=MODE_BYTES, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=None):
+    """统计频率并直接构建哈夫曼树"""
+    weights = count_frequencies(paths, mode, chunk_size, max_workers)
+    tree = HuffmanTree()
+    tree.build_from_weights(weights)
+    return tree
@@ -0,0 +1,286 @@
+"""
+哈夫曼编解码引擎
+
+基于 HuffmanTree 生成的码表对真实的字节流做压缩 / 解压：
+- 码表：默认使用范式哈夫曼编码，只由各字符的编码长度决定，因此用 to_canonical_dict
+  紧凑保存、再经 from_code_lengths 还原后仍能解开原来的编码数据；
+- 编码：按位打包写入 bytearray，末尾不足一个字节的部分补 0；
+- 解码：预先生成多级查找表，每次查 k 位，而不是沿着树逐位行走；
+- 流式：encode_stream / decode_stream 按固定大小分块读写文件对象，大文件不会整体载入内存。
+
+哈夫曼树中的字符必须能对应到单个字节：0~255 的整数、单字符字符串（码位 < 256）或长度为 1 的 bytes。
+由于末尾存在填充位，解码时需要提供原始符号个数（encode_stream 的返回值）。
+"""
+from model import HuffmanTree
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # 流式读写的分块大小（字节）
+DEFAULT_LOOKUP_BITS = 8  # 解码查找表每级的位数 k
+
+
+def _symbol_to_byte(symbol):
+    """把哈夫曼树中的字符规范化为 0~255 的字节值"""
+    if isinstance(symbol, int) and 0 <= symbol < 256:
+        return symbol
+    if isinstance(symbol, str) and len(symbol) == 1 and ord(symbol) < 256:
+        return ord(symbol)
+    if isinstance(symbol, (bytes, bytearray)) and len(symbol) == 1:
+        return symbol[0]
+    raise ValueError(f"字符 {symbol!r} 无法映射为单个字节")
+
+
+class HuffmanEncoder:
+    """增量编码器：多次 feed 后调用 flush 取出补齐到整字节的剩余位"""
+
+    def __init__(self, codes, lengths):
+        self._codes = codes
+        self._lengths = lengths
+        self._acc = 0  # 尚未输出的位（低 _nbits 位有效）
+        self._nbits = 0
+        self.count = 0  # 已编码的符号个数
+
+    def feed(self, data):
+        """编码一段字节，返回本次可输出的完整字节"""
+        codes, lengths = self._codes, self._lengths
+        acc, nbits = self._acc, self._nbits
+        out = bytearray()
+        for byte in data:
+            length = lengths[byte]
+            if not length:
+                raise ValueError(f"字节 {byte} 不在哈夫曼码表中")
+            acc = (acc << length) | codes[byte]
+            nbits += length
+            if nbits >= 64:  # 攒够 8 个字节再整体输出，减少 Python 层循环
+                rem = nbits & 7
+                out += (acc >> rem).to_bytes(nbits >> 3, 'big')
+                acc &= (1 << rem) - 1
+                nbits = rem
+        if nbits >= 8:
+            rem = nbits & 7
+            out += (acc >> rem).to_bytes(nbits >> 3, 'big')
+            acc &= (1 << rem) - 1
+            nbits = rem
+        self._acc, self._nbits = acc, nbits
+        self.count += len(data)
+        return out
+
+    def flush(self):
+        """输出最后不足一个字节的位（低位补 0）"""
+        out = bytearray()
+        if self._nbits:
+            out.append((self._acc << (8 - self._nbits)) & 0xFF)
+        self._acc, self._nbits = 0, 0
+        return out
+
+
+class HuffmanDecoder:
+    """增量解码器：基于多级 k 位查找表，最多输出 count 个符号"""
+
+    def __init__(self, root_table, lookup_bits, count):
+        self._root_table = root_table
+        self._table = root_table  # 当前所在的查找表（跨块保持）
+        self._k = lookup_bits
+        self._acc = 0
+        self._nbits = 0
+        self.remaining = count
+
+    def feed(self, data):
+        """解码一段编码字节，返回解出的字节"""
+        k = self._k
+        mask = (1 << k) - 1
+        root = self._root_table
+        table = self._table
+        acc, nbits = self._acc, self._nbits
+        remaining = self.remaining
+        out = bytearray()
+        for byte in data:
+            if not remaining:
+                break
+            acc = ((acc << 8) | byte)
+            nbits += 8
+            while nbits >= k and remaining:
+                is_leaf, payload, consumed = table[(acc >> (nbits - k)) & mask]
+                nbits -= consumed
+                if is_leaf:
+                    out.append(payload)
+                    remaining -= 1
+                    table = root
+                else:
+                    table = payload
+            acc &= (1 << nbits) - 1
+        self._table = table
+        self._acc, self._nbits = acc, nbits
+        self.remaining = remaining
+        return out
+
+    def finish(self):
+        """输入结束后，用补 0 的方式解出缓冲区中剩余不足 k 位的符号"""
+        k = self._k
+        mask = (1 << k) - 1
+        table = self._table
+        acc, nbits = self._acc, self._nbits
+        out = bytearray()
+        while self.remaining and nbits > 0:
+            is_leaf, payload, consumed = table[(acc << (k - nbits)) & mask] if nbits < k \
+                else table[(acc >> (nbits - k)) & mask]
+            if consumed > nbits:
+                break
+            nbits -= consumed
+            acc &= (1 << nbits) - 1
+            if is_leaf:
+                out.append(payload)
+                self.remaining -= 1
+                table = self._root_table
+            else:
+                table = payload
+        self._table = table
+        self._acc, self._nbits = acc, nbits
+        if self.remaining:
+            raise ValueError(f"编码数据不完整，仍缺少 {self.remaining} 个符号")
+        return out
+
+
+class HuffmanCodec:
+    """
+    哈夫曼编解码器。canonical=True（默认）时使用范式编码，码表只依赖编码长度；
+    canonical=False 时直接使用树上左0右1的编码（紧凑保存后无法还原同一码表）。
+    """
+
+    def __init__(self, tree, lookup_bits=DEFAULT_LOOKUP_BITS, canonical=True):
+        if tree is None or tree.root is None:
+            raise ValueError("哈夫曼树为空，无法编解码")
+        if lookup_bits < 1:
+            raise ValueError("查找表位数必须为正整数")
+        self.tree = tree
+        self.lookup_bits = lookup_bits
+        self.canonical = canonical
+
+        if canonical:
+            # 解码沿范式树行走：由同一组编码长度重建，树上左0右1恰好是范式编码
+            compact = tree.to_canonical_dict()
+            self._decode_tree = HuffmanTree.from_code_lengths(compact['symbols'], compact['lengths'])
+            code_table = tree.get_canonical_code()
+        else:
+            self._decode_tree = tree
+            code_table = tree.get_code_table()
+
+        # 编码表：按字节值直接索引
+        self._codes = [0] * 256
+        self._lengths = [0] * 256
+        for symbol, (code, length) in code_table.items():
+            byte = _symbol_to_byte(symbol)
+            self._codes[byte] = code
+            self._lengths[byte] = length
+
+        self._root_table = self._build_tables()
+
+    @classmethod
+    def from_weights(cls, weight_dict, lookup_bits=DEFAULT_LOOKUP_BITS):
+        """由权重字典直接构造编解码器"""
+        return cls(HuffmanTree(weight_dict), lookup_bits)
+
+    @classmethod
+    def from_code_lengths(cls, symbols, lengths, lookup_bits=DEFAULT_LOOKUP_BITS):
+        """由范式哈夫曼的字符列表与码长（to_canonical_dict 的内容）构造编解码器"""
+        return cls(HuffmanTree.from_code_lengths(symbols, lengths), lookup_bits)
+
+    @classmethod
+    def from_data(cls, data, lookup_bits=DEFAULT_LOOKUP_BITS):
+        """统计一段字节的频率并构造编解码器"""
+        counts = [0] * 256
+        for byte in data:
+            counts[byte] += 1
+        return cls.from_weights({b: c for b, c in enumerate(counts) if c}, lookup_bits)
+
+    # ---------- 查找表 ----------
+
+    def _build_tables(self):
+        """
+        生成多级查找表。每张表有 2^k 项，项的格式为：
+        - (True, 字节值, 实际消耗位数)：k 位之内即可到达叶子；
+        - (False, 子表, k)：k 位后仍停在内部节点，继续查该节点的子表。
+        """
+        k = self.lookup_bits
+        root = self._decode_tree.root
+        if root.data is not None:
+            # 单字符树：码表中固定为 1 位 "0"
+            leaf = (True, _symbol_to_byte(root.data), 1)
+            return [leaf] * (1 << k)
+
+        tables = {}
+        pending = [root]
+        while pending:
+            start = pending.pop()
+            if id(start) in tables:
+                continue
+            table = []
+            for index in range(1 << k):
+                node = start
+                consumed = 0
+                while consumed < k and node.data is None:
+                    bit = (index >> (k - 1 - consumed)) & 1
+                    node = node.right_child if bit else node.left_child
+                    consumed += 1
+                if node.data is not None:
+                    table.append((True, _symbol_to_byte(node.data), consumed))
+                else:
+                    table.append((False, node, k))
+                    pending.append(node)
+            tables[id(start)] = table
+
+        # 把占位的内部节点替换为对应的子表
+        for table in tables.values():
+            for index, (is_leaf, payload, consumed) in enumerate(table):
+                if not is_leaf:
+                    table[index] = (False, tables[id(payload)], consumed)
+        return tables[id(root)]
+
+    # ---------- 整块编解码 ----------
+
+    def encoder(self):
+        return HuffmanEncoder(self._codes, self._lengths)
+
+    def decoder(self, count):
+        return HuffmanDecoder(self._root_table, self.lookup_bits, count)
+
+    def encode(self, data):
+        """编码整段字节，返回 bytearray（末尾补 0 到整字节）"""
+        if isinstance(data, str):
+            try:
+                data = data.encode('latin-1')
+            except UnicodeEncodeError:
+                raise ValueError("字符串中包含无法映射为单个字节的字符")
+        encoder = self.encoder()
+        out = encoder.feed(data)
+        out += encoder.flush()
+        return out
+
+    def decode(self, data, count):
+        """解码整段字节，count 为原始符号个数"""
+        decoder = self.decoder(count)
+        out = decoder.feed(data)
+        out += decoder.finish()
+        return bytes(out)
+
+    # ---------- 流式编解码 ----------
+
+    def encode_stream(self, src, dst, chunk_size=DEFAULT_CHUNK_SIZE):
+        """从二进制文件对象 src 分块读取并编码写入 dst，返回编码的符号个数"""
+        encoder = self.encoder()
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            dst.write(encoder.feed(chunk))
+        dst.write(encoder.flush())
+        return encoder.count
+
+    def decode_stream(self, src, dst, count, chunk_size=DEFAULT_CHUNK_SIZE):
+        """从 src 分块读取编码数据，解出 count 个符号写入 dst，返回写出的字节数"""
+        decoder = self.decoder(count)
+        while decoder.remaining:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            dst.write(decoder.feed(chunk))
+        dst.write(decoder.finish())
+        return count
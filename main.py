@@ -0,0 +1,103 @@
+"""
+命令行入口：不启动界面，对数据结构批量执行 DSL 脚本（适合没有显示环境的服务器）
+
+    python main.py -t AVLTree build.dsl ops.dsl -o result.json
+    python main.py -i saved.json more_ops.dsl -o saved.json --compact
+    cat ops.dsl | python main.py -t Queue -
+
+脚本逐行流式执行，文件大小不受内存限制；未指定 -o 时把结果以 JSON 输出到标准输出。
+不带任何参数运行时启动图形界面（与运行 viewer.py 相同）。
+"""
+import argparse
+import json
+import runpy
+import sys
+
+from DSL_handler import DSLEngine
+from model import Stack, Queue, SequenceList, LinkedList, BinaryTree, BinarySearchTree, AVLTree, HuffmanTree, \
+    DataStructureManager
+
+STRUCTURE_TYPES = {cls.__name__: cls for cls in (Stack, Queue, SequenceList, LinkedList, BinaryTree,
+                                                 BinarySearchTree, AVLTree, HuffmanTree)}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="对数据结构批量执行 DSL 脚本（无界面）")
+    parser.add_argument('scripts', nargs='*', metavar='SCRIPT', help="依次执行的 DSL 文件，'-' 表示标准输入")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('-i', '--input', help="初始结构文件（保存结构得到的 JSON）")
+    source.add_argument('-t', '--type', choices=sorted(STRUCTURE_TYPES), help="从指定类型的空结构开始")
+    parser.add_argument('-o', '--output', help="保存结果的路径（缺省时输出到标准输出）")
+    parser.add_argument('--compact', action='store_true', help="紧凑格式保存（哈夫曼树只保存范式编码）")
+    parser.add_argument('--max-errors', type=int, default=20, help="最多打印的错误条数，其余只计数（默认 20）")
+    parser.add_argument('-q', '--quiet', action='store_true', help="不输出进度与统计")
+    return parser
+
+
+def run_batch(args, parser):
+    """按参数加载结构、依次执行脚本并保存，返回退出码（有执行错误时为 1，无法读写文件时为 2）"""
+    if args.input:
+        ds = DataStructureManager.load_structure(args.input)
+        if ds is None:
+            print(f"无法加载结构文件: {args.input}", file=sys.stderr)
+            return 2
+    elif args.type:
+        ds = STRUCTURE_TYPES[args.type]()
+    else:
+        parser.error("需要用 -i 指定结构文件或用 -t 指定结构类型")
+
+    engine = DSLEngine(ds)
+    show_progress = not args.quiet and sys.stderr.isatty()
+    printed = total_errors = 0
+
+    for script in args.scripts:
+        name = '<stdin>' if script == '-' else script
+
+        def on_error(line_num, message):
+            nonlocal printed
+            if printed < args.max_errors:
+                print(f"{name}:{line_num}: {message}", file=sys.stderr)
+                printed += 1
+
+        def on_progress(stats):
+            percent = f" ({stats.fraction:.0%})" if stats.fraction is not None else ""
+            print(f"\r{name}: 第 {stats.lines} 行{percent}", end='', file=sys.stderr, flush=True)
+
+        try:
+            stats = engine.run_file(sys.stdin.buffer if script == '-' else script,
+                                    on_progress=on_progress if show_progress else None, on_error=on_error)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"无法读取 {name}: {e}", file=sys.stderr)
+            return 2
+        if show_progress:
+            print(file=sys.stderr)
+        total_errors += stats.errors
+        if not args.quiet:
+            print(f"{name}: {stats.lines} 行，执行 {stats.operations} 条指令，错误 {stats.errors} 条", file=sys.stderr)
+
+    if total_errors > printed:
+        print(f"... 共 {total_errors} 条错误", file=sys.stderr)
+
+    if args.output:
+        if not DataStructureManager.save_structure(engine.ds, args.output, compact=args.compact):
+            return 2
+    else:
+        data = engine.ds.to_canonical_dict() if args.compact and hasattr(engine.ds, 'to_canonical_dict') \
+            else engine.ds.to_dict()
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=None if args.compact else 2)
+        print()
+    return 1 if total_errors else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        # 没有参数：启动图形界面
+        runpy.run_module('viewer', run_name='__main__')
+        return 0
+    parser = build_parser()
+    return run_batch(parser.parse_args(argv), parser)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from collections import deque
+import heapq
 import json
 import pickle
 
@@ -21,6 +23,12 @@ class Serializable(ABC):
 class LinearList(ABC):
     """线性表抽象基类"""
 
+    # 修改版本号：每次改变内容/结构时递增，供可视化层判断缓存（如树布局）是否失效
+    version = 0
+
+    def _bump_version(self):
+        self.version += 1
+
     @abstractmethod
     def is_empty(self):
         """检查线性表是否为空"""
@@ -72,12 +80,14 @@ class SequenceList(LinearList, Serializable):
         """在指定位置插入元素"""
         if 0 <= index <= len(self.items):
             self.items.insert(index, item)
+            self._bump_version()
         else:
             raise IndexError("索引超出范围")
 
     def remove(self, index):
         """移除指定位置的元素"""
         if 0 <= index < len(self.items):
+            self._bump_version()
             return self.items.pop(index)
         raise IndexError("索引超出范围")
 
@@ -91,6 +101,7 @@ class SequenceList(LinearList, Serializable):
     def clear(self):
         """清空顺序表（修正：清空items列表）"""
         self.items = []
+        self._bump_version()
 
     def display(self):
         print(self.items)
@@ -98,6 +109,12 @@ class SequenceList(LinearList, Serializable):
     def append(self, item):
         """在末尾添加元素"""
         self.items.append(item)
+        self._bump_version()
+
+    def extend(self, items):
+        """在末尾批量添加元素（一次列表扩展，版本号只变化一次）"""
+        self.items.extend(items)
+        self._bump_version()
 
     def __getitem__(self, index):
         """支持索引访问"""
@@ -107,9 +124,22 @@ class SequenceList(LinearList, Serializable):
         """支持索引赋值"""
         if 0 <= index < len(self.items):
             self.items[index] = value
+            self._bump_version()
         else:
             raise IndexError("索引超出范围")
 
+    def __iter__(self):
+        """按下标顺序遍历元素"""
+        return iter(self.items)
+
+    def __reversed__(self):
+        """按下标逆序遍历元素"""
+        return reversed(self.items)
+
+    def iter_range(self, start, stop):
+        """按下标顺序遍历 [start, stop) 内的元素，代价只与区间长度有关（供可视化只取可见窗口）"""
+        return iter(self.items[max(start, 0):max(stop, 0)])
+
     def to_dict(self):
         return {
             'type': 'SequenceList',
@@ -134,12 +164,22 @@ class Node:
         return str(self.data)
 
 
+class DoubleNode(Node):
+    """双向链表节点类（增加前驱指针）"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.prev = None
+
+
 class LinkedList(LinearList, Serializable):
-    """链表实现"""
+    """链表实现（维护尾指针；doubly=True 时为双向链表）"""
 
-    def __init__(self):
+    def __init__(self, doubly=False):
         self.head = None
+        self.tail = None
         self.size = 0
+        self.doubly = doubly
 
     def is_empty(self):
         return self.head is None
@@ -147,102 +187,180 @@ class LinkedList(LinearList, Serializable):
     def length(self):
         return self.size
 
+    def _new_node(self, item):
+        return DoubleNode(item) if self.doubly else Node(item)
+
+    def _get_node(self, index):
+        """获取指定位置的节点（双向模式下从较近的一端出发）"""
+        if self.doubly and index > self.size // 2:
+            current = self.tail
+            for _ in range(self.size - 1 - index):
+                current = current.prev
+            return current
+        if index == self.size - 1:
+            return self.tail
+        current = self.head
+        for _ in range(index):
+            current = current.next
+        return current
+
     def insert(self, index, item):
-        """在指定位置插入元素"""
+        """在指定位置插入元素（头/尾插入为 O(1)）"""
         if index < 0 or index > self.size:
             raise IndexError("索引超出范围")
 
-        new_node = Node(item)
+        new_node = self._new_node(item)
 
         if index == 0:  # 插入到头部
             new_node.next = self.head
+            if self.doubly and self.head:
+                self.head.prev = new_node
             self.head = new_node
+            if self.tail is None:
+                self.tail = new_node
+        elif index == self.size:  # 插入到尾部
+            self.tail.next = new_node
+            if self.doubly:
+                new_node.prev = self.tail
+            self.tail = new_node
         else:
-            current = self.head
-            for _ in range(index - 1):
-                current = current.next
+            current = self._get_node(index - 1)
             new_node.next = current.next
+            if self.doubly:
+                new_node.prev = current
+                current.next.prev = new_node
             current.next = new_node
 
         self.size += 1
+        self._bump_version()
 
     def remove(self, index):
-        """移除指定位置的元素"""
+        """移除指定位置的元素（头部删除为 O(1)，双向模式下尾部删除也为 O(1)）"""
         if index < 0 or index >= self.size:
             raise IndexError("索引超出范围")
 
         if index == 0:  # 移除头部
-            removed_item = self.head.data
-            self.head = self.head.next
+            removed = self.head
+            self.head = removed.next
+            if self.head is None:
+                self.tail = None
+            elif self.doubly:
+                self.head.prev = None
+        elif self.doubly:
+            removed = self._get_node(index)
+            removed.prev.next = removed.next
+            if removed.next:
+                removed.next.prev = removed.prev
+            else:
+                self.tail = removed.prev
         else:
-            current = self.head
-            for _ in range(index - 1):
-                current = current.next
-            removed_item = current.next.data
-            current.next = current.next.next
+            current = self._get_node(index - 1)
+            removed = current.next
+            current.next = removed.next
+            if removed is self.tail:
+                self.tail = current
 
         self.size -= 1
-        return removed_item
+        self._bump_version()
+        return removed.data
 
     def get(self, index):
         """获取指定位置的元素"""
         if index < 0 or index >= self.size:
             raise IndexError("索引超出范围")
+        return self._get_node(index).data
 
+    def _nodes(self):
+        """从头到尾遍历节点"""
         current = self.head
-        for _ in range(index):
+        while current:
+            yield current
             current = current.next
-        return current.data
+
+    def __iter__(self):
+        """从头到尾遍历元素（单趟 O(n)，避免逐个 get(i) 的 O(n²)）"""
+        for node in self._nodes():
+            yield node.data
+
+    def __reversed__(self):
+        """从尾到头遍历元素"""
+        for node in self._nodes_reversed():
+            yield node.data
+
+    def _nodes_reversed(self):
+        """从尾到头遍历节点：双向模式沿 prev 逐个后退，单向模式需先收集一遍"""
+        if self.doubly:
+            current = self.tail
+            while current:
+                yield current
+                current = current.prev
+        else:
+            yield from reversed(list(self._nodes()))
 
     def locate(self, item):
         """查找元素的位置"""
-        current = self.head
-        index = 0
-        while current:
-            if current.data == item:
+        for index, value in enumerate(self):
+            if value == item:
                 return index
-            current = current.next
-            index += 1
         return -1
 
     def clear(self):
         """清空链表（修正：重置头节点和大小）"""
         self.head = None
+        self.tail = None
         self.size = 0
+        self._bump_version()
 
     def display(self):
-        elements = []
-        current = self.head
-        while current:
-            elements.append(current.data)
-            current = current.next
-        print(elements)
+        print(list(self))
 
     def append(self, item):
-        """在末尾添加元素"""
+        """在末尾添加元素（借助尾指针为 O(1)）"""
         self.insert(self.size, item)
 
+    def extend(self, items):
+        """在末尾批量添加元素：先把新节点串成一段，再与尾节点拼接一次"""
+        first = last = None
+        count = 0
+        for item in items:
+            node = self._new_node(item)
+            if last is None:
+                first = node
+            else:
+                last.next = node
+                if self.doubly:
+                    node.prev = last
+            last = node
+            count += 1
+        if first is None:
+            return
+        if self.tail is None:
+            self.head = first
+        else:
+            self.tail.next = first
+            if self.doubly:
+                first.prev = self.tail
+        self.tail = last
+        self.size += count
+        self._bump_version()
+
     def __getitem__(self, index):
         """支持索引访问"""
         return self.get(index)
 
     def to_dict(self):
-        elements = []
-        current = self.head
-        while current:
-            elements.append(current.data)
-            current = current.next
-
-        return {
+        data = {
             'type': 'LinkedList',
-            'elements': elements
+            'elements': list(self)
         }
+        if self.doubly:
+            data['doubly'] = True
+        return data
 
     @classmethod
     def from_dict(cls, data):
-        obj = cls()
-        for element in data['elements']:
-            obj.append(element)
+        obj = cls(doubly=data.get('doubly', False))
+        obj.extend(data['elements'])
         return obj
 
 
@@ -253,6 +371,10 @@ class Stack(SequenceList, Serializable):
         """压入元素到栈顶"""
         self.append(item)
 
+    def push_many(self, items):
+        """按顺序批量压栈（最后一个元素位于栈顶）"""
+        self.extend(items)
+
     def pop(self):
         """弹出栈顶元素"""
         if self.is_empty():
@@ -283,12 +405,179 @@ class Stack(SequenceList, Serializable):
 
 
 class Queue(SequenceList, Serializable):
-    """队列类 (基于顺序表实现)"""
+    """队列类 (基于可扩容循环数组实现，入队/出队/查看队头均为 O(1))"""
+
+    MIN_CAPACITY = 8
+
+    def __init__(self):
+        self._buffer = [None] * self.MIN_CAPACITY
+        self._head = 0  # 队头在缓冲区中的下标
+        self._count = 0  # 当前元素个数
+
+    # --- 循环缓冲区内部工具 ---
+    def _resize(self, capacity):
+        """按逻辑顺序把元素搬到新容量的缓冲区中，队头归零"""
+        capacity = max(capacity, self.MIN_CAPACITY)
+        self._buffer = self._to_list() + [None] * (capacity - self._count)
+        self._head = 0
+
+    def _to_list(self):
+        """按队头到队尾的顺序导出元素（两段切片拼接，不逐个取模）"""
+        end = self._head + self._count
+        cap = len(self._buffer)
+        if end <= cap:
+            return self._buffer[self._head:end]
+        return self._buffer[self._head:] + self._buffer[:end - cap]
+
+    def _shrink_if_sparse(self):
+        """元素不足容量的 1/4 时缩容，避免大量出队后长期占用内存"""
+        cap = len(self._buffer)
+        if cap > self.MIN_CAPACITY and self._count * 4 <= cap:
+            self._resize(cap // 2)
+
+    @property
+    def items(self):
+        """按队头到队尾顺序返回元素列表（兼容顺序表的 items 接口）"""
+        return self._to_list()
+
+    @items.setter
+    def items(self, values):
+        values = list(values)
+        self._count = len(values)
+        capacity = self.MIN_CAPACITY
+        while capacity < self._count:
+            capacity *= 2
+        self._buffer = values + [None] * (capacity - self._count)
+        self._head = 0
+        self._bump_version()
+
+    # --- 顺序表接口（按逻辑下标访问，0 为队头） ---
+    def is_empty(self):
+        return self._count == 0
+
+    def length(self):
+        return self._count
+
+    def get(self, index):
+        if 0 <= index < self._count:
+            return self._buffer[(self._head + index) % len(self._buffer)]
+        raise IndexError("索引超出范围")
+
+    def __setitem__(self, index, value):
+        if 0 <= index < self._count:
+            self._buffer[(self._head + index) % len(self._buffer)] = value
+            self._bump_version()
+        else:
+            raise IndexError("索引超出范围")
+
+    def append(self, item):
+        """在队尾添加元素（满时容量翻倍，均摊 O(1)）"""
+        if self._count == len(self._buffer):
+            self._resize(len(self._buffer) * 2)
+        self._buffer[(self._head + self._count) % len(self._buffer)] = item
+        self._count += 1
+        self._bump_version()
+
+    def extend(self, items):
+        """在队尾批量添加元素：容量一次扩到位，再分两段切片写入循环缓冲区"""
+        items = list(items)
+        if not items:
+            return
+        needed = self._count + len(items)
+        if needed > len(self._buffer):
+            capacity = len(self._buffer)
+            while capacity < needed:
+                capacity *= 2
+            self._resize(capacity)
+        buffer, cap = self._buffer, len(self._buffer)
+        tail = (self._head + self._count) % cap
+        first = min(len(items), cap - tail)
+        buffer[tail:tail + first] = items[:first]
+        buffer[:len(items) - first] = items[first:]
+        self._count = needed
+        self._bump_version()
+
+    def insert(self, index, item):
+        """在指定位置插入元素，队头/队尾插入为 O(1)，中间插入退化为 O(n)"""
+        if not 0 <= index <= self._count:
+            raise IndexError("索引超出范围")
+        if index == self._count:
+            self.append(item)
+        elif index == 0:
+            if self._count == len(self._buffer):
+                self._resize(len(self._buffer) * 2)
+            self._head = (self._head - 1) % len(self._buffer)
+            self._buffer[self._head] = item
+            self._count += 1
+            self._bump_version()
+        else:
+            values = self._to_list()
+            values.insert(index, item)
+            self.items = values
 
+    def remove(self, index):
+        """移除指定位置的元素，队头/队尾删除为 O(1)，中间删除退化为 O(n)"""
+        if not 0 <= index < self._count:
+            raise IndexError("索引超出范围")
+        cap = len(self._buffer)
+        if index == 0:
+            item = self._buffer[self._head]
+            self._buffer[self._head] = None  # 释放引用
+            self._head = (self._head + 1) % cap
+            self._count -= 1
+        elif index == self._count - 1:
+            pos = (self._head + index) % cap
+            item = self._buffer[pos]
+            self._buffer[pos] = None
+            self._count -= 1
+        else:
+            values = self._to_list()
+            item = values.pop(index)
+            self.items = values
+            return item
+        self._bump_version()
+        self._shrink_if_sparse()
+        return item
+
+    def __iter__(self):
+        """从队头到队尾遍历（直接读循环缓冲区，不复制）"""
+        buffer, head, cap = self._buffer, self._head, len(self._buffer)
+        for i in range(self._count):
+            yield buffer[(head + i) % cap]
+
+    def __reversed__(self):
+        """从队尾到队头遍历"""
+        buffer, head, cap = self._buffer, self._head, len(self._buffer)
+        for i in range(self._count - 1, -1, -1):
+            yield buffer[(head + i) % cap]
+
+    def iter_range(self, start, stop):
+        """按逻辑下标遍历 [start, stop) 内的元素（直接读循环缓冲区）"""
+        buffer, head, cap = self._buffer, self._head, len(self._buffer)
+        for i in range(max(start, 0), min(stop, self._count)):
+            yield buffer[(head + i) % cap]
+
+    def locate(self, item):
+        for i, value in enumerate(self):
+            if value == item:
+                return i
+        return -1
+
+    def clear(self):
+        self._buffer = [None] * self.MIN_CAPACITY
+        self._head = 0
+        self._count = 0
+        self._bump_version()
+
+    # --- 队列接口 ---
     def enqueue(self, item):
         """入队：在队尾添加元素"""
         self.append(item)
 
+    def enqueue_many(self, items):
+        """按顺序批量入队"""
+        self.extend(items)
+
     def dequeue(self):
         """出队：移除队头元素"""
         if self.is_empty():
@@ -299,7 +588,7 @@ class Queue(SequenceList, Serializable):
         """查看队头元素"""
         if self.is_empty():
             raise IndexError("队列为空")
-        return self.get(0)
+        return self._buffer[self._head]
 
     def display(self):
         print("队列内容:", self.items)
@@ -345,27 +634,84 @@ class BinaryTree(LinearList, Serializable):
     def clear(self):
         self.root = None
         self._size = 0
+        self._bump_version()
+
+    # ---------- 节点遍历生成器（显式栈/队列，不受递归深度限制） ----------
+
+    def iter_preorder(self, node=None):
+        """前序遍历节点（默认从根出发）"""
+        start = node or self.root
+        stack = [start] if start else []
+        while stack:
+            current = stack.pop()
+            yield current
+            if current.right_child:
+                stack.append(current.right_child)
+            if current.left_child:
+                stack.append(current.left_child)
+
+    def iter_inorder(self, node=None):
+        """中序遍历节点"""
+        stack = []
+        current = node or self.root
+        while stack or current:
+            while current:
+                stack.append(current)
+                current = current.left_child
+            current = stack.pop()
+            yield current
+            current = current.right_child
+
+    def iter_postorder(self, node=None):
+        """后序遍历节点（子节点总是先于父节点产出）"""
+        start = node or self.root
+        if not start:
+            return
+        stack = [(start, False)]
+        while stack:
+            current, visited = stack.pop()
+            if visited:
+                yield current
+                continue
+            stack.append((current, True))
+            if current.right_child:
+                stack.append((current.right_child, False))
+            if current.left_child:
+                stack.append((current.left_child, False))
+
+    def iter_levelorder(self, node=None):
+        """层序遍历节点"""
+        start = node or self.root
+        if not start:
+            return
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            yield current
+            if current.left_child:
+                queue.append(current.left_child)
+            if current.right_child:
+                queue.append(current.right_child)
+
+    def __iter__(self):
+        """按层序遍历元素（与 get(index) 的层序索引一致）"""
+        for node in self.iter_levelorder():
+            yield node.data
 
     def _preorder_traversal(self, node, result):
         """前序遍历辅助函数"""
         if node:
-            result.append(node.data)
-            self._preorder_traversal(node.left_child, result)
-            self._preorder_traversal(node.right_child, result)
+            result.extend(n.data for n in self.iter_preorder(node))
 
     def _inorder_traversal(self, node, result):
         """中序遍历辅助函数"""
         if node:
-            self._inorder_traversal(node.left_child, result)
-            result.append(node.data)
-            self._inorder_traversal(node.right_child, result)
+            result.extend(n.data for n in self.iter_inorder(node))
 
     def _postorder_traversal(self, node, result):
         """后序遍历辅助函数"""
         if node:
-            self._postorder_traversal(node.left_child, result)
-            self._postorder_traversal(node.right_child, result)
-            result.append(node.data)
+            result.extend(n.data for n in self.iter_postorder(node))
 
     def display(self):
         """显示二叉树的三种遍历结果"""
@@ -386,18 +732,9 @@ class BinaryTree(LinearList, Serializable):
             if index < 0:
                 return None
 
-        queue = [self.root]
-        current_index = 0
-
-        while queue:
-            node = queue.pop(0)
+        for current_index, node in enumerate(self.iter_levelorder()):
             if current_index == index:
                 return node
-            current_index += 1
-            if node.left_child:
-                queue.append(node.left_child)
-            if node.right_child:
-                queue.append(node.right_child)
         return None
 
     def get(self, index):
@@ -422,6 +759,7 @@ class BinaryTree(LinearList, Serializable):
         parent_node.left_child = new_node
         new_node.parent = parent_node
         self._size += 1
+        self._bump_version()
 
     def insert_right(self, parent_index, data):
         """在指定父节点右侧插入新节点"""
@@ -438,39 +776,69 @@ class BinaryTree(LinearList, Serializable):
         parent_node.right_child = new_node
         new_node.parent = parent_node
         self._size += 1
+        self._bump_version()
 
-    def to_dict(self):
-        def node_to_dict(node):
-            if not node:
-                return None
-            return {
-                'data': node.data,
-                'left_child': node_to_dict(node.left_child),
-                'right_child': node_to_dict(node.right_child)
-            }
+    def remove_subtree(self, node):
+        """删除以 node 为根的整棵子树（删除根节点即清空整棵树），并精确更新节点数"""
+        if node is self.root:
+            self.clear()
+            return
+        parent = node.parent
+        if parent is None:
+            raise ValueError("节点不在树中")
+        if parent.left_child is node:
+            parent.left_child = None
+        elif parent.right_child is node:
+            parent.right_child = None
+        else:
+            raise ValueError("节点不在树中")
+        node.parent = None
+        self._size -= sum(1 for _ in self.iter_preorder(node))
+        self._bump_version()
+
+    def _node_to_dict(self, node):
+        """单个节点的字典字段（子类可扩展，如哈夫曼树的 weight）"""
+        return {'data': node.data}
+
+    def _tree_to_dict(self):
+        """后序遍历自底向上拼装嵌套字典，避免深树递归溢出"""
+        built = {}
+        for node in self.iter_postorder():
+            node_dict = self._node_to_dict(node)
+            node_dict['left_child'] = built.pop(id(node.left_child), None)
+            node_dict['right_child'] = built.pop(id(node.right_child), None)
+            built[id(node)] = node_dict
+        return built.get(id(self.root))
 
+    @staticmethod
+    def _tree_from_dict(root_dict, make_node):
+        """用显式栈还原嵌套字典，同时恢复 parent 指针"""
+        if not root_dict:
+            return None
+        root = make_node(root_dict)
+        stack = [(root, root_dict)]
+        while stack:
+            node, node_dict = stack.pop()
+            for side in ('left_child', 'right_child'):
+                child_dict = node_dict.get(side)
+                if child_dict:
+                    child = make_node(child_dict)
+                    child.parent = node
+                    setattr(node, side, child)
+                    stack.append((child, child_dict))
+        return root
+
+    def to_dict(self):
         return {
             'type': 'BinaryTree',
-            'root': node_to_dict(self.root),
+            'root': self._tree_to_dict(),
             'size': self._size
         }
 
     @classmethod
     def from_dict(cls, data):
-        def dict_to_node(node_dict):
-            if not node_dict:
-                return None
-            node = BinaryTreeNode(node_dict['data'])
-            node.left_child = dict_to_node(node_dict['left_child'])
-            node.right_child = dict_to_node(node_dict['right_child'])
-
-            # 恢复父节点连接 (复杂，为简化序列化通常省略)
-            # 这里保持原样，因为 from_dict 不会恢复 parent 属性
-
-            return node
-
         obj = cls()
-        obj.root = dict_to_node(data['root'])
+        obj.root = cls._tree_from_dict(data['root'], lambda d: BinaryTreeNode(d['data']))
         # 简单地从 dict 中读取 size
         obj._size = data['size']
         return obj
@@ -519,6 +887,7 @@ class BinarySearchTree(BinaryTree, Serializable):
             self._size = 1
         else:
             self._insert_recursive(self.root, data)
+        self._bump_version()
 
     def _search_recursive(self, node, data):
         """递归搜索辅助函数"""
@@ -556,6 +925,67 @@ class BinarySearchTree(BinaryTree, Serializable):
         node = self._search_recursive(self.root, data)
         if not node:
             return False  # 元素不存在
+        self._delete_node(node)
+        return True
+
+    def insert_many(self, values):
+        """按顺序逐个插入（保持逐个插入得到的树形）"""
+        for value in values:
+            self.insert(value)
+
+    def delete_many(self, values):
+        """按顺序逐个删除，返回其中不存在的值"""
+        missing = []
+        for value in values:
+            if self.search(value) is None:
+                missing.append(value)
+            else:
+                self.delete(value)
+        return missing
+
+    def _new_node(self, data):
+        return BinaryTreeNode(data)
+
+    def bulk_load(self, values):
+        """
+        用 values 重建为一棵平衡的二叉搜索树（替换原有内容，重复值只保留一个）。
+        输入已有序时排序只需 O(n)；每次取区间中点为根，左右两半分别建子树，整体 O(n)。
+        混合类型（例如 DSL 中的 "1.5" 与整数）与 insert 一样统一转为数值比较；仍无法比较时退回逐个插入。
+        """
+        values = list(values)
+        try:
+            keys = sorted(values)
+        except TypeError:
+            try:
+                keys = sorted(v if isinstance(v, (int, float)) else float(v) for v in values)
+            except (TypeError, ValueError):
+                self.clear()
+                self.insert_many(values)
+                return self.root
+        keys = [key for i, key in enumerate(keys) if i == 0 or key != keys[i - 1]]
+
+        def build(lo, hi, parent):
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = self._new_node(keys[mid])
+            node.parent = parent
+            node.left_child = build(lo, mid, node)
+            node.right_child = build(mid + 1, hi, node)
+            return node
+
+        self.root = build(0, len(keys), None)
+        self._size = len(keys)
+        self._bump_version()
+        return self.root
+
+    def _delete_node(self, node):
+        """
+        物理删除节点 node。
+        Returns:
+            Node: 被物理移除节点的父节点（双子节点情况下为后继节点的父节点），删除根时为 None。
+        """
+        removed_parent = node.parent
 
         # 情况1：叶子节点
         if node.left_child is None and node.right_child is None:
@@ -583,6 +1013,7 @@ class BinarySearchTree(BinaryTree, Serializable):
         else:
             # 找到中序后继（右子树最小值）
             successor = self._find_min_node(node.right_child)
+            removed_parent = successor.parent
             # 交换数据
             node.data = successor.data
 
@@ -595,7 +1026,8 @@ class BinarySearchTree(BinaryTree, Serializable):
                 successor.right_child.parent = successor.parent
 
         self._size -= 1
-        return True
+        self._bump_version()
+        return removed_parent
 
     def display(self):
         """显示二叉搜索树（中序遍历结果为有序序列）"""
@@ -635,47 +1067,172 @@ class HuffmanTree(BinaryTree, Serializable):
             self.build_from_weights(weight_dict)
 
     def build_from_weights(self, weight_dict):
-        """根据权重字典构建哈夫曼树"""
+        """
+        根据权重字典构建哈夫曼树。
+        平局规则：权重相同时先创建的节点优先出队（叶子按字典顺序在前，合并出的父节点按生成顺序排在后面），
+        较小者作为左孩子。该规则与逐轮稳定排序的结果完全一致。
+        权重已按字典顺序非递减时走 O(n) 的双队列构建，否则使用 O(n log n) 的最小堆。
+        """
         nodes = [HuffmanNode(data, weight) for data, weight in weight_dict.items()]
         self._size = len(nodes)
 
-        while len(nodes) > 1:
-            nodes.sort(key=lambda x: x.weight)
+        if all(nodes[i].weight <= nodes[i + 1].weight for i in range(len(nodes) - 1)):
+            self.root = self._build_two_queues(nodes)
+        else:
+            self.root = self._build_heap(nodes)
+        self._size += max(len(nodes) - 1, 0)
+        self._bump_version()
 
-            left = nodes.pop(0)
-            right = nodes.pop(0)
+    @staticmethod
+    def _merge(left, right):
+        parent = HuffmanNode(weight=left.weight + right.weight)
+        parent.left_child = left
+        parent.right_child = right
+        left.parent = parent
+        right.parent = parent
+        return parent
+
+    def _build_heap(self, nodes):
+        """最小堆构建，键为 (权重, 创建序号)"""
+        heap = [(node.weight, seq, node) for seq, node in enumerate(nodes)]
+        heapq.heapify(heap)
+        seq = len(nodes)
+        while len(heap) > 1:
+            left = heapq.heappop(heap)[2]
+            right = heapq.heappop(heap)[2]
+            parent = self._merge(left, right)
+            heapq.heappush(heap, (parent.weight, seq, parent))
+            seq += 1
+        return heap[0][2] if heap else None
+
+    def _build_two_queues(self, nodes):
+        """
+        双队列构建：叶子已有序，合并出的父节点权重也单调不减，
+        每次只需比较两个队首。权重相同时叶子创建得更早，优先取叶子队列。
+        """
+        leaves = deque(nodes)
+        merged = deque()
+
+        def pop_min():
+            if not merged or (leaves and leaves[0].weight <= merged[0].weight):
+                return leaves.popleft()
+            return merged.popleft()
+
+        while len(leaves) + len(merged) > 1:
+            left = pop_min()
+            right = pop_min()
+            merged.append(self._merge(left, right))
+        if merged:
+            return merged[0]
+        return leaves[0] if leaves else None
+
+    def _iter_leaf_codes(self):
+        """显式栈遍历所有叶子，产出 (叶子节点, 编码整数, 编码长度)，左0右1"""
+        if not self.root:
+            return
+        stack = [(self.root, 0, 0)]
+        while stack:
+            node, code, length = stack.pop()
+            if node.data is not None:
+                yield node, code, length
+                continue
+            if node.right_child:
+                stack.append((node.right_child, (code << 1) | 1, length + 1))
+            if node.left_child:
+                stack.append((node.left_child, code << 1, length + 1))
 
-            parent = HuffmanNode(weight=left.weight + right.weight)
-            parent.left_child = left
-            parent.right_child = right
-            left.parent = parent
-            right.parent = parent
+    def get_huffman_code(self):
+        """生成哈夫曼编码（左0右1）"""
+        codes = {}
+        for node, code, length in self._iter_leaf_codes():
+            codes[node.data] = format(code, f'0{length}b') if length else ""
+        return codes
 
-            nodes.append(parent)
-            self._size += 1
+    def get_code_table(self):
+        """
+        生成整数形式的码表 {字符: (编码整数, 编码长度)}，供按位编码使用。
+        只有一个字符时规定其编码为长度 1 的 "0"，保证每个符号至少占 1 位。
+        """
+        return {node.data: (code, max(length, 1)) for node, code, length in self._iter_leaf_codes()}
 
-        self.root = nodes[0] if nodes else None
+    # ---------- 范式哈夫曼编码 ----------
 
-    def get_huffman_code(self):
-        """生成哈夫曼编码（左0右1）"""
-        if not self.root:
-            return {}
+    def get_code_lengths(self):
+        """各字符的编码长度 {字符: 长度}（单字符树长度为 1）"""
+        return {node.data: max(length, 1) for node, code, length in self._iter_leaf_codes()}
 
-        codes = {}
-        self._generate_code(self.root, "", codes)
+    def _canonical_order(self):
+        """按 (编码长度, 叶子从左到右的顺序) 排列，返回 (字符列表, 长度列表)"""
+        items = sorted(self.get_code_lengths().items(), key=lambda kv: kv[1])  # 稳定排序保留叶子顺序
+        return [sym for sym, _ in items], [length for _, length in items]
+
+    @staticmethod
+    def _assign_canonical_codes(lengths):
+        """按非递减的长度列表依次分配范式编码：同长度连续递增，长度增加时左移补 0"""
+        codes = []
+        code = 0
+        prev_length = lengths[0] if lengths else 0
+        for length in lengths:
+            code <<= length - prev_length
+            codes.append(code)
+            code += 1
+            prev_length = length
         return codes
 
-    def _generate_code(self, node, current_code, codes):
-        """递归生成哈夫曼编码辅助函数"""
-        if node is None:
-            return
+    def get_canonical_code(self):
+        """范式哈夫曼码表 {字符: (编码整数, 编码长度)}，只由编码长度决定"""
+        symbols, lengths = self._canonical_order()
+        codes = self._assign_canonical_codes(lengths)
+        return {sym: (code, length) for sym, code, length in zip(symbols, codes, lengths)}
 
-        if node.data is not None:
-            codes[node.data] = current_code
-            return
+    def to_canonical_dict(self):
+        """
+        紧凑序列化：只保存按范式顺序排列的字符列表和编码长度列表（不含权重）。
+        由 from_dict / from_code_lengths 还原出的树与 get_canonical_code 的码表一致。
+        """
+        symbols, lengths = self._canonical_order()
+        return {
+            'type': 'HuffmanTree',
+            'format': 'canonical',
+            'symbols': symbols,
+            'lengths': lengths
+        }
 
-        self._generate_code(node.left_child, current_code + "0", codes)
-        self._generate_code(node.right_child, current_code + "1", codes)
+    @classmethod
+    def from_code_lengths(cls, symbols, lengths):
+        """
+        由范式顺序的字符列表和编码长度重建哈夫曼树，O(n)。
+        自底向上逐层构建：每一层先放该长度的叶子，再放由下一层两两合并出的内部节点，
+        这样同层叶子总是排在左侧，树上左0右1得到的正是范式编码。重建出的节点权重为 0。
+        """
+        if len(symbols) != len(lengths):
+            raise ValueError("字符列表与编码长度列表长度不一致")
+        obj = cls()
+        if not symbols:
+            return obj
+        if len(symbols) == 1:
+            obj.root = HuffmanNode(symbols[0], 0)
+            obj._size = 1
+            return obj
+
+        by_length = {}
+        for sym, length in zip(symbols, lengths):
+            if length < 1:
+                raise ValueError("编码长度必须为正整数")
+            by_length.setdefault(length, []).append(sym)
+
+        level = []  # 当前层（深度 depth）的节点，从左到右
+        for depth in range(max(by_length), 0, -1):
+            if len(level) % 2:
+                raise ValueError("编码长度不构成完备的前缀码")
+            merged = [cls._merge(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+            level = [HuffmanNode(sym, 0) for sym in by_length.get(depth, ())] + merged
+        if len(level) != 2:
+            raise ValueError("编码长度不构成完备的前缀码")
+
+        obj.root = cls._merge(level[0], level[1])
+        obj._size = 2 * len(symbols) - 1
+        return obj
 
     def display(self):
         """显示哈夫曼树及编码"""
@@ -688,36 +1245,23 @@ class HuffmanTree(BinaryTree, Serializable):
         for data, code in codes.items():
             print(f"{data}: {code}")
 
-    def to_dict(self):
-        def node_to_dict(node):
-            if not node:
-                return None
-            return {
-                'data': node.data,
-                'weight': node.weight,
-                'left_child': node_to_dict(node.left_child),
-                'right_child': node_to_dict(node.right_child)
-            }
+    def _node_to_dict(self, node):
+        return {'data': node.data, 'weight': node.weight}
 
+    def to_dict(self):
         return {
             'type': 'HuffmanTree',
-            'root': node_to_dict(self.root),
+            'root': self._tree_to_dict(),
             'size': self._size
         }
 
     @classmethod
     def from_dict(cls, data):
-        def dict_to_node(node_dict):
-            if not node_dict:
-                return None
-            # 必须使用 HuffmanNode 来实例化，以保持 weight 属性
-            node = HuffmanNode(node_dict['data'], node_dict['weight'])
-            node.left_child = dict_to_node(node_dict['left_child'])
-            node.right_child = dict_to_node(node_dict['right_child'])
-            return node
-
+        if data.get('format') == 'canonical':
+            return cls.from_code_lengths(data['symbols'], data['lengths'])
         obj = cls()
-        obj.root = dict_to_node(data['root'])
+        # 必须使用 HuffmanNode 来实例化，以保持 weight 属性
+        obj.root = cls._tree_from_dict(data['root'], lambda d: HuffmanNode(d['data'], d['weight']))
         obj._size = data['size']
         return obj
 
@@ -767,15 +1311,39 @@ class AVLTree(BinarySearchTree, Serializable):
         return self._get_height(node.left_child) - self._get_height(node.right_child)
 
     def _recalc_heights(self, node):
-        """递归刷新全树高度，确保删除后BF值准确"""
-        if not node: return 0
-        l = self._recalc_heights(node.left_child)
-        r = self._recalc_heights(node.right_child)
-        node.height = 1 + max(l, r)
-        return node.height
+        """全量刷新以 node 为根的子树高度（后序遍历，仅用于外部拼装的树）"""
+        for n in self.iter_postorder(node) if node else ():
+            self._update_height(n)
+        return self._get_height(node)
+
+    def _update_height(self, node):
+        """根据子节点高度 O(1) 刷新 node 的高度，返回高度是否发生变化"""
+        height = 1 + max(self._get_height(node.left_child), self._get_height(node.right_child))
+        changed = height != node.height
+        node.height = height
+        return changed
+
+    def _refresh_heights_upward(self, node):
+        """沿祖先链向上刷新高度，某一层高度不变时即可停止"""
+        while node and self._update_height(node):
+            node = node.parent
 
     def rotate_right(self, y):
-        """右旋"""
+        """右旋（单独调用时顺带刷新祖先链上的高度）"""
+        x = self._rotate_right(y)
+        if x is not y:
+            self._refresh_heights_upward(x.parent)
+        return x
+
+    def rotate_left(self, x):
+        """左旋（单独调用时顺带刷新祖先链上的高度）"""
+        y = self._rotate_left(x)
+        if y is not x:
+            self._refresh_heights_upward(y.parent)
+        return y
+
+    def _rotate_right(self, y):
+        """右旋，只刷新被旋转的两个节点的高度；祖先由调用者（_retrace）继续向上处理"""
         if not y or not y.left_child: return y
         x = y.left_child
         T2 = x.right_child
@@ -795,13 +1363,14 @@ class AVLTree(BinarySearchTree, Serializable):
         else:
             self.root = x
 
-        # 旋转后务必更新涉及节点的高度
-        self._recalc_heights(y)
-        self._recalc_heights(x)
+        # 旋转后只有 y、x 及其祖先的高度可能变化
+        self._update_height(y)
+        self._update_height(x)
+        self._bump_version()
         return x
 
-    def rotate_left(self, x):
-        """左旋"""
+    def _rotate_left(self, x):
+        """左旋，只刷新被旋转的两个节点的高度"""
         if not x or not x.right_child: return x
         y = x.right_child
         T2 = y.left_child
@@ -821,21 +1390,46 @@ class AVLTree(BinarySearchTree, Serializable):
         else:
             self.root = y
 
-        self._recalc_heights(x)
-        self._recalc_heights(y)
+        self._update_height(x)
+        self._update_height(y)
+        self._bump_version()
         return y
 
+    def _rebalance_node(self, node):
+        """对失衡节点执行 LL/LR/RR/RL 旋转，返回旋转后该子树的新根"""
+        bf = self._get_balance(node)
+        if bf > 1:
+            if self._get_balance(node.left_child) < 0:
+                self._rotate_left(node.left_child)
+            return self._rotate_right(node)
+        if self._get_balance(node.right_child) > 0:
+            self._rotate_right(node.right_child)
+        return self._rotate_left(node)
+
+    def _retrace(self, node, rebalance=True):
+        """
+        从 node 沿祖先链回溯，逐层刷新高度；rebalance=True 时顺路旋转失衡节点。
+        只触及被修改位置到根的路径，复杂度 O(log n)。
+        """
+        while node:
+            self._update_height(node)
+            if rebalance and abs(self._get_balance(node)) > 1:
+                node = self._rebalance_node(node)
+            node = node.parent
+
     def insert(self, data, auto_balance=True):
         if not self.root:
             self.root = AVLTreeNode(data)
             self._size = 1
+            self._bump_version()
             return self.root
 
+        old_size = self._size
         new_node = self._insert_bst(self.root, data)
-        self._recalc_heights(self.root)  # 插入后刷新高度
-
-        if auto_balance:
-            self.rebalance_all()
+        if self._size != old_size:  # 重复元素不会新增节点，无需回溯
+            self._bump_version()
+            # auto_balance=False 时只刷新高度，由可视化层逐步演示旋转
+            self._retrace(new_node.parent, auto_balance)
         return new_node
 
     def _insert_bst(self, node, data):
@@ -867,59 +1461,37 @@ class AVLTree(BinarySearchTree, Serializable):
 
     def delete(self, data, auto_balance=True):
         """
-        删除节点（修复了空树崩溃问题）
+        删除节点
         Returns:
-            Node: 平衡检查的起始节点 (即被物理移除节点的父节点)。
+            Node: 平衡检查的起始节点 (即被物理移除节点的父节点)；树被删空或元素不存在时为 None。
         """
-        # 1. 查找目标节点和它的父节点（为了后续动画逻辑）
-        target_node = self.search(data)  # 假设你有 search 方法
-        parent_of_target = target_node.parent if target_node else None
-
-        # 2. 执行物理删除
-        success = super().delete(data)
-
-        if success:
-            # --- 修复核心：必须检查 root 是否存在 ---
-            if self.root:
-                # 只有树还不为空时，才刷新高度
-                self._recalc_heights(self.root)
-
-                if auto_balance:
-                    self.rebalance_all()
-
-                # 返回平衡起点：如果父节点还在，就返回父节点；否则返回新根
-                if parent_of_target and parent_of_target.parent is not None:
-                    # 注意：这里要再次确认 parent 是否还在树里（没被旋转走或连带删除）
-                    return parent_of_target
-                else:
-                    return self.root
-            else:
+        target_node = self.search(data)
+        if not target_node:
+            return None
 
-                return None
+        balance_start = self._delete_node(target_node)
+        if not self.root:
+            return None
 
-        return None
+        self._retrace(balance_start, auto_balance)
+        # 删除根节点时没有父节点，平衡检查从新根开始
+        return balance_start or self.root
+
+    def _new_node(self, data):
+        return AVLTreeNode(data)
+
+    def bulk_load(self, values):
+        """按中点递归建出的树本身就是平衡的，只需补上各节点的高度"""
+        root = super().bulk_load(values)
+        self._recalc_heights(root)
+        return root
 
     def rebalance_all(self):
-        """循环直到全树平衡"""
+        """循环直到全树平衡（旋转自身会维护高度，无需每轮全量刷新）"""
         while True:
             node = self.get_lowest_unbalanced_node()
             if not node: break
-
-            bf = self._get_balance(node)
-            if bf > 1:
-                if self._get_balance(node.left_child) >= 0:
-                    self.rotate_right(node)
-                else:
-                    self.rotate_left(node.left_child)
-                    self.rotate_right(node)
-            else:
-                if self._get_balance(node.right_child) <= 0:
-                    self.rotate_left(node)
-                else:
-                    self.rotate_right(node.right_child)
-                    self.rotate_left(node)
-            # 每次旋转后刷新高度
-            self._recalc_heights(self.root)
+            self._rebalance_node(node)
 
     def get_lowest_unbalanced_node(self, start_node=None):
         """
@@ -942,14 +1514,10 @@ class AVLTree(BinarySearchTree, Serializable):
 
     def _find_deepest_unbalanced_recursive(self, node):
         if not node: return None
-        # 后序遍历：左右根
-        l = self._find_deepest_unbalanced_recursive(node.left_child)
-        if l: return l
-        r = self._find_deepest_unbalanced_recursive(node.right_child)
-        if r: return r
-
-        if abs(self._get_balance(node)) > 1:
-            return node
+        # 后序遍历：左右根，第一个失衡节点即最深的一个
+        for n in self.iter_postorder(node):
+            if abs(self._get_balance(n)) > 1:
+                return n
         return None
 
     def to_dict(self):
@@ -960,19 +1528,10 @@ class AVLTree(BinarySearchTree, Serializable):
     @classmethod
     def from_dict(cls, data):
         temp = BinaryTree.from_dict(data)
-        elements = []
-
-        def collect(n):
-            if n:
-                collect(n.left_child)
-                elements.append(n.data)
-                collect(n.right_child)
-
-        collect(temp.root)
+        elements = [n.data for n in temp.iter_inorder()]
 
         obj = cls()
-        for e in elements:
-            obj.insert(e, auto_balance=True)
+        obj.bulk_load(elements)
         return obj
 
 
@@ -980,19 +1539,27 @@ class DataStructureManager:
     """数据结构管理器，负责保存和加载"""
 
     @staticmethod
-    def save_structure(structure, filename):
-        """保存数据结构到文件"""
+    def save_structure(structure, filename, compact=False):
+        """
+        保存数据结构到文件。
+        compact=True 时哈夫曼树只保存范式编码的字符与码长（不含权重），并去掉 JSON 缩进。
+        """
         try:
-            data = structure.to_dict()
+            if compact and hasattr(structure, 'to_canonical_dict'):
+                data = structure.to_canonical_dict()
+            else:
+                data = structure.to_dict()
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                if compact:
+                    json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+                else:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             return True
         except Exception as e:
             # 捕获异常时，打印更详细的错误信息
             print(f"保存失败: {e}")
             return False
 
-    @staticmethod
     @staticmethod
     def load_structure(filename):
         """从文件加载数据结构"""
@@ -0,0 +1,129 @@
+"""
+Morph 动画的预计算方案
+
+AVL 旋转 / 布局过渡的 morph 动画在开始时一次性整理好：
+- 节点顺序、起止坐标数组、透明度的起止值（只在起点出现的节点渐隐，只在终点出现的渐显）；
+- 连线的 (子节点下标, 父节点下标) 数组；
+- 每个节点的填充色与文字。
+之后每一帧只需要一次向量化插值，再按下标批量取出可见的节点和连线；
+保留模式的后端用 moving_frame 只取坐标或透明度会变化的节点，逐个移动对应的图元。
+
+安装了 numpy 时使用数组运算，否则退回等价的纯 Python 实现。
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MorphPlan:
+    """一次 morph 动画的预计算数据"""
+
+    def __init__(self, start_positions, end_positions, fill=None, label=str, parent_of=None):
+        """
+        Args:
+            start_positions / end_positions: {节点: (x, y)}
+            fill: node -> 填充色（整个动画期间不变）
+            label: node -> 文字，默认 str(node.data)
+            parent_of: node -> 父节点，默认读取 node.parent
+        """
+        if parent_of is None:
+            parent_of = lambda node: getattr(node, 'parent', None)
+        nodes = list(start_positions)
+        nodes.extend(node for node in end_positions if node not in start_positions)
+        self.nodes = nodes
+        index = {node: i for i, node in enumerate(nodes)}
+
+        start_xy, end_xy, start_alpha, end_alpha = [], [], [], []
+        for node in nodes:
+            p_start, p_end = start_positions.get(node), end_positions.get(node)
+            start_xy.append(tuple(p_start or p_end))
+            end_xy.append(tuple(p_end or p_start))
+            start_alpha.append(1.0 if p_start else 0.0)
+            end_alpha.append(1.0 if p_end else 0.0)
+
+        edges = [(i, index[parent]) for i, node in enumerate(nodes)
+                 for parent in (parent_of(node),) if parent is not None and parent in index]
+
+        self.edge_pairs = edges  # [(子节点下标, 父节点下标)]
+        self.labels = [label(getattr(node, 'data', node)) for node in nodes]
+        self.fills = [fill(node) if fill else None for node in nodes]
+        # 起止坐标或透明度不同的节点，只有它们在动画过程中需要移动
+        self.moving = [i for i in range(len(nodes))
+                       if start_xy[i] != end_xy[i] or start_alpha[i] != end_alpha[i]]
+
+        if np is not None:
+            self.start_xy = np.asarray(start_xy, dtype=float).reshape(-1, 2)
+            self.delta_xy = np.asarray(end_xy, dtype=float).reshape(-1, 2) - self.start_xy
+            self.start_alpha = np.asarray(start_alpha, dtype=float)
+            self.delta_alpha = np.asarray(end_alpha, dtype=float) - self.start_alpha
+            self.edge_child = np.asarray([c for c, _ in edges], dtype=np.intp)
+            self.edge_parent = np.asarray([p for _, p in edges], dtype=np.intp)
+            self._moving_idx = np.asarray(self.moving, dtype=np.intp)
+        else:
+            self.start_xy = start_xy
+            self.delta_xy = [(ex - sx, ey - sy) for (sx, sy), (ex, ey) in zip(start_xy, end_xy)]
+            self.start_alpha = start_alpha
+            self.delta_alpha = [e - s for s, e in zip(start_alpha, end_alpha)]
+            self.edges = edges
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def moving_frame(self, t):
+        """进度 t 时会变化的节点：[(下标, x, y, 透明度)]，不做可见性裁剪"""
+        if np is not None:
+            idx = self._moving_idx
+            xy = (self.start_xy[idx] + self.delta_xy[idx] * t).tolist()
+            alpha = np.clip(self.start_alpha[idx] + self.delta_alpha[idx] * t, 0.0, 1.0).tolist()
+            return [(i, x, y, a) for i, (x, y), a in zip(self.moving, xy, alpha)]
+        result = []
+        for i in self.moving:
+            (sx, sy), (dx, dy) = self.start_xy[i], self.delta_xy[i]
+            a = min(1.0, max(0.0, self.start_alpha[i] + self.delta_alpha[i] * t))
+            result.append((i, sx + dx * t, sy + dy * t, a))
+        return result
+
+    def frame(self, t, bounds):
+        """
+        计算进度 t 时的一帧。bounds=(x0, y0, x1, y1) 为可见范围。
+        Returns:
+            nodes: [(下标, x, y, 透明度)]，只含可见且透明度 > 0.05 的节点
+            edges: [(x1, y1, x2, y2, 透明度)]，只含与可见范围相交且透明度 > 0.05 的连线
+        """
+        x0, y0, x1, y1 = bounds
+        if np is not None:
+            return self._frame_numpy(t, x0, y0, x1, y1)
+
+        xy = [(sx + dx * t, sy + dy * t) for (sx, sy), (dx, dy) in zip(self.start_xy, self.delta_xy)]
+        alpha = [min(1.0, max(0.0, s + d * t)) for s, d in zip(self.start_alpha, self.delta_alpha)]
+        nodes = [(i, x, y, a) for i, ((x, y), a) in enumerate(zip(xy, alpha))
+                 if a > 0.05 and x0 <= x <= x1 and y0 <= y <= y1]
+        edges = []
+        for c, p in self.edges:
+            a = min(alpha[c], alpha[p])
+            (cx, cy), (px, py) = xy[c], xy[p]
+            if a <= 0.05 or max(cx, px) < x0 or min(cx, px) > x1 or max(cy, py) < y0 or min(cy, py) > y1:
+                continue
+            edges.append((cx, cy, px, py, a))
+        return nodes, edges
+
+    def _frame_numpy(self, t, x0, y0, x1, y1):
+        xy = self.start_xy + self.delta_xy * t
+        alpha = np.clip(self.start_alpha + self.delta_alpha * t, 0.0, 1.0)
+        xs, ys = xy[:, 0], xy[:, 1]
+
+        visible = (alpha > 0.05) & (xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)
+        idx = np.nonzero(visible)[0]
+        nodes = list(zip(idx.tolist(), xs[idx].tolist(), ys[idx].tolist(), alpha[idx].tolist()))
+
+        c, p = self.edge_child, self.edge_parent
+        if len(c) == 0:
+            return nodes, []
+        cx, cy, px, py = xs[c], ys[c], xs[p], ys[p]
+        edge_alpha = np.minimum(alpha[c], alpha[p])
+        keep = ((edge_alpha > 0.05) & (np.maximum(cx, px) >= x0) & (np.minimum(cx, px) <= x1)
+                & (np.maximum(cy, py) >= y0) & (np.minimum(cy, py) <= y1))
+        k = np.nonzero(keep)[0]
+        edges = list(zip(cx[k].tolist(), cy[k].tolist(), px[k].tolist(), py[k].tolist(), edge_alpha[k].tolist()))
+        return nodes, edges
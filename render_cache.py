@@ -0,0 +1,143 @@
+"""
+绘图资源缓存
+
+- StyleCache：按参数缓存 QColor / QPen / QBrush / QFont，绘制时不再为每个元素重复创建；
+- TextCache：按 (文字, 字体) 缓存排好版的 QStaticText（LRU 淘汰，容量有上限），
+  重复出现的标签（节点值、下标等）不会在每一帧重新排版。
+
+缓存中的对象是共享的，取出后不要修改（需要修改时先复制一份）。
+"""
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QColor, QPen, QBrush, QFont, QStaticText, QTransform
+
+DEFAULT_TEXT_CACHE_SIZE = 4096
+
+
+def _color_key(color):
+    """颜色参数可以是 (r, g, b[, a]) 元组、QColor 或 Qt.GlobalColor"""
+    if isinstance(color, QColor):
+        return color.rgba()
+    if isinstance(color, tuple):
+        return color
+    return QColor(color).rgba()
+
+
+class StyleCache:
+    """画笔 / 画刷 / 字体 / 颜色缓存"""
+
+    def __init__(self):
+        self._colors = {}
+        self._pens = {}
+        self._brushes = {}
+        self._fonts = {}
+
+    def color(self, color):
+        key = _color_key(color)
+        cached = self._colors.get(key)
+        if cached is None:
+            if isinstance(key, tuple):
+                cached = QColor(*key)
+            else:
+                cached = QColor.fromRgba(key)
+            self._colors[key] = cached
+        return cached
+
+    def pen(self, color, width=1, style=Qt.SolidLine, cap=None):
+        key = (_color_key(color), width, style, cap)
+        cached = self._pens.get(key)
+        if cached is None:
+            cached = QPen(self.color(color), width, style)
+            if cap is not None:
+                cached.setCapStyle(cap)
+            self._pens[key] = cached
+        return cached
+
+    def brush(self, color):
+        key = _color_key(color)
+        cached = self._brushes.get(key)
+        if cached is None:
+            cached = QBrush(self.color(color))
+            self._brushes[key] = cached
+        return cached
+
+    def font(self, family, size, weight=-1):
+        key = (family, size, weight)
+        cached = self._fonts.get(key)
+        if cached is None:
+            cached = QFont(family, size, weight)
+            self._fonts[key] = cached
+        return cached
+
+    def clear(self):
+        self._colors.clear()
+        self._pens.clear()
+        self._brushes.clear()
+        self._fonts.clear()
+
+
+class TextCache:
+    """QStaticText 的 LRU 缓存，键为 (文字, 字体)"""
+
+    def __init__(self, maxsize=DEFAULT_TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items = OrderedDict()  # (文字, 字体键) -> (QStaticText, 宽, 高)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, text, font):
+        """取出排好版的单行文字，返回 (QStaticText, 宽, 高)"""
+        key = (text, font.key())
+        items = self._items
+        entry = items.get(key)
+        if entry is not None:
+            items.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        static = QStaticText(text)
+        static.setTextFormat(Qt.PlainText)
+        static.prepare(QTransform(), font)
+        size = static.size()
+        entry = (static, size.width(), size.height())
+        items[key] = entry
+        if len(items) > self.maxsize:
+            items.popitem(last=False)
+        return entry
+
+    def draw_centered(self, painter, rect, text, font):
+        """在 rect 中居中绘制文字（支持用换行分隔的多行），等价于 drawText(rect, Qt.AlignCenter, text)"""
+        painter.setFont(font)
+        lines = [self.get(line, font) for line in text.split('\n')]
+        total_h = sum(h for _, _, h in lines)
+        cx = rect.center().x()
+        y = rect.center().y() - total_h / 2
+        for static, w, h in lines:
+            painter.drawStaticText(QPointF(cx - w / 2, y), static)
+            y += h
+
+    def draw_aligned(self, painter, rect, flags, text, font):
+        """按 Qt.AlignLeft / AlignRight 与 AlignTop / AlignVCenter 在 rect 中绘制单行文字"""
+        painter.setFont(font)
+        static, w, h = self.get(text, font)
+        if flags & Qt.AlignRight:
+            x = rect.right() - w
+        elif flags & Qt.AlignHCenter:
+            x = rect.center().x() - w / 2
+        else:
+            x = rect.left()
+        if flags & Qt.AlignVCenter:
+            y = rect.center().y() - h / 2
+        elif flags & Qt.AlignBottom:
+            y = rect.bottom() - h
+        else:
+            y = rect.top()
+        painter.drawStaticText(QPointF(x, y), static)
+
+    def clear(self):
+        self._items.clear()
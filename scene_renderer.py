@@ -0,0 +1,617 @@
+"""
+保留模式渲染后端（QGraphicsScene / QGraphicsView）
+
+与 VisualArea 的即时模式 paintEvent 不同，这里的节点、格子和连线都是常驻的图元：
+- 每次 update() / set_data_structure() 后，按“键”（树节点对象、哈夫曼数组下标、线性结构下标）
+  与上一次的结果做差异比较，只增删变化的图元、只修改变化的属性；
+- 结构变化后已有节点平滑移动到新位置，动画只改动被移动图元的坐标，由场景负责局部重绘；
+- 动画时钟的逐帧刷新走 update_animated：阶段、结构与版本都没变时只移动运动中的图元
+  （AVL morph 用动画开始时整理好的 MorphPlan，哈夫曼按 node_positions），不重新生成、比较全部图元；
+- 树布局与 VisualArea 一样用 IncrementalTreeLayout，局部结构变化后只重新合并变化的路径；
+- 场景使用 BSP 树索引，缩放 / 平移时只绘制可见的图元。
+
+SceneVisualArea 提供与 VisualArea 相同的属性与方法（anim_state、node_positions、
+calculate_all_node_positions 等），可在可视化窗口中直接替换。AVL 的 morph 动画、
+高亮节点 / 下标、哈夫曼构建过程会同步到图元上；VisualArea 中其余逐帧绘制的细节动画
+（如入队飞入、BST 查找浮层）在本后端中只显示结构的当前状态。
+"""
+from PyQt5.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsEllipseItem, QGraphicsRectItem,
+                             QGraphicsLineItem, QGraphicsSimpleTextItem, QSizePolicy)
+from PyQt5.QtCore import Qt, QTimer, QPointF, QRectF, QLineF, QVariantAnimation, QEasingCurve
+from PyQt5.QtGui import QPainter, QColor, QFont
+
+from model import Stack, Queue, SequenceList, LinkedList
+from tree_layout import IncrementalTreeLayout, fit_transform
+from render_cache import StyleCache
+from morph_plan import MorphPlan
+
+KIND_NODE = 'node'  # 圆形节点（树、哈夫曼）
+KIND_CELL = 'cell'  # 矩形格子（线性结构）
+
+_TREE_FILL = (186, 230, 253)
+_CELL_FILL = (219, 234, 254)
+_HIGHLIGHT_FILL = (250, 204, 21)
+
+
+def _tree_children(node):
+    return getattr(node, 'left_child', None), getattr(node, 'right_child', None)
+
+
+def _tree_parent(node):
+    return getattr(node, 'parent', None)
+
+
+class _NodeItem(QGraphicsEllipseItem):
+    """圆形节点图元，文字居中；只在属性变化时才调用 Qt 的 setter"""
+
+    def __init__(self, radius):
+        super().__init__(-radius, -radius, radius * 2, radius * 2)
+        self.label = QGraphicsSimpleTextItem(self)
+        self.style_key = None
+
+    def apply_style(self, styles, fill, text, font):
+        key = (fill, text)
+        if key == self.style_key:
+            return
+        self.style_key = key
+        self.setBrush(styles.brush(fill))
+        self.setPen(styles.pen((31, 41, 55), 2))
+        self.label.setFont(font)
+        self.label.setText(text)
+        rect = self.label.boundingRect()
+        self.label.setPos(-rect.width() / 2, -rect.height() / 2)
+
+
+class _CellItem(QGraphicsRectItem):
+    """线性结构的格子图元：中间是值，左上角是下标"""
+
+    def __init__(self, width, height):
+        super().__init__(0, 0, width, height)
+        self.label = QGraphicsSimpleTextItem(self)
+        self.index_label = QGraphicsSimpleTextItem(self)
+        self.style_key = None
+
+    def apply_style(self, styles, fill, text, font, index_text):
+        key = (fill, text, index_text)
+        if key == self.style_key:
+            return
+        self.style_key = key
+        rect = self.rect()
+        self.setBrush(styles.brush(fill))
+        self.setPen(styles.pen((30, 58, 138), 2))
+        self.label.setFont(font)
+        self.label.setText(text)
+        text_rect = self.label.boundingRect()
+        self.label.setPos((rect.width() - text_rect.width()) / 2, (rect.height() - text_rect.height()) / 2)
+        self.index_label.setFont(styles.font("Arial", 8, QFont.Bold))
+        self.index_label.setBrush(styles.brush((220, 38, 38)))
+        self.index_label.setText(index_text)
+        self.index_label.setPos(0, -16)
+
+
+class _EdgeItem(QGraphicsLineItem):
+    """连线图元，位于节点下方"""
+
+    def __init__(self):
+        super().__init__()
+        self.setZValue(0)
+        self.color = None
+
+
+class SceneVisualArea(QGraphicsView):
+    """基于 QGraphicsScene 的可视化区域，接口与 VisualArea 一致"""
+
+    MIN_ZOOM = 0.02
+    MAX_ZOOM = 8.0
+    move_duration = 250  # 结构变化后节点移动到新位置的时长（毫秒），0 表示直接跳到新位置
+
+    # 动画状态中逐帧连续变化的键（同 VisualArea）；其余键变化（换阶段、换下标）时完整同步
+    ANIM_CONTINUOUS_KEYS = frozenset(('progress', 'scale', 'offset_y', 'flash_count', 'flash_time'))
+
+    styles = StyleCache()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setStyleSheet("background-color: #ffffff; border: 1px solid #e5e7eb; border-radius: 8px;")
+
+        self._scene = QGraphicsScene(self)
+        self._scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setScene(self._scene)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+
+        self.data_structure = None
+        self.highlighted_index = -1
+        self.highlighted_node = None
+        self.highlight_color = QColor(255, 215, 0)
+        self.anim_state = {}
+        self.traversal_text = None
+        self.bfs_index_map = {}
+
+        self.cell_width = 120
+        self.cell_height = 45
+        self.cell_spacing = 8
+        self.tree_level_spacing = 60
+        self.node_radius = 22
+
+        self.node_positions = {}
+        self._layout_cache_key = None
+        self.tree_layout = IncrementalTreeLayout(_tree_children, _tree_parent)  # 相对布局，支持局部更新
+        self._tree_transform = (0.0, 1.0)  # 相对布局 -> 像素坐标的 (起点 x, 单位间距)
+
+        self._items = {}  # 键 -> 图元
+        self._edges = {}  # (键, 键) -> 连线图元
+        self._synced_ds = None  # 当前图元对应的结构对象
+        self._move_anim = None  # (QVariantAnimation, 逐帧回调)
+        self._synced_signature = None  # 上一次 sync 时的 _frame_signature()
+        self._frame_step = None  # 当前阶段中只移动运动图元的逐帧回调，没有时为 None
+        self._foreground_key = None  # 前景文字依赖的状态，变化时才重绘整个视口
+
+        # 多次 update() 合并为一次同步
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(0)
+        self._sync_timer.timeout.connect(self.sync)
+
+    # --- 与 VisualArea 兼容的接口 ---
+    def set_data_structure(self, ds):
+        self.data_structure = ds
+        self.update()
+
+    def update_visualization(self, ds=None, highlighted_index=-1):
+        if ds is not None:
+            self.data_structure = ds
+        self.highlighted_index = highlighted_index
+        self.update()
+
+    def update(self, *args):
+        """安排一次图元同步（同一事件循环内的多次调用只同步一次）；图元改动后由场景自行重绘"""
+        self._sync_timer.start()
+
+    def update_animated(self):
+        """
+        动画帧的刷新请求：与上次同步相比只有连续变化量（进度等）改变时，只移动运动中的图元；
+        换阶段、结构或版本变化时完整同步。
+        """
+        if self._sync_timer.isActive() or self._synced_signature != self._frame_signature():
+            self.update()
+        elif self._frame_step is not None:
+            self._frame_step()
+
+    def _frame_signature(self):
+        """除动画连续变化量之外、影响图元的全部状态"""
+        ds = self.data_structure
+        phase = tuple(sorted(
+            (k, v if isinstance(v, (int, float, str, bool, type(None))) else id(v))
+            for k, v in (self.anim_state or {}).items() if k not in self.ANIM_CONTINUOUS_KEYS))
+        return (id(ds), getattr(ds, 'version', None), len(ds) if isinstance(ds, list) else None,
+                self.highlighted_index, id(self.highlighted_node), self.viewport().width(), phase)
+
+    def calculate_all_node_positions(self):
+        root = getattr(self.data_structure, 'root', None)
+        if not root:
+            return {}
+        layout = self.tree_layout.build(root)
+        self._tree_transform = self._fit_tree_transform()
+        return self._map_tree_layout(layout)
+
+    def _fit_tree_transform(self):
+        area_width = self.viewport().width()
+        if area_width < 50: area_width = 800
+        return fit_transform(self.tree_layout.extent(), area_width, self.node_radius * 2 + 6)
+
+    def _map_tree_layout(self, layout):
+        """相对布局 {节点: (x, 深度)} -> 像素坐标 {节点: (x, y)}"""
+        start_x, unit = self._tree_transform
+        spacing = self.tree_level_spacing
+        return {node: (start_x + x * unit, 50 + depth * spacing) for node, (x, depth) in layout.items()}
+
+    def get_node_positions(self):
+        """带缓存的树布局（缓存键同 VisualArea：结构对象、根节点、版本号、宽度）"""
+        ds = self.data_structure
+        root = getattr(ds, 'root', None)
+        version = getattr(ds, 'version', None)
+        width = self.viewport().width()
+        cached = self._layout_cache_key
+        if (version is None or cached is None or cached[0] is not ds or cached[1] is not root
+                or cached[2:] != (version, width)):
+            self.node_positions = self.calculate_all_node_positions()
+            self._layout_cache_key = (ds, root, version, width) if version is not None else None
+        return self.node_positions
+
+    def invalidate_layout(self):
+        self._layout_cache_key = None
+        self.update()
+
+    def notify_subtree_changed(self, *nodes):
+        """
+        树的局部结构改变后增量更新布局，nodes 的含义同 VisualArea.notify_subtree_changed。
+        Returns:
+            dict: {节点: (x, y)}，只含坐标改变了的节点。布局此前未建立时退回全量计算，返回全部坐标。
+        """
+        ds = self.data_structure
+        root = getattr(ds, 'root', None)
+        version = getattr(ds, 'version', None)
+        width = self.viewport().width()
+        cached = self._layout_cache_key
+        if (version is None or cached is None or cached[0] is not ds or cached[3] != width
+                or root is None or self.tree_layout.root is None):
+            self._layout_cache_key = None
+            return dict(self.get_node_positions())
+
+        moved, removed, _ = self.tree_layout.relayout(root, *nodes)
+        self._layout_cache_key = (ds, root, version, width)
+        transform = self._fit_tree_transform()
+        if transform[1] != self._tree_transform[1]:
+            # 单位间距变化（小树铺满宽度时），整体重新映射
+            self._tree_transform = transform
+            old = self.node_positions
+            self.node_positions = self._map_tree_layout(self.tree_layout.layout)
+            return {node: pos for node, pos in self.node_positions.items() if old.get(node) != pos}
+
+        moved = self._map_tree_layout(moved)
+        for node in removed:
+            self.node_positions.pop(node, None)
+        self.node_positions.update(moved)
+        return moved
+
+    def prepare_morph(self, state):
+        """为 morph 动画状态预计算插值方案（动画开始时调用一次），返回 MorphPlan"""
+        plan = MorphPlan(state['start_positions'], state['end_positions'],
+                         fill=lambda node: self._tree_fill(node, state))
+        state['plan'] = plan
+        return plan
+
+    # --- 视图 ---
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if not steps:
+            return
+        factor = 1.15 ** steps
+        scale = self.transform().m11()
+        factor = max(self.MIN_ZOOM / scale, min(self.MAX_ZOOM / scale, factor))
+        self.scale(factor, factor)
+        event.accept()
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit_view()
+        super().mouseDoubleClickEvent(event)
+
+    def reset_view(self):
+        self.resetTransform()
+
+    def fit_view(self, margin=20):
+        rect = self._scene.itemsBoundingRect()
+        if rect.isEmpty():
+            self.resetTransform()
+            return
+        self.fitInView(rect.adjusted(-margin, -margin, margin, margin), Qt.KeepAspectRatio)
+        scale = self.transform().m11()
+        if scale > self.MAX_ZOOM or scale < self.MIN_ZOOM:
+            clamped = max(self.MIN_ZOOM, min(self.MAX_ZOOM, scale))
+            self.scale(clamped / scale, clamped / scale)
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.viewport().update()  # 前景文字固定在视口上，不能随内容一起平移
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if hasattr(self.data_structure, 'root'):
+            self.update()  # 树布局依赖宽度
+
+    # --- 同步 ---
+    def sync(self):
+        """把数据结构的当前状态同步到场景图元"""
+        ds = self.data_structure
+        if ds is not self._synced_ds:
+            self._clear_items()
+            self._synced_ds = ds
+
+        state = self.anim_state or {}
+        animate = False
+        make_step = None  # 生成本阶段逐帧回调的函数（图元建好之后调用）
+        if ds is None:
+            specs, edges = {}, {}
+        elif state.get('type') == 'morph' and state.get('start_positions') and state.get('end_positions'):
+            plan = state.get('plan') or self.prepare_morph(state)
+            specs, edges = self._morph_specs(state, plan)
+            make_step = lambda: self._morph_step(state, plan)
+        elif isinstance(ds, list):
+            specs, edges = self._huffman_specs(ds, state)
+            if state.get('targets'):
+                make_step = lambda: self._huffman_step(state['targets'])
+        elif isinstance(ds, (Stack, Queue, SequenceList, LinkedList)):
+            specs, edges = self._linear_specs(ds, state)
+            animate = True
+        elif hasattr(ds, 'root'):
+            specs, edges = self._tree_specs(state)
+            animate = True
+        else:
+            specs, edges = {}, {}
+        self._apply(specs, edges, animate and self.move_duration > 0)
+        self._frame_step = make_step() if make_step is not None else None
+        self._synced_signature = self._frame_signature()
+
+        bounds = self._scene.itemsBoundingRect()
+        self._scene.setSceneRect(bounds.adjusted(-40, -40, 40, 40))
+        foreground = (id(ds), getattr(ds, 'version', None), getattr(ds, 'root', None) is None, self.traversal_text)
+        if foreground != self._foreground_key:
+            self._foreground_key = foreground
+            self.viewport().update()
+
+    def _clear_items(self):
+        if self._move_anim is not None:
+            self._move_anim[0].stop()
+            self._move_anim = None
+        self._scene.clear()
+        self._items.clear()
+        self._edges.clear()
+
+    def _tree_specs(self, state):
+        """树：键为节点对象。spec 为 (类型, x, y, 填充色, 文字, 透明度)"""
+        positions = self.get_node_positions()
+        specs, edges = {}, {}
+        for node, (x, y) in positions.items():
+            specs[node] = (KIND_NODE, x, y, self._tree_fill(node, state), str(node.data), 1.0)
+            for child in (getattr(node, 'left_child', None), getattr(node, 'right_child', None)):
+                if child is not None and child in positions:
+                    edges[(node, child)] = (31, 41, 55)
+        return specs, edges
+
+    def _tree_fill(self, node, state):
+        if node is state.get('pivot'):
+            return 252, 211, 77
+        if node is state.get('new_root'):
+            return 16, 185, 129
+        if node is self.highlighted_node:
+            return self.highlight_color
+        return _TREE_FILL
+
+    def _morph_specs(self, state, plan):
+        """AVL 旋转的 morph 动画（换阶段时）：静止节点取终点坐标，运动节点取当前进度的插值"""
+        start_pos, end_pos = state['start_positions'], state['end_positions']
+        frame = {i: (x, y, opacity) for i, x, y, opacity in plan.moving_frame(state.get('progress', 0.0))}
+        nodes = plan.nodes
+        specs, edges = {}, {}
+        for i, node in enumerate(nodes):
+            x, y, opacity = frame.get(i) or (*(end_pos.get(node) or start_pos[node]), 1.0)
+            specs[node] = (KIND_NODE, x, y, plan.fills[i], plan.labels[i], opacity)
+        for child, parent in plan.edge_pairs:
+            edges[(nodes[parent], nodes[child])] = (100, 100, 100)
+        return specs, edges
+
+    def _morph_step(self, state, plan):
+        """morph 动画的逐帧回调：只移动 MorphPlan 中起止不同的节点及与其相连的连线"""
+        items = self._items
+        moving = {i: items[plan.nodes[i]] for i in plan.moving if plan.nodes[i] in items}
+        touched = self._edges_touching({plan.nodes[i] for i in moving})
+
+        def step():
+            for i, x, y, opacity in plan.moving_frame(state.get('progress', 0.0)):
+                item = moving.get(i)
+                if item is not None:
+                    item.setPos(x, y)
+                    item.target = (x, y)
+                    item.setOpacity(opacity)
+            self._refresh_edges(touched)
+        return step
+
+    def _huffman_step(self, targets):
+        """哈夫曼构建阶段的逐帧回调：只移动本阶段的目标节点（坐标由可视化窗口写入 node_positions）"""
+        items = self._items
+        moving = [(idx, items[idx]) for idx in targets if idx in items]
+        touched = self._edges_touching(targets)
+
+        def step():
+            positions = self.node_positions
+            for idx, item in moving:
+                pos = positions.get(idx)
+                if pos:
+                    x, y = float(pos[0]), float(pos[1])
+                    item.setPos(x, y)
+                    item.target = (x, y)
+            self._refresh_edges(touched)
+        return step
+
+    def _edges_touching(self, keys):
+        """与 keys 中任一图元相连的连线 [(键对, 连线图元)]"""
+        return [(key, line) for key, line in self._edges.items() if key[0] in keys or key[1] in keys]
+
+    def _refresh_edges(self, touched):
+        items = self._items
+        for (a, b), line in touched:
+            line.setOpacity(min(items[a].opacity(), items[b].opacity()))
+            line.setLine(self._edge_line(a, b))
+
+    def _huffman_specs(self, struct_array, state):
+        """哈夫曼构建过程：节点坐标由可视化窗口写入 node_positions（键为数组下标）"""
+        specs, edges = {}, {}
+        targets = state.get('targets', {})
+        active_parent = state.get('active_parent_idx', -1)
+        for idx, pos in self.node_positions.items():
+            if not isinstance(idx, int) or not 0 <= idx < len(struct_array) or not pos:
+                continue
+            node = struct_array[idx]
+            if idx in targets or idx == active_parent:
+                fill = _HIGHLIGHT_FILL
+            elif node.left == -1 and node.right == -1:
+                fill = (167, 243, 208)
+            else:
+                fill = (254, 215, 170)
+            text = f"{node.data}\n{node.weight}" if node.data else f"{node.weight}"
+            specs[idx] = (KIND_NODE, float(pos[0]), float(pos[1]), fill, text, 1.0)
+        for idx in specs:
+            node = struct_array[idx]
+            for child in (node.left, node.right):
+                if child != -1 and child in specs:
+                    edges[(idx, child)] = (156, 163, 175)
+        return specs, edges
+
+    def _linear_specs(self, ds, state):
+        """线性结构：键为下标；栈竖直向上排列，其余水平排列，链表用连线表示 next 指针"""
+        w, h = self.cell_width, self.cell_height
+        vertical = isinstance(ds, Stack)
+        step = h + self.cell_spacing if vertical else w + (70 if isinstance(ds, LinkedList) else self.cell_spacing)
+        flash = state.get('index') if state.get('type') == 'highlight' else state.get('current_idx')
+        specs, edges = {}, {}
+        for i, value in enumerate(ds):
+            x, y = (0, -i * step) if vertical else (i * step, 0)
+            if i == self.highlighted_index:
+                fill = _HIGHLIGHT_FILL
+            elif i == flash:
+                fill = (245, 158, 11)
+            else:
+                fill = _CELL_FILL
+            specs[i] = (KIND_CELL, x, y, fill, str(value), 1.0)
+            if i and isinstance(ds, LinkedList):
+                edges[(i - 1, i)] = (59, 130, 246)
+        return specs, edges
+
+    def _create_item(self, kind):
+        if kind == KIND_NODE:
+            item = _NodeItem(self.node_radius)
+        else:
+            item = _CellItem(self.cell_width, self.cell_height)
+        item.setZValue(1)
+        self._scene.addItem(item)
+        return item
+
+    def _anchor(self, key, pos):
+        """连线端点：节点取圆心，格子取左右两侧中点（链表）"""
+        item = self._items[key]
+        if isinstance(item, _CellItem):
+            return QPointF(pos.x() + self.cell_width, pos.y() + self.cell_height / 2), \
+                   QPointF(pos.x(), pos.y() + self.cell_height / 2)
+        return pos, pos
+
+    def _edge_line(self, a, b):
+        start, _ = self._anchor(a, self._items[a].pos())
+        _, end = self._anchor(b, self._items[b].pos())
+        return QLineF(start, end)
+
+    def _apply(self, specs, edges, animate):
+        """差异更新：删除多余图元，新建缺失图元，只改动变化的属性；animate 时已有图元平滑移动"""
+        styles = self.styles
+        scene = self._scene
+        items = self._items
+        self._finish_moves()
+
+        for key in [k for k in items if k not in specs]:
+            scene.removeItem(items.pop(key))
+        for key in [k for k in self._edges if k not in edges or k[0] not in specs or k[1] not in specs]:
+            scene.removeItem(self._edges.pop(key))
+
+        node_font = styles.font("Arial", 9, QFont.Bold)
+        cell_font = styles.font("Arial", 11, QFont.Bold)
+        moves = []
+        moved = []
+        changed = set()  # 坐标或透明度有变化的键，与其相连的连线需要更新
+        for key, (kind, x, y, fill, text, opacity) in specs.items():
+            item = items.get(key)
+            if item is None:
+                item = items[key] = self._create_item(kind)
+                item.setPos(x, y)
+                item.target = (x, y)
+                changed.add(key)
+            elif item.target != (x, y):
+                if animate:
+                    moves.append((item, item.pos(), QPointF(x, y)))
+                    moved.append(key)
+                else:
+                    item.setPos(x, y)
+                item.target = (x, y)
+                changed.add(key)
+            if kind == KIND_NODE:
+                item.apply_style(styles, fill, text, node_font)
+            else:
+                item.apply_style(styles, fill, text, cell_font, str(key))
+            if item.opacity() != opacity:
+                item.setOpacity(opacity)
+                changed.add(key)
+
+        for key, color in edges.items():
+            line = self._edges.get(key)
+            a, b = key
+            if line is None:
+                line = self._edges[key] = _EdgeItem()
+                scene.addItem(line)
+            elif a not in changed and b not in changed and line.color == color:
+                continue
+            if line.color != color:
+                line.setPen(styles.pen(color, 2))
+                line.color = color
+            line.setOpacity(min(items[a].opacity(), items[b].opacity()))
+            line.setLine(self._edge_line(a, b))
+
+        if moves:
+            self._start_moves(moves, moved)
+
+    def _start_moves(self, moves, keys):
+        """节点移动动画：每一帧只更新被移动的图元（键为 keys）及与其相连的连线"""
+        touched = self._edges_touching(set(keys))
+
+        def step(t):
+            for item, start, end in moves:
+                item.setPos(start + (end - start) * t)
+            for (a, b), line in touched:
+                line.setLine(self._edge_line(a, b))
+
+        anim = QVariantAnimation(self)
+        anim.setStartValue(0.0)
+        anim.setEndValue(1.0)
+        anim.setDuration(self.move_duration)
+        anim.setEasingCurve(QEasingCurve.InOutQuad)
+        anim.valueChanged.connect(step)
+        anim.finished.connect(lambda: step(1.0))
+        self._move_anim = (anim, step)
+        anim.start()
+
+    def _finish_moves(self):
+        """中断正在进行的移动动画，图元直接到达终点"""
+        if self._move_anim is not None:
+            anim, step = self._move_anim
+            self._move_anim = None
+            anim.stop()
+            step(1.0)
+
+    # --- 背景与屏幕坐标中的文字 ---
+    def drawBackground(self, painter, rect):
+        painter.fillRect(rect, Qt.white)
+        painter.setPen(self.styles.pen((243, 244, 246), 0))
+        step = 40
+        x = int(rect.left()) // step * step
+        while x < rect.right():
+            painter.drawLine(QLineF(x, rect.top(), x, rect.bottom()))
+            x += step
+        y = int(rect.top()) // step * step
+        while y < rect.bottom():
+            painter.drawLine(QLineF(rect.left(), y, rect.right(), y))
+            y += step
+
+    def drawForeground(self, painter, rect):
+        painter.save()
+        painter.resetTransform()
+        ds = self.data_structure
+        viewport_rect = QRectF(self.viewport().rect())
+        if ds is None:
+            painter.setFont(self.styles.font("Microsoft YaHei", 14))
+            painter.setPen(QColor(156, 163, 175))
+            painter.drawText(viewport_rect, Qt.AlignCenter, "可视化区域准备就绪")
+        elif hasattr(ds, 'root'):
+            painter.setFont(self.styles.font("Microsoft YaHei", 10, QFont.Bold))
+            painter.setPen(QColor(107, 114, 128))
+            if ds.root is None:
+                painter.drawText(viewport_rect, Qt.AlignCenter, "空树 (Empty Tree)")
+            else:
+                count = ds.length() if hasattr(ds, 'length') else len(self.node_positions)
+                painter.drawText(QRectF(20, 10, 400, 30), Qt.AlignLeft, f"{type(ds).__name__} - 节点数: {count}")
+        if self.traversal_text:
+            painter.setFont(self.styles.font("Microsoft YaHei", 14, QFont.Bold))
+            painter.setPen(QColor(37, 99, 235))
+            painter.drawText(viewport_rect.adjusted(20, viewport_rect.height() - 80, -20, -20),
+                             Qt.AlignCenter | Qt.TextWordWrap, self.traversal_text)
+        painter.restore()
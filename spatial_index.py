@@ -0,0 +1,87 @@
+"""
+均匀网格空间索引
+
+把带包围盒的图元（节点、连线）登记到固定大小的网格单元中，
+绘制时只查询与可见区域相交的单元，使每帧的开销取决于可见图元数量而不是结构规模。
+"""
+import math
+
+
+class GridIndex:
+    """均匀网格索引：insert 登记包围盒，remove 按包围盒移除，query 返回与矩形相交的图元（不重复）"""
+
+    def __init__(self, cell_size=200):
+        self.cell_size = float(cell_size)
+        self._cells = {}  # (列, 行) -> [(图元, x0, y0, x1, y1), ...]
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _cell_range(self, x0, y0, x1, y1):
+        size = self.cell_size
+        return (math.floor(x0 / size), math.floor(y0 / size),
+                math.floor(x1 / size), math.floor(y1 / size))
+
+    def insert(self, item, x0, y0, x1, y1):
+        """登记图元及其包围盒（坐标会自动规范为 x0 <= x1, y0 <= y1）"""
+        if x0 > x1: x0, x1 = x1, x0
+        if y0 > y1: y0, y1 = y1, y0
+        entry = (item, x0, y0, x1, y1)
+        c0, r0, c1, r1 = self._cell_range(x0, y0, x1, y1)
+        cells = self._cells
+        for c in range(c0, c1 + 1):
+            for r in range(r0, r1 + 1):
+                bucket = cells.get((c, r))
+                if bucket is None:
+                    cells[(c, r)] = [entry]
+                else:
+                    bucket.append(entry)
+        self._count += 1
+
+    def remove(self, item, x0, y0, x1, y1):
+        """按登记时的包围盒移除图元，返回是否找到"""
+        if x0 > x1: x0, x1 = x1, x0
+        if y0 > y1: y0, y1 = y1, y0
+        c0, r0, c1, r1 = self._cell_range(x0, y0, x1, y1)
+        cells = self._cells
+        found = False
+        for c in range(c0, c1 + 1):
+            for r in range(r0, r1 + 1):
+                bucket = cells.get((c, r))
+                if not bucket:
+                    continue
+                for i, entry in enumerate(bucket):
+                    if entry[0] == item:
+                        del bucket[i]
+                        found = True
+                        break
+                if not bucket:
+                    del cells[(c, r)]
+        if found:
+            self._count -= 1
+        return found
+
+    def query(self, x0, y0, x1, y1):
+        """返回包围盒与矩形 [x0, x1] x [y0, y1] 相交的图元列表"""
+        c0, r0, c1, r1 = self._cell_range(x0, y0, x1, y1)
+        cells = self._cells
+        if (c1 - c0 + 1) * (r1 - r0 + 1) > len(cells):
+            # 查询范围远大于已占用的单元（例如缩得很小），直接遍历已占用的单元
+            buckets = [bucket for (c, r), bucket in cells.items() if c0 <= c <= c1 and r0 <= r <= r1]
+        else:
+            buckets = [cells[key] for key in
+                       ((c, r) for c in range(c0, c1 + 1) for r in range(r0, r1 + 1)) if key in cells]
+
+        result = []
+        seen = set()
+        for bucket in buckets:
+            for item, ix0, iy0, ix1, iy1 in bucket:
+                if ix1 < x0 or ix0 > x1 or iy1 < y0 or iy0 > y1:
+                    continue
+                key = id(item)
+                if key in seen:
+                    continue
+                seen.add(key)
+                result.append(item)
+        return result
@@ -0,0 +1,356 @@
+"""
+二叉树整齐布局（Reingold–Tilford 算法的线性时间实现）
+
+- 相邻子树按轮廓线（每层最左/最右节点）贴紧，保证任意规模、任意深度都不重叠；
+- 父节点位于两个孩子正中；只有一个孩子时，孩子向对应一侧偏移半个间距，左右孩子仍可分辨；
+- 全程使用显式栈，不受递归深度限制。
+
+轮廓线以“自底向上”的顺序存放在列表中（列表末尾是子树根所在层），
+合并两棵子树时只需比较、改写较矮一侧高度范围内的元素，再在末尾追加父节点，
+每个节点的代价为 O(min(左高, 右高))，总计 O(n)。
+
+IncrementalTreeLayout 在此基础上缓存每棵子树的轮廓，单次插入 / 删除 / 旋转后只重新合并
+变化位置到根这条路径上的轮廓。
+"""
+
+
+def binary_children(node):
+    """默认的孩子访问器：适用于 BinaryTreeNode 及其子类"""
+    return node.left_child, node.right_child
+
+
+def binary_parent(node):
+    """默认的父节点访问器"""
+    return node.parent
+
+
+def _merge_contours(left_c, right_c, separation, copy=False):
+    """
+    由两个孩子的轮廓合并出父节点的轮廓。left_c / right_c 为 (左轮廓, 右轮廓, 根 x)，缺失的孩子为 None。
+    Returns:
+        (轮廓, 左孩子偏移, 右孩子偏移)，缺失孩子的偏移为 None。
+    默认直接改写并复用较高一侧的轮廓列表；copy=True 时先复制，传入的轮廓保持不变（供缓存复用）。
+    """
+    if left_c is None and right_c is None:
+        return ([0.0], [0.0], 0.0), None, None
+
+    if left_c is None or right_c is None:
+        c_left, c_right, c_root = left_c if right_c is None else right_c
+        if copy:
+            c_left, c_right = list(c_left), list(c_right)
+        shift = -separation / 2 if right_c is None else separation / 2
+        x = c_root - shift
+        c_left.append(x)
+        c_right.append(x)
+        if right_c is None:
+            return (c_left, c_right, x), shift, None
+        return (c_left, c_right, x), None, shift
+
+    l_left, l_right, l_root = left_c
+    r_left, r_right, r_root = right_c
+    common = min(len(l_left), len(r_left))
+
+    # 两根之间所需的最小距离：逐层比较左子树右轮廓与右子树左轮廓
+    gap = 0.0
+    for k in range(1, common + 1):
+        overlap = (l_right[-k] - l_root) - (r_left[-k] - r_root)
+        if overlap > gap:
+            gap = overlap
+    distance = gap + separation
+
+    if len(l_left) >= len(r_left):
+        # 以较高的左子树坐标系为准，改写其右轮廓的上半部分
+        if copy:
+            l_left, l_right = list(l_left), list(l_right)
+        delta = l_root + distance - r_root
+        for k in range(1, common + 1):
+            l_right[-k] = r_right[-k] + delta
+        x = l_root + distance / 2
+        new_left, new_right = l_left, l_right
+    else:
+        if copy:
+            r_left, r_right = list(r_left), list(r_right)
+        delta = r_root - distance - l_root
+        for k in range(1, common + 1):
+            r_left[-k] = l_left[-k] + delta
+        x = r_root - distance / 2
+        new_left, new_right = r_left, r_right
+    new_left.append(x)
+    new_right.append(x)
+    return (new_left, new_right, x), -distance / 2, distance / 2
+
+
+def _subtree_contour(root, children, separation, offsets):
+    """后序遍历自底向上合并轮廓，把每个孩子相对父节点的偏移写入 offsets，返回 root 的轮廓"""
+    contours = {}  # 节点 -> (左轮廓, 右轮廓, 根在轮廓坐标系中的 x)
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        left, right = children(node)
+        if not visited:
+            stack.append((node, True))
+            if right is not None:
+                stack.append((right, False))
+            if left is not None:
+                stack.append((left, False))
+            continue
+
+        contour, left_offset, right_offset = _merge_contours(
+            contours.pop(left) if left is not None else None,
+            contours.pop(right) if right is not None else None, separation)
+        if left is not None:
+            offsets[left] = left_offset
+        if right is not None:
+            offsets[right] = right_offset
+        contours[node] = contour
+    return contours[root]
+
+
+def _accumulate(root, children, offsets):
+    """先序遍历，把相对偏移累加为 {节点: (x, 深度)}，x 以根节点为 0"""
+    positions = {root: (0.0, 0)}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        x, depth = positions[node]
+        for child in children(node):
+            if child is not None:
+                positions[child] = (x + offsets[child], depth + 1)
+                stack.append(child)
+    return positions
+
+
+def tidy_tree_layout(root, children=binary_children, separation=1.0):
+    """
+    计算整齐布局。
+    Args:
+        root: 根节点（None 表示空树）
+        children: 访问器，node -> (左孩子, 右孩子)，缺失的孩子为 None
+        separation: 同层相邻节点的最小水平间距
+    Returns:
+        dict: {节点: (x, 深度)}，x 以根节点为 0
+    """
+    if root is None:
+        return {}
+    offsets = {}  # 节点相对父节点的水平偏移
+    _subtree_contour(root, children, separation, offsets)
+    return _accumulate(root, children, offsets)
+
+
+class IncrementalTreeLayout:
+    """
+    支持局部更新的整齐布局（结果与 tidy_tree_layout 相同）。
+
+    build() 做一次全量布局；之后每次插入 / 删除 / 旋转只需调用 relayout(root, *changed)，
+    changed 为孩子指针发生变化的节点（新插入的节点、被物理删除节点的父节点、旋转后的子树根等）。
+    只有这些节点、其中新接入的子孙以及它们的祖先需要重新合并轮廓，其余子树直接复用缓存的轮廓，
+    合并的代价为 O(变化路径长度 × 树高)。未改动的子树第一次被用到时按子树规模计算一次轮廓，之后常驻缓存。
+    坐标的更新沿着变化了的偏移向下传播，只访问坐标确实改变了的节点。
+    """
+
+    def __init__(self, children=binary_children, parent=binary_parent, separation=1.0):
+        self.children = children
+        self.parent = parent
+        self.separation = separation
+        self.root = None
+        self.layout = {}  # 节点 -> (x, 深度)，x 以根节点为 0
+        self.height = 0
+        self._offsets = {}  # 节点 -> 相对父节点的水平偏移
+        self._contours = {}  # 节点 -> 子树轮廓（只读，合并时先复制）
+        self._links = {}  # 节点 -> 上次布局时的 (左孩子, 右孩子)
+
+    def __len__(self):
+        return len(self.layout)
+
+    def build(self, root):
+        """全量布局并重置缓存，返回 {节点: (x, 深度)}"""
+        self.root = root
+        self._offsets = {}
+        self._contours = {}
+        self._links = {}
+        if root is None:
+            self.layout = {}
+            self.height = 0
+            return self.layout
+        contour = _subtree_contour(root, self.children, self.separation, self._offsets)
+        self._contours[root] = contour
+        self.height = len(contour[0])
+        self.layout = _accumulate(root, self.children, self._offsets)
+        children = self.children
+        self._links = {node: tuple(children(node)) for node in self.layout}
+        return self.layout
+
+    def extent(self):
+        """布局的水平范围 (min_x, max_x)，由根的轮廓得到，O(树高)"""
+        contour = self._contours.get(self.root)
+        if contour is None:
+            return layout_extent(self.layout)
+        c_left, c_right, c_root = contour
+        return min(c_left) - c_root, max(c_right) - c_root
+
+    def _dirty_nodes(self, changed):
+        """需要重新合并轮廓的节点：changed、其下孩子指针与缓存不一致的子孙，以及它们的全部祖先"""
+        children, links = self.children, self._links
+        dirty = set()
+        for node in changed:
+            stack = [node]
+            while stack:
+                n = stack.pop()
+                if n in dirty:
+                    continue
+                dirty.add(n)
+                for c in children(n):
+                    if c is not None and c not in dirty and links.get(c) != tuple(children(c)):
+                        stack.append(c)
+        for node in list(dirty):
+            p = self.parent(node)
+            while p is not None and p not in dirty:
+                dirty.add(p)
+                p = self.parent(p)
+        return dirty
+
+    def _contour_of(self, node):
+        """取未改动子树的轮廓：优先用缓存，否则按子树规模计算一次并缓存"""
+        contour = self._contours.get(node)
+        if contour is None:
+            contour = _subtree_contour(node, self.children, self.separation, self._offsets)
+            self._contours[node] = contour
+        return contour
+
+    def relayout(self, root, *changed):
+        """
+        局部结构改变后增量更新布局。
+        Args:
+            root: 当前的根节点
+            changed: 孩子指针发生变化的节点
+        Returns:
+            (moved, removed, relinked)：
+            moved 为 {节点: (x, 深度)}，只含坐标改变了的节点（包括新节点）；
+            removed 为已不在树中的节点集合；relinked 为重新合并过轮廓的节点集合。
+        """
+        if root is None or self.root is None:
+            old = set(self.layout)
+            layout = self.build(root)
+            return dict(layout), old - set(layout), set(layout)
+
+        changed = [node for node in changed if node is not None]
+        if root is not self.root:
+            changed.append(root)
+        if not changed:
+            return {}, set(), set()
+
+        dirty = self._dirty_nodes(changed)
+        if root not in dirty:
+            # 给出的节点不在当前树中，无法定位变化，退回全量布局
+            return self._rebuild(root)
+        if len(dirty) * max(self.height, 1) > len(self.layout):
+            # 变化路径太长（例如退化成链的树），逐层合并不比全量布局便宜
+            return self._rebuild(root)
+
+        children, separation, offsets = self.children, self.separation, self._offsets
+        old_links = {node: self._links.get(node, ()) for node in dirty}
+        old_root = self.root
+
+        # 1. 只在脏节点上做后序遍历，干净的孩子直接取缓存轮廓
+        stack = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            left, right = children(node)
+            if not visited:
+                stack.append((node, True))
+                for c in (right, left):
+                    if c is not None and c in dirty:
+                        stack.append((c, False))
+                continue
+            contour, left_offset, right_offset = _merge_contours(
+                self._contour_of(left) if left is not None else None,
+                self._contour_of(right) if right is not None else None, separation, copy=True)
+            if left is not None:
+                offsets[left] = left_offset
+            if right is not None:
+                offsets[right] = right_offset
+            self._contours[node] = contour
+            self._links[node] = (left, right)
+        self.root = root
+        self.height = len(self._contours[root][0])
+
+        # 2. 自根向下传播坐标：只进入坐标变化了的节点或脏节点的孩子
+        layout = self.layout
+        moved, seen = {}, set()
+        stack = [(root, 0.0, 0)]
+        while stack:
+            node, x, depth = stack.pop()
+            seen.add(node)
+            if layout.get(node) != (x, depth):
+                layout[node] = moved[node] = (x, depth)
+            elif node not in dirty:
+                continue
+            for child in children(node):
+                if child is not None:
+                    stack.append((child, x + offsets[child], depth + 1))
+
+        # 3. 清理已不在树中的节点（脏节点原来的孩子里没有再被访问到的，连同其原子树）；
+        #    根被替换时原来的根不是任何节点的孩子，需要单独从它开始清理（例如删除了根）
+        removed = set()
+        stack = [c for node in dirty for c in old_links[node] if c is not None and c not in seen]
+        if old_root is not root and old_root not in seen:
+            stack.append(old_root)
+        while stack:
+            node = stack.pop()
+            if node in seen or node in removed or node not in layout:
+                continue
+            removed.add(node)
+            stack.extend(c for c in self._links.get(node, ()) if c is not None)
+        for node in removed:
+            layout.pop(node, None)
+            offsets.pop(node, None)
+            self._contours.pop(node, None)
+            self._links.pop(node, None)
+        return moved, removed, dirty
+
+    def _rebuild(self, root):
+        old = dict(self.layout)
+        layout = self.build(root)
+        moved = {node: pos for node, pos in layout.items() if old.get(node) != pos}
+        return moved, set(old) - set(layout), set(layout)
+
+
+def layout_extent(layout):
+    """布局的水平范围 (min_x, max_x)"""
+    if not layout:
+        return 0.0, 0.0
+    xs = [x for x, _ in layout.values()]
+    return min(xs), max(xs)
+
+
+def place_tree(root, origin_x, origin_y, unit_x, level_spacing, children=binary_children):
+    """
+    计算整齐布局并换算为像素坐标：根节点位于 (origin_x, origin_y)，
+    水平单位间距为 unit_x，层间距为 level_spacing。返回 {节点: (x, y)}。
+    """
+    layout = tidy_tree_layout(root, children)
+    return {node: (origin_x + x * unit_x, origin_y + depth * level_spacing)
+            for node, (x, depth) in layout.items()}
+
+
+def fit_transform(extent, area_width, min_unit, max_unit=120):
+    """
+    按显示宽度选择相对布局到像素的映射：水平单位间距尽量铺满 area_width，
+    但限制在 [min_unit, max_unit] 之间，整棵树水平居中。返回 (start_x, unit)。
+    """
+    min_x, max_x = extent
+    unit = max(min(area_width / (max_x - min_x + 2), max_unit), min_unit)
+    return area_width / 2 - (min_x + max_x) / 2 * unit, unit
+
+
+def fit_tree_positions(root, area_width, min_unit, level_spacing, top=50, max_unit=120, children=binary_children):
+    """
+    计算整齐布局并按显示宽度换算为像素坐标：水平单位间距尽量铺满 area_width，
+    但限制在 [min_unit, max_unit] 之间；整棵树水平居中，根节点位于 y=top。返回 {节点: (x, y)}。
+    """
+    layout = tidy_tree_layout(root, children)
+    if not layout:
+        return {}
+    start_x, unit = fit_transform(layout_extent(layout), area_width, min_unit, max_unit)
+    return {node: (start_x + x * unit, top + depth * level_spacing)
+            for node, (x, depth) in layout.items()}
@@ -5,14 +5,21 @@ import random
 import os
 import json
 from datetime import datetime
+from itertools import islice
 
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLineEdit, QLabel, QGroupBox, QMessageBox, QTextEdit, QGridLayout,
-                             QScrollArea, QSizePolicy, QFileDialog, QCheckBox)  # 导入 QCheckBox
-from PyQt5.QtCore import Qt, QTimer, QUrl, QPointF, QPoint, pyqtSignal, QRectF
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPolygonF
+                             QScrollArea, QScrollBar, QSizePolicy, QFileDialog, QCheckBox)  # 导入 QCheckBox
+from PyQt5.QtCore import Qt, QTimer, QUrl, QPointF, QPoint, pyqtSignal, QRect, QRectF, QLineF
+from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPolygonF, QPixmap, QPainterPath, QRegion
 from PyQt5.QtMultimedia import QSoundEffect
 from DSL_handler import DSLHandler
+from tree_layout import tidy_tree_layout, layout_extent, fit_transform, IncrementalTreeLayout
+from spatial_index import GridIndex
+from render_cache import StyleCache, TextCache
+from scene_renderer import SceneVisualArea
+from morph_plan import MorphPlan
+from animation import Tween, Timeline, ClockTimer, linear, ease_out_cubic, ease_in_quad, ease_in_out_quad
 
 try:
     from model import Stack, Queue,SequenceList, LinkedList, BinaryTree, BinarySearchTree, HuffmanTree, HuffmanStructNode, \
@@ -241,9 +248,56 @@ def lerp(start, end, t):
     return start + (end - start) * t
 
 
+def _tree_children(node):
+    return getattr(node, 'left_child', None), getattr(node, 'right_child', None)
+
+
+def _iter_range(ds, start, stop):
+    """线性结构下标 [start, stop) 内的元素；模型提供 iter_range 时不必从头跳过前 start 个元素"""
+    if hasattr(ds, 'iter_range'):
+        return ds.iter_range(start, stop)
+    return islice(ds, start, stop)
+
+
+def _tree_parent(node):
+    return getattr(node, 'parent', None)
+
+
+# 细节层级（LOD）：按元素在屏幕上的像素尺寸选择绘制方式
+LOD_FULL = 'full'  # 完整绘制（边框 + 文字）
+LOD_SHAPES = 'shapes'  # 只画形状，不画文字
+LOD_SUMMARY = 'summary'  # 折叠：树的子树画成带计数的色块，线性结构按区段汇总
+
+
 class VisualArea(QWidget):
     """通用数据结构可视化组件 (完整防崩溃融合版)"""
 
+    COORD_LIMIT = 1000000  # 世界坐标的安全范围（配合缩放查看大型结构）
+    MIN_ZOOM = 0.02
+    MAX_ZOOM = 8.0
+
+    # LOD 阈值（像素）：元素屏幕尺寸 >= lod_label_min_px 时完整绘制，
+    # >= lod_shape_min_px 时只画形状，更小时折叠汇总；折叠块的最小屏幕尺寸为 lod_summary_px
+    lod_label_min_px = 16
+    lod_shape_min_px = 4
+    lod_summary_px = 24
+
+    LAYER_MAX_PIXELS = 4096 * 4096  # 单个缓存图层的像素上限，超过时退回直接绘制
+
+    # 动画状态中逐帧连续变化的键；其余键变化（换阶段、换下标）时整体重绘
+    ANIM_CONTINUOUS_KEYS = frozenset(('progress', 'scale', 'offset_y', 'flash_count', 'flash_time'))
+    ANIM_REGION_PAD = 4  # 局部重绘区域向外扩展的像素（边框线宽与抗锯齿）
+
+    # 虚拟滚动：线性结构超出窗口时只排布、绘制滚动位置附近的一段格子
+    LINEAR_MARGIN = 20  # 滚动时第一个可见格子与窗口边缘的距离
+    SCROLLBAR_SIZE = 14
+    RULER_SIZE = 18  # 下标标尺的宽度（像素）
+    RULER_MIN_TICK_PX = 60  # 标尺刻度之间的最小屏幕间距
+
+    # 所有 VisualArea 共享的画笔 / 字体缓存与文字排版缓存
+    styles = StyleCache()
+    text_cache = TextCache()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
@@ -268,16 +322,256 @@ class VisualArea(QWidget):
 
         self.node_positions = {}
         self.current_frame_node_pos = {}
+        self._layout_cache_key = None  # (结构对象, 根节点, 版本号, 宽度)
+        self.tree_layout = IncrementalTreeLayout(_tree_children, _tree_parent)  # 相对布局，支持局部更新
+        self._tree_transform = None  # (start_x, unit)：相对布局到像素坐标的映射
+        self._node_index = GridIndex()  # 树节点的空间索引（随布局缓存一起重建）
+        self._edge_index = GridIndex()
+        self._edge_items = {}  # 子节点 -> 通往父节点的连线 (x, y, cx, cy)，增量更新索引时使用
+        self._tree_index_stale = False  # 大范围移动后索引推迟到下一次静态绘制时重建
+        self._subtree_info = None  # 节点 -> (子树节点数, x0, y0, x1, y1)，用于折叠绘制；None 表示待重建
+
+        # 视图变换：屏幕坐标 = 世界坐标 * view_scale + view_offset（滚轮缩放、左键拖动平移、双击适配）
+        self.view_scale = 1.0
+        self.view_offset = QPointF(0, 0)
+        self._pan_start = None
+        self.content_bounds = None  # 最近一次绘制的内容范围 (x0, y0, x1, y1)，供适配视图使用
+
+        # 静态图层缓存：名称 -> (键, QPixmap)。网格、队列轨道、顺序表槽位只在键变化时重绘
+        self._layer_cache = {}
+
+        # 局部重绘：绘制时登记动画元素在当前阶段的运动包络，下一帧只重绘这些区域
+        self._paint_rect = None  # 正在绘制的区域（QRect），绘制之外为 None
+        self._anim_marks = []  # 本次绘制登记的包络（世界坐标 x0, y0, x1, y1）
+        self._anim_region = None  # 上一次绘制得到的重绘区域（QRegion，屏幕坐标）
+        self._anim_signature = None  # 上一次绘制时除连续变化量之外的绘制状态
+
+        # 虚拟滚动：linear_scroll 为滚动到的第一个格子的下标，世界坐标以它为原点重新排布，
+        # 因此无论结构多长，绘制时的坐标都在窗口附近
+        self.linear_scroll = 0
+        self._linear_axis = None  # 本次绘制的排布 (start, step, extent, count, vertical)，供标尺使用
+        self.scrollbar = QScrollBar(Qt.Horizontal, self)
+        self.scrollbar.setStyleSheet("border: none; border-radius: 0px; background-color: #f3f4f6;")
+        self.scrollbar.setCursor(Qt.ArrowCursor)
+        self.scrollbar.valueChanged.connect(self._on_scrollbar_moved)
+        self.scrollbar.hide()
 
     def set_data_structure(self, ds):
         self.data_structure = ds
+        self.linear_scroll = 0
+        self.invalidate_layers()
+        self._sync_scrollbar()
         self.update()
 
     def update_visualization(self, ds=None, highlighted_index=-1):
-        if ds is not None:
+        if ds is not None and ds is not self.data_structure:
             self.data_structure = ds
+            self.linear_scroll = 0
+            self.invalidate_layers()
         self.highlighted_index = highlighted_index
+        self._sync_scrollbar()
+        if self.anim_state:
+            self.update_animated()
+        else:
+            self.update()
+
+    # --- 局部重绘 ---
+    def mark_animated(self, x0, y0, x1, y1):
+        """
+        绘制时登记一个动画元素在当前阶段内会经过的范围（世界坐标）。
+        登记的是整段运动的包络而不是当前帧的位置，因此下一帧的新旧位置都在其中。
+        """
+        self._anim_marks.append((x0, y0, x1, y1))
+
+    def _frame_signature(self):
+        """除动画连续变化量之外、影响绘制结果的全部状态"""
+        ds = self.data_structure
+        phase = tuple(sorted(
+            (k, v if isinstance(v, (int, float, str, bool, type(None))) else id(v))
+            for k, v in self.anim_state.items() if k not in self.ANIM_CONTINUOUS_KEYS))
+        return (id(ds), getattr(ds, 'version', None), self.highlighted_index, self.width(), self.height(),
+                self.view_scale, self.view_offset.x(), self.view_offset.y(), self.linear_scroll,
+                self.traversal_text, phase)
+
+    def _finish_anim_region(self):
+        """把本次绘制登记的包络换算为屏幕区域，供下一帧局部重绘"""
+        marks, self._anim_marks = self._anim_marks, []
+        if not marks or not self.anim_state:
+            self._anim_region = None
+            return
+        pad = self.ANIM_REGION_PAD
+        region = QRegion()
+        for x0, y0, x1, y1 in marks:
+            sx0, sy0 = self._to_screen(min(x0, x1), min(y0, y1))
+            sx1, sy1 = self._to_screen(max(x0, x1), max(y0, y1))
+            region = region.united(QRect(self._safe_int(sx0) - pad, self._safe_int(sy0) - pad,
+                                         self._safe_int(sx1 - sx0) + 2 * pad + 1,
+                                         self._safe_int(sy1 - sy0) + 2 * pad + 1))
+        self._anim_region = region.intersected(self.rect())
+        self._anim_signature = self._frame_signature()
+
+    def update_animated(self):
+        """
+        动画帧的重绘请求：与上一帧相比只有连续变化量（进度、缩放、位移等）改变时，
+        只重绘上一帧登记的动画包络；换阶段、数据或视图变化时整体重绘。
+        """
+        if self._anim_region is not None and self._anim_signature == self._frame_signature():
+            if not self._anim_region.isEmpty():
+                self.update(self._anim_region)
+        else:
+            self.update()
+
+    def resizeEvent(self, event):
+        self.invalidate_layers()
+        self._sync_scrollbar()
+        super().resizeEvent(event)
+
+    # --- 虚拟滚动（栈、队列、顺序表） ---
+    def _linear_view(self):
+        """
+        可滚动的线性结构沿排列方向的几何 (步长, 格子数, 是否竖直)，与各绘制函数的排布一致；
+        其他结构返回 None
+        """
+        ds = self.data_structure
+        if isinstance(ds, Queue):
+            return self.cell_width + 5, max(ds.length() + 1, 4), False  # 多留一格给入队的新元素
+        if isinstance(ds, Stack):
+            return self.cell_height + self.cell_spacing, ds.length(), True
+        if isinstance(ds, SequenceList):
+            return self.cell_width + self.cell_spacing + 15, max(ds.length() + 2, 10), False
+        return None
+
+    def _linear_scroll_range(self):
+        """
+        结构放不下时返回 (最大滚动量, 每页格数)，放得下或不是线性结构时返回 None。
+        只做计算，绘制函数据此决定排布，滚动条也由它同步。
+        """
+        view = self._linear_view()
+        if view is None:
+            return None
+        step, count, vertical = view
+        area = self.height() if vertical else self.width()
+        if count * step <= area - 2 * self.LINEAR_MARGIN:
+            return None
+        page = max(1, int((area / self.view_scale - 2 * self.LINEAR_MARGIN) // step))
+        return max(0, count - page), page
+
+    def _linear_scroll_start(self, step):
+        """
+        滚动时第 0 格的位置：第 linear_scroll 格落在 LINEAR_MARGIN 处（step 为负时从下往上排列）。
+        放得下时返回 None，由调用者按原来的方式居中排布。
+        """
+        scroll_range = self._linear_scroll_range()
+        if scroll_range is None:
+            return None
+        scroll = min(self.linear_scroll, scroll_range[0])
+        if step < 0:
+            return self.height() - 2 * self.LINEAR_MARGIN - scroll * step
+        return self.LINEAR_MARGIN - scroll * step
+
+    def _sync_scrollbar(self):
+        """按结构长度、窗口大小与缩放同步滚动条；结构放得下时隐藏滚动条并回到开头"""
+        bar = self.scrollbar
+        scroll_range = self._linear_scroll_range()
+        if scroll_range is None:
+            self.linear_scroll = 0
+            if not bar.isHidden():
+                bar.hide()
+            return
+        maximum, page = scroll_range
+        vertical = self._linear_view()[2]
+        self.linear_scroll = max(0, min(self.linear_scroll, maximum))
+        size = self.SCROLLBAR_SIZE
+        bar.blockSignals(True)
+        bar.setOrientation(Qt.Vertical if vertical else Qt.Horizontal)
+        # 栈从下往上排列：滚动条底部对应栈底
+        bar.setInvertedAppearance(vertical)
+        bar.setInvertedControls(vertical)
+        if vertical:
+            bar.setGeometry(self.width() - size - 1, 1, size, self.height() - 2)
+        else:
+            bar.setGeometry(1, self.height() - size - 1, self.width() - 2, size)
+        bar.setRange(0, maximum)
+        bar.setPageStep(page)
+        bar.setSingleStep(1)
+        bar.setValue(self.linear_scroll)
+        bar.blockSignals(False)
+        if bar.isHidden():
+            bar.show()
+
+    def _on_scrollbar_moved(self, value):
+        if value != self.linear_scroll:
+            self.linear_scroll = value
+            self.update()
+
+    def scroll_to_index(self, index):
+        """滚动使下标为 index 的格子位于窗口中部，返回实际的滚动位置（无需滚动时为 0）"""
+        scroll_range = self._linear_scroll_range()
+        if scroll_range is None:
+            self.linear_scroll = 0
+        else:
+            maximum, page = scroll_range
+            self.linear_scroll = max(0, min(int(index) - page // 2, maximum))
+            # 沿排列方向的平移归零，保证滚动位置就是看到的位置
+            if self._linear_view()[2]:
+                self.view_offset = QPointF(self.view_offset.x(), 0)
+            else:
+                self.view_offset = QPointF(0, self.view_offset.y())
+        self._sync_scrollbar()
         self.update()
+        return self.linear_scroll
+
+    # --- 静态图层缓存 ---
+    def invalidate_layers(self, name=None):
+        """丢弃缓存的静态图层（name 为 None 时全部丢弃）"""
+        if name is None:
+            self._layer_cache.clear()
+        else:
+            self._layer_cache.pop(name, None)
+
+    def _layer_pixmap(self, name, key, width, height, scale, render):
+        """
+        取出（必要时重新生成）缓存图层。图层按 scale * 设备像素比 渲染，逻辑尺寸为 width x height，
+        render(painter) 在图层的逻辑坐标中绘制。尺寸超过 LAYER_MAX_PIXELS 时返回 None。
+        """
+        dpr = self.devicePixelRatioF()
+        key = (key, width, height, scale, dpr)
+        cached = self._layer_cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        ratio = scale * dpr
+        pw, ph = int(math.ceil(width * ratio)), int(math.ceil(height * ratio))
+        if pw <= 0 or ph <= 0 or pw * ph > self.LAYER_MAX_PIXELS:
+            self._layer_cache.pop(name, None)
+            return None
+        pixmap = QPixmap(pw, ph)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        layer_painter = QPainter(pixmap)
+        layer_painter.setRenderHint(QPainter.Antialiasing)
+        try:
+            render(layer_painter)
+        finally:
+            layer_painter.end()
+        self._layer_cache[name] = (key, pixmap)
+        return pixmap
+
+    def _draw_world_layer(self, painter, name, key, rect, render):
+        """
+        把世界坐标矩形 rect=(x, y, w, h) 内的静态内容作为缓存图层贴到当前（世界坐标）画笔上。
+        render(painter, clip) 使用世界坐标绘制，clip=(x0, y0, x1, y1) 为需要覆盖的范围：
+        生成图层时是整个 rect；图层过大而退回直接绘制时是当前可见区域。
+        """
+        x, y, w, h = rect
+        def render_shifted(p):
+            p.translate(-x, -y)
+            render(p, (x, y, x + w, y + h))
+        pixmap = self._layer_pixmap(name, (key, x, y), w, h, self.view_scale, render_shifted)
+        if pixmap is None:
+            render(painter, self.visible_world_rect())
+        else:
+            painter.drawPixmap(QPointF(x, y), pixmap)
 
     # --- [安全工具] 坐标转换工具 (防止 SIGABRT 的关键) ---
     def _safe_int(self, val):
@@ -285,7 +579,7 @@ class VisualArea(QWidget):
         try:
             if math.isnan(val) or math.isinf(val): return 0
             # 限制坐标范围，防止底层绘图库崩溃
-            return max(-10000, min(10000, int(val)))
+            return max(-self.COORD_LIMIT, min(self.COORD_LIMIT, int(val)))
         except:
             return 0
 
@@ -301,14 +595,14 @@ class VisualArea(QWidget):
         try:
             x, y = float(pos[0]), float(pos[1])
             if math.isnan(x) or math.isnan(y) or math.isinf(x) or math.isinf(y): return None
-            if abs(x) > 50000 or abs(y) > 50000: return None
+            if abs(x) > self.COORD_LIMIT or abs(y) > self.COORD_LIMIT: return None
             return int(x), int(y)
         except:
             return None
 
     # --- [核心修复] 布局计算 (统一入口 + 防死循环) ---
     def calculate_all_node_positions(self):
-        """计算树节点位置（统一入口）"""
+        """计算树节点位置（统一入口，Reingold–Tilford 整齐布局，O(n) 且不受树深限制）"""
         positions = {}
 
         # 1. 基础检查
@@ -323,68 +617,307 @@ class VisualArea(QWidget):
         if not root:
             return positions
 
-        # 2. 计算树高 (防止递归溢出)
-        try:
-            tree_height = self._get_tree_height(root)
-        except RecursionError:
-            return positions
+        # 2. 整齐布局，尽量铺满宽度，但间距不小于节点直径；整棵树水平居中
+        layout = self.tree_layout.build(root)
+        self._tree_transform = self._fit_tree_transform()
+        return self._map_tree_layout(layout)
 
-        # 3. 计算布局参数
+    def _fit_tree_transform(self):
         area_width = self.width()
         if area_width < 50: area_width = 800  # 防止宽度过小导致除以零
+        return fit_transform(self.tree_layout.extent(), area_width, self.node_radius * 2 + 6)
 
-        start_x = area_width // 2
-        start_y = 50
-
-        # 动态调整间距
-        denominator = (2 ** (min(10, tree_height) - 1) + 1)
-        ideal_spacing = area_width / denominator if denominator > 0 else 50
-        base_spacing = max(min(ideal_spacing, 120), 35)
-
-        visited = set()
-
-        def traverse(node, x, y, level_spacing):
-            if not node: return
-            if node in visited: return
-            visited.add(node)
+    def _map_tree_layout(self, layout):
+        """相对布局 {节点: (x, 深度)} -> 像素坐标 {节点: (x, y)}"""
+        start_x, unit = self._tree_transform
+        spacing = self.tree_level_spacing
+        return {node: (start_x + x * unit, 50 + depth * spacing) for node, (x, depth) in layout.items()}
 
+    def notify_subtree_changed(self, *nodes):
+        """
+        树的局部结构改变（插入 / 删除 / 旋转）后增量更新布局与空间索引。
+        nodes 为孩子指针发生变化的节点：新插入的节点、被物理删除节点的父节点、旋转后的子树根。
+        只重新合并这些节点、其祖先及新接入部分的轮廓，其余子树复用缓存；水平原点保持不变，避免整棵树平移。
+        Returns:
+            dict: {节点: (x, y)}，只含坐标改变了的节点。布局此前未建立时退回全量计算，返回全部坐标。
+        """
+        ds = self.data_structure
+        root = getattr(ds, 'root', None)
+        version = getattr(ds, 'version', None)
+        cached = self._layout_cache_key
+        if (version is None or cached is None or cached[0] is not ds or cached[3] != self.width()
+                or root is None or self.tree_layout.root is None):
+            self._layout_cache_key = None
+            return dict(self.get_node_positions())
+
+        moved, removed, relinked = self.tree_layout.relayout(root, *nodes)
+        self._layout_cache_key = (ds, root, version, self.width())
+        transform = self._fit_tree_transform()
+        if transform[1] != self._tree_transform[1]:
+            # 单位间距变化（小树铺满宽度时），整体重新映射
+            self._tree_transform = transform
+            old = self.node_positions
+            self.node_positions = self._map_tree_layout(self.tree_layout.layout)
+            self._build_tree_index()
+            return {node: pos for node, pos in self.node_positions.items() if old.get(node) != pos}
+
+        moved = self._map_tree_layout(moved)
+        self._update_tree_index(moved, removed, relinked)
+        return moved
+
+    def get_node_positions(self):
+        """
+        带缓存的树布局：只有结构对象、根节点、修改版本号或控件宽度变化时才重新计算，
+        静态树上的动画帧只需重绘。没有 version 属性的结构每次都重新计算。
+        """
+        ds = self.data_structure
+        root = getattr(ds, 'root', None)
+        version = getattr(ds, 'version', None)
+        cached = self._layout_cache_key
+        if (version is None or cached is None or cached[0] is not ds or cached[1] is not root
+                or cached[2:] != (version, self.width())):
+            self.node_positions = self.calculate_all_node_positions()
+            self._layout_cache_key = (ds, root, version, self.width()) if version is not None else None
+            self._build_tree_index()
+        return self.node_positions
+
+    def _build_tree_index(self):
+        """把节点圆和父子连线登记到网格索引中"""
+        r = self.node_radius
+        positions = self.node_positions
+        self._node_index = GridIndex()
+        self._edge_index = GridIndex()
+        self._edge_items = {}
+        self._tree_index_stale = False
+        for node, (x, y) in positions.items():
+            self._node_index.insert(node, x - r, y - r, x + r, y + r)
+            for child in _tree_children(node):
+                if child is not None and child in positions:
+                    cx, cy = positions[child]
+                    item = self._edge_items[child] = (x, y, cx, cy)
+                    self._edge_index.insert(item, x, y, cx, cy)
+        if positions:
+            xs = [x for x, _ in positions.values()]
+            ys = [y for _, y in positions.values()]
+            self.content_bounds = (min(xs) - r, min(ys) - r, max(xs) + r, max(ys) + r)
+        self._subtree_info = None
+
+    def _update_tree_index(self, moved, removed, relinked):
+        """增量更新坐标与网格索引：只处理移动、删除的节点和孩子发生变化的节点"""
+        r = self.node_radius
+        positions = self.node_positions
+        if self._tree_index_stale or len(moved) + len(removed) > len(positions) // 8:
+            # 移动的节点占比很大（例如靠近根的旋转使整侧子树平移）时，逐个改索引不如下次绘制时整体重建；
+            # morph 动画期间不查询索引，连续多步旋转只会重建一次
+            for node in removed:
+                positions.pop(node, None)
+            positions.update(moved)
+            self._tree_index_stale = True
+            moved, removed, relinked = {}, (), ()
+        node_index, edge_index, edge_items = self._node_index, self._edge_index, self._edge_items
+        for node in removed:
+            pos = positions.pop(node, None)
+            if pos is not None:
+                node_index.remove(node, pos[0] - r, pos[1] - r, pos[0] + r, pos[1] + r)
+        for node, (x, y) in moved.items():
+            pos = positions.get(node)
+            if pos is not None:
+                node_index.remove(node, pos[0] - r, pos[1] - r, pos[0] + r, pos[1] + r)
+            node_index.insert(node, x - r, y - r, x + r, y + r)
             positions[node] = (x, y)
-            next_y = y + self.tree_level_spacing
-            next_spacing = level_spacing * 0.55
 
-            # 安全获取左右子节点
-            left = getattr(node, 'left_child', None)
-            right = getattr(node, 'right_child', None)
+        # 连线按子节点登记：节点自身或父节点移动、父节点的孩子变化、节点被删除时都需要更新
+        affected = set(removed)
+        affected.update(moved)
+        for node in list(moved) + list(relinked):
+            affected.update(c for c in _tree_children(node) if c is not None)
+        for child in affected:
+            item = edge_items.pop(child, None)
+            if item is not None:
+                edge_index.remove(item, *item)
+            parent = _tree_parent(child)
+            if child in positions and parent in positions:
+                item = edge_items[child] = positions[parent] + positions[child]
+                edge_index.insert(item, *item)
+
+        # 内容范围由根的轮廓得到，无需遍历全部节点
+        min_x, max_x = self.tree_layout.extent()
+        start_x, unit = self._tree_transform
+        self.content_bounds = (start_x + min_x * unit - r, 50 - r, start_x + max_x * unit + r,
+                               50 + (self.tree_layout.height - 1) * self.tree_level_spacing + r)
+        self._subtree_info = None
+
+    def _build_subtree_info(self):
+        """后序遍历统计每棵子树的节点数与包围盒"""
+        positions = self.node_positions
+        info = {}
+        root = getattr(self.data_structure, 'root', None)
+        if root is None or root not in positions:
+            self._subtree_info = info
+            return
+        stack = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            children = [c for c in (getattr(node, 'left_child', None), getattr(node, 'right_child', None))
+                        if c is not None and c in positions]
+            if not visited:
+                stack.append((node, True))
+                stack.extend((c, False) for c in children)
+                continue
+            x, y = positions[node]
+            count, x0, y0, x1, y1 = 1, x, y, x, y
+            for c in children:
+                c_count, cx0, cy0, cx1, cy1 = info[c]
+                count += c_count
+                x0, y0, x1, y1 = min(x0, cx0), min(y0, cy0), max(x1, cx1), max(y1, cy1)
+            info[node] = (count, x0, y0, x1, y1)
+        self._subtree_info = info
+
+    def invalidate_layout(self):
+        """强制下一次绘制重新计算布局（外部直接改动了节点指针时调用）"""
+        self._layout_cache_key = None
+
+    # --- 细节层级 ---
+    def set_lod_thresholds(self, label_min_px=None, shape_min_px=None, summary_px=None):
+        """调整 LOD 阈值（像素），未给出的参数保持不变"""
+        if label_min_px is not None: self.lod_label_min_px = label_min_px
+        if shape_min_px is not None: self.lod_shape_min_px = shape_min_px
+        if summary_px is not None: self.lod_summary_px = summary_px
+        self.update()
 
-            if left:
-                traverse(left, x - level_spacing, next_y, next_spacing)
-            if right:
-                traverse(right, x + level_spacing, next_y, next_spacing)
+    def lod_tier(self, item_size):
+        """根据元素（世界坐标尺寸 item_size）在屏幕上的大小选择 LOD 层级"""
+        px = item_size * self.view_scale
+        if px >= self.lod_label_min_px:
+            return LOD_FULL
+        if px >= self.lod_shape_min_px:
+            return LOD_SHAPES
+        return LOD_SUMMARY
+
+    def _to_screen(self, x, y):
+        s = self.view_scale
+        return x * s + self.view_offset.x(), y * s + self.view_offset.y()
+
+    # --- 视图变换（缩放 / 平移） ---
+    def visible_world_rect(self, margin=0):
+        """
+        当前可见区域在世界坐标中的范围 (x0, y0, x1, y1)，可向外扩展 margin。
+        局部重绘期间返回的是重绘区域，各绘制函数据此跳过区域外的元素。
+        """
+        s = self.view_scale
+        ox, oy = self.view_offset.x(), self.view_offset.y()
+        rect = self._paint_rect
+        if rect is None:
+            sx0, sy0, sx1, sy1 = 0, 0, self.width(), self.height()
+        else:
+            sx0, sy0, sx1, sy1 = rect.left(), rect.top(), rect.right() + 1, rect.bottom() + 1
+        return ((sx0 - ox) / s - margin, (sy0 - oy) / s - margin,
+                (sx1 - ox) / s + margin, (sy1 - oy) / s + margin)
 
-            visited.remove(node)
+    def _visible_index_range(self, start, step, extent, count, lo, hi, pad=2):
+        """
+        等间距排列的元素（第 i 个位于 start + i * step，占 extent 长度，step 可为负）
+        中与 [lo, hi] 相交的下标范围 [first, last)，两端各多留 pad 个以覆盖动画位移。
+        """
+        if count <= 0 or step == 0:
+            return 0, max(count, 0)
+        a = (lo - extent - start) / step
+        b = (hi - start) / step
+        if a > b: a, b = b, a
+        first = max(0, int(math.floor(a)) - pad)
+        last = min(count, int(math.ceil(b)) + 1 + pad)
+        return first, max(first, last)
+
+    def zoom_at(self, pos, factor):
+        """以屏幕点 pos 为中心缩放"""
+        new_scale = max(self.MIN_ZOOM, min(self.MAX_ZOOM, self.view_scale * factor))
+        ratio = new_scale / self.view_scale
+        pos = QPointF(pos)
+        self.view_offset = pos - (pos - self.view_offset) * ratio
+        self.view_scale = new_scale
+        self._sync_scrollbar()
+        self.update()
 
-        try:
-            traverse(root, start_x, start_y, base_spacing)
-        except RecursionError:
-            pass
+    def reset_view(self):
+        self.view_scale = 1.0
+        self.view_offset = QPointF(0, 0)
+        self._sync_scrollbar()
+        self.update()
 
-        return positions
+    def fit_view(self):
+        """缩放并平移使全部内容可见（不放大超过 1 倍）"""
+        if not self.content_bounds:
+            self.reset_view()
+            return
+        x0, y0, x1, y1 = self.content_bounds
+        margin = 20
+        w, h = max(x1 - x0, 1), max(y1 - y0, 1)
+        scale = min((self.width() - 2 * margin) / w, (self.height() - 2 * margin) / h, 1.0)
+        scale = max(self.MIN_ZOOM, scale)
+        self.view_scale = scale
+        self.view_offset = QPointF(self.width() / 2 - (x0 + x1) / 2 * scale,
+                                   self.height() / 2 - (y0 + y1) / 2 * scale)
+        self._sync_scrollbar()
+        self.update()
 
-    def _get_tree_height(self, node, depth=0):
-        if not node or depth > 20: return 0
-        left = getattr(node, 'left_child', None)
-        right = getattr(node, 'right_child', None)
-        return 1 + max(self._get_tree_height(left, depth + 1),
-                       self._get_tree_height(right, depth + 1))
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if not steps:
+            return
+        if not self.scrollbar.isHidden() and not event.modifiers() & Qt.ControlModifier:
+            # 虚拟滚动时滚轮滚动列表，Ctrl + 滚轮缩放
+            self.scrollbar.setValue(self.scrollbar.value() - int(round(steps * 3)) *
+                                    (-1 if self.scrollbar.invertedControls() else 1))
+            event.accept()
+            return
+        pos = event.position() if hasattr(event, 'position') else QPointF(event.pos())
+        self.zoom_at(pos, 1.15 ** steps)
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._pan_start = (QPointF(event.pos()), QPointF(self.view_offset))
+            self.setCursor(Qt.ClosedHandCursor)
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._pan_start is not None:
+            press_pos, press_offset = self._pan_start
+            self.view_offset = press_offset + (QPointF(event.pos()) - press_pos)
+            self.update()
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self._pan_start is not None:
+            self._pan_start = None
+            self.unsetCursor()
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit_view()
+        super().mouseDoubleClickEvent(event)
 
     def paintEvent(self, event):
         # 窗口太小时不绘图，防止计算错误
         if self.width() < 10 or self.height() < 10:
             return
 
+        # 只有一部分区域需要重绘时（动画帧），可见范围收缩为该区域
+        rect = event.rect()
+        self._paint_rect = None if rect.contains(self.rect()) else rect
+        self._anim_marks = []
         painter = QPainter(self)
+        try:
+            self._paint_frame(painter)
+        finally:
+            painter.end()
+            self._paint_rect = None
+            self._finish_anim_region()
+
+    def _paint_frame(self, painter):
         painter.setRenderHint(QPainter.Antialiasing)
         self._draw_background_grid(painter)
+        self._linear_axis = None
 
         if self.data_structure is None:
             self._draw_placeholder(painter)
@@ -392,12 +925,19 @@ class VisualArea(QWidget):
 
         self.current_frame_node_pos = {}
         state = self.anim_state
+        tree_overlay = None  # 树信息 / 空树提示，在屏幕坐标中绘制
+
+        # 结构本身绘制在世界坐标中
+        painter.save()
+        painter.translate(self.view_offset)
+        painter.scale(self.view_scale, self.view_scale)
 
         try:
             # --- 1. Morph 动画 (最高优先级) ---
             if state and state.get('type') == 'morph':
                 if state.get('start_positions') and state.get('end_positions'):
                     self.draw_morph_frame(painter, state)
+                painter.restore()
                 return
 
             # --- 2. 队列 (Queue) 独立绘制 ---
@@ -419,24 +959,69 @@ class VisualArea(QWidget):
 
             # --- 6. 二叉树/BST/AVL ---
             elif hasattr(self.data_structure, 'root'):
-                self.node_positions = self.calculate_all_node_positions()
+                self.get_node_positions()
                 root = getattr(self.data_structure, 'root', None)
                 if root:
-                    self._draw_tree_recursive(painter, root)
-                    self._draw_tree_info(painter)
+                    self._draw_tree(painter)
+                    tree_overlay = self._draw_tree_info
                 else:
-                    self._draw_empty_tree_msg(painter)
+                    tree_overlay = self._draw_empty_tree_msg
 
         except Exception as e:
             print(f"Paint Error: {e}")
 
-        # 绘制浮动层
+        # 绘制浮动层（跟随节点，位于世界坐标）
         anim_type = self.anim_state.get('type')
         if anim_type in ['bst_search', 'bst_insert', 'bst_delete']:
             self._draw_bst_overlay(painter)
+        painter.restore()
+
+        # 屏幕坐标中的文字层（不随缩放平移）
+        try:
+            if tree_overlay:
+                tree_overlay(painter)
+        except Exception as e:
+            print(f"Paint Error: {e}")
 
         if self.traversal_text:
             self._draw_traversal_text(painter)
+        if self._linear_axis is not None:
+            self._draw_index_ruler(painter)
+
+    def _render_queue_track(self, painter, track_start_x, track_end_x, track_top_y, track_bottom_y):
+        """绘制队列的静态部分：上下轨道线与 Head 标识（缓存为图层）"""
+        painter.save()
+        pen = QPen(QColor(55, 65, 81), 4)  # 深灰色粗线
+        pen.setCapStyle(Qt.RoundCap)
+        painter.setPen(pen)
+
+        # 上轨道线
+        painter.drawLine(int(track_start_x), int(track_top_y), int(track_end_x), int(track_top_y))
+        # 下轨道线
+        painter.drawLine(int(track_start_x), int(track_bottom_y), int(track_end_x), int(track_bottom_y))
+
+        # --- Head 标识 (位置固定) ---
+        # 固定在轨道起始位置的左上方，不再随元素动
+        painter.setPen(QPen(QColor(220, 38, 38), 2))  # 红色
+        painter.setFont(QFont("Microsoft YaHei", 10, QFont.Bold))
+
+        head_label_x = track_start_x
+        head_label_y = track_top_y - 25
+
+        painter.drawText(int(head_label_x), int(head_label_y), 80, 20, Qt.AlignLeft, "Head 队头")
+
+        # 箭头：指向轨道左侧开口处（表示这是出口）
+        # 箭头起点在文字下方，终点在两线之间
+        arrow_top = QPointF(head_label_x + 20, head_label_y + 20)
+
+        # 这里只画个短箭头指向轨道上方即可，太长会遮挡元素
+        arrow_end = QPointF(head_label_x + 20, track_top_y - 2)
+        painter.drawLine(arrow_top, arrow_end)
+        # 箭头尖
+        painter.drawLine(arrow_end, QPointF(head_label_x + 15, track_top_y - 8))
+        painter.drawLine(arrow_end, QPointF(head_label_x + 25, track_top_y - 8))
+
+        painter.restore()
 
     def _draw_queue(self, painter):
         """
@@ -472,60 +1057,52 @@ class VisualArea(QWidget):
         min_slots = max(vis_length, 4)
         total_w = min_slots * unit_w
 
-        # 整体居中
-        start_x = (area_width - total_w) // 2
+        # 整体居中；放不下时按滚动位置只排布可见的一段
+        scroll_start = self._linear_scroll_start(unit_w)
+        start_x = (area_width - total_w) // 2 if scroll_start is None else scroll_start
         base_y = area_height // 2 - cell_h // 2
 
         # --- 1. 绘制“上下两条线”轨道 ---
         line_padding = 15  # 线比元素区域稍微长一点
-        track_start_x = start_x - line_padding
-        track_end_x = start_x + total_w + line_padding
+        track_start_x = max(start_x - line_padding, -self.COORD_LIMIT)
+        track_end_x = min(start_x + total_w + line_padding, self.COORD_LIMIT)
         track_top_y = base_y - 5
         track_bottom_y = base_y + cell_h + 5
 
-        painter.save()
-        pen = QPen(QColor(55, 65, 81), 4)  # 深灰色粗线
-        pen.setCapStyle(Qt.RoundCap)
-        painter.setPen(pen)
-
-        # 上轨道线
-        painter.drawLine(int(track_start_x), int(track_top_y), int(track_end_x), int(track_top_y))
-        # 下轨道线
-        painter.drawLine(int(track_start_x), int(track_bottom_y), int(track_end_x), int(track_bottom_y))
-
-        # --- Head 标识 (位置固定) ---
-        # 固定在轨道起始位置的左上方，不再随元素动
-        painter.setPen(QPen(QColor(220, 38, 38), 2))  # 红色
-        painter.setFont(QFont("Microsoft YaHei", 10, QFont.Bold))
-
-        head_label_x = track_start_x
-        head_label_y = track_top_y - 25
-
-        painter.drawText(int(head_label_x), int(head_label_y), 80, 20, Qt.AlignLeft, "Head 队头")
-
-        # 箭头：指向轨道左侧开口处（表示这是出口）
-        # 箭头起点在文字下方，终点在两线之间
-        arrow_top = QPointF(head_label_x + 20, head_label_y + 20)
-        arrow_bottom = QPointF(head_label_x + 20, base_y + cell_h / 2)  # 指向轨道中间高度
-
-        # 这里只画个短箭头指向轨道上方即可，太长会遮挡元素
-        arrow_end = QPointF(head_label_x + 20, track_top_y - 2)
-        painter.drawLine(arrow_top, arrow_end)
-        # 箭头尖
-        painter.drawLine(arrow_end, QPointF(head_label_x + 15, track_top_y - 8))
-        painter.drawLine(arrow_end, QPointF(head_label_x + 25, track_top_y - 8))
+        # 轨道与 Head 标识是静态的，缓存为图层，每帧只贴图
+        track = (track_start_x, track_end_x, track_top_y, track_bottom_y)
+        self._draw_world_layer(painter, 'queue_track', track,
+                               (track_start_x - 5, track_top_y - 30, track_end_x - track_start_x + 90, cell_h + 42),
+                               lambda p, clip: self._render_queue_track(p, *track))
 
-        painter.restore()
+        self.content_bounds = (track_start_x, track_top_y - 30, track_end_x + 80, track_bottom_y)
+        if scroll_start is not None:
+            self._set_linear_axis(start_x, unit_w, cell_w, length, False)
 
-        # --- 2. 绘制队列中的现有元素 ---
-        for i in range(length):
+        # 动画包络：入队的新元素连同 Tail 标识、闪烁并移出的队头、整体前移的队列
+        if anim_type == 'queue_enqueue' and phase == 'move_in':
+            dest_x = start_x + length * unit_w
+            self.mark_animated(dest_x, track_top_y - 25, dest_x + unit_w * 3 + cell_w + 80, base_y + cell_h)
+        elif anim_type == 'queue_dequeue' and phase in ('flash_head', 'move_out'):
+            self.mark_animated(start_x - unit_w * 1.5, base_y, start_x + cell_w, base_y + cell_h)
+        elif anim_type == 'queue_dequeue' and phase == 'shift_forward':
+            self.mark_animated(start_x, track_top_y - 25, start_x + length * unit_w + cell_w + 80, base_y + cell_h)
+
+        # --- 2. 绘制队列中的现有元素（只绘制可见范围内的格子） ---
+        tier = self.lod_tier(cell_h)
+        if tier == LOD_SUMMARY and not state:
+            self._draw_linear_summary(painter, start_x, unit_w, cell_w, length, base_y, cell_h)
+            return
+        vx0, _, vx1, _ = self.visible_world_rect()
+        first, last = self._visible_index_range(start_x, unit_w, cell_w, length, vx0, vx1)
+        for i, value in enumerate(_iter_range(ds, first, last), first):
             painter.save()
 
             # 基础位置
             curr_x = start_x + i * unit_w
             curr_y = base_y
 
-            bg_color = QColor(219, 234, 254)
+            bg_color = QColor(219, 234, 254) if i != self.highlighted_index else QColor(250, 204, 21)
             border_color = QColor(30, 58, 138)
             opacity = 1.0
 
@@ -556,10 +1133,11 @@ class VisualArea(QWidget):
                 painter.setPen(QPen(border_color, 2))
                 painter.drawRect(self._safe_rect(curr_x, curr_y, cell_w, cell_h))
 
-                painter.setPen(QPen(QColor(17, 24, 39), 1))
-                painter.setFont(QFont("Arial", 12, QFont.Bold))
-                val = str(ds.get(i))
-                painter.drawText(self._safe_rect(curr_x, curr_y, cell_w, cell_h), Qt.AlignCenter, val)
+                if tier == LOD_FULL:
+                    painter.setPen(QPen(QColor(17, 24, 39), 1))
+                    painter.setFont(QFont("Arial", 12, QFont.Bold))
+                    val = str(value)
+                    painter.drawText(self._safe_rect(curr_x, curr_y, cell_w, cell_h), Qt.AlignCenter, val)
 
             painter.restore()
 
@@ -613,111 +1191,232 @@ class VisualArea(QWidget):
             painter.restore()
 
     # === [新功能] 统一树形结构绘制逻辑 ===
-    def _draw_tree_recursive(self, painter, node):
-        if not node: return
+    def _draw_tree(self, painter):
+        """通过空间索引只绘制与可见区域相交的连线和节点，按 LOD 层级选择绘制方式"""
+        positions = self.node_positions
+        self.current_frame_node_pos = positions  # 供 overlay 使用
+        tier = self.lod_tier(self.node_radius * 2)
+        if tier == LOD_SUMMARY and self._subtree_info is None:
+            self._build_subtree_info()
+        if tier == LOD_SUMMARY and self._subtree_info:
+            self._draw_tree_summary(painter)
+            return
 
-        # 必须从 node_positions 获取坐标，如果没有则跳过
-        if node not in self.node_positions:
+        if self._tree_index_stale:
+            self._build_tree_index()
+        x0, y0, x1, y1 = self.visible_world_rect(margin=self.node_radius)
+        painter.setPen(self.styles.pen((31, 41, 55), 2 if tier == LOD_FULL else 0))
+        self._draw_line_batch(painter, self._edge_index.query(x0, y0, x1, y1))
+
+        visible_nodes = self._node_index.query(x0, y0, x1, y1)
+        state = self.anim_state
+        if tier == LOD_FULL:
+            self._draw_node_batch(painter,
+                                  [(positions[node], self._tree_node_fill(node, state), str(node.data))
+                                   for node in visible_nodes],
+                                  self.styles.pen((31, 41, 55), 2), self.styles.font("Arial", 9, QFont.Bold))
             return
 
-        x, y = self.node_positions[node]
-        self.current_frame_node_pos[node] = (x, y)  # 记录下来供 overlay 使用
+        # LOD_SHAPES：无边框、无文字的圆点
+        default_fill = (56, 189, 248)
+        highlight = self.highlighted_node
+        self._draw_node_batch(painter,
+                              [(positions[node], self.highlight_color if node is highlight else default_fill, None)
+                               for node in visible_nodes])
+
+    # --- 批量绘制：同样式的图元合并提交，减少每个元素的 Python -> Qt 调用 ---
+    def _draw_line_batch(self, painter, segments):
+        """用一次 drawLines 绘制所有连线，segments 为 (x1, y1, x2, y2) 序列（使用当前画笔）"""
+        safe = self._safe_point
+        lines = [QLineF(safe(x, y), safe(cx, cy)) for x, y, cx, cy in segments]
+        if lines:
+            painter.drawLines(lines)
+
+    def _draw_node_batch(self, painter, items, border_pen=None, font=None, text_color=(0, 0, 0)):
+        """
+        批量绘制圆形节点。items 为 ((x, y), 填充色, 文字或 None) 序列：
+        同一填充色的节点合并为一条 QPainterPath 一次绘制，最后统一绘制文字。
+        """
+        radius = self.node_radius
+        styles = self.styles
+        groups = {}  # 颜色键 -> (填充色, QPainterPath)；填充色可能是不可哈希的 QColor
+        labels = []
+        for (x, y), fill, label in items:
+            center = self._safe_point(x, y)
+            key = fill.rgba() if isinstance(fill, QColor) else fill
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = (fill, QPainterPath())
+                group[1].setFillRule(Qt.WindingFill)
+            group[1].addEllipse(center, radius, radius)
+            if label is not None:
+                labels.append((center, label))
+
+        painter.setPen(border_pen if border_pen is not None else Qt.NoPen)
+        for fill, path in groups.values():
+            painter.setBrush(styles.brush(fill))
+            painter.drawPath(path)
+
+        if labels and font is not None:
+            painter.setPen(styles.pen(text_color, 1))
+            draw_centered = self.text_cache.draw_centered
+            size = radius * 2
+            for center, label in labels:
+                draw_centered(painter, QRectF(center.x() - radius, center.y() - radius, size, size), label, font)
+
+    def _draw_tree_summary(self, painter):
+        """
+        折叠绘制：自根向下，屏幕宽度小于 lod_summary_px 的子树画成一个带节点数的色块，
+        只展开足够宽的子树，因此绘制量只与屏幕大小有关。在屏幕坐标中绘制以保证文字可读。
+        """
+        positions = self.node_positions
+        info = self._subtree_info
+        s = self.view_scale
+        vx0, vy0, vx1, vy1 = self.visible_world_rect(margin=self.node_radius)
+        dot_r = max(1.5, self.node_radius * s)
+        root = getattr(self.data_structure, 'root', None)
+
+        edges, dots, blobs = [], [], []
+        stack = [root] if root in info else []
+        while stack:
+            node = stack.pop()
+            count, bx0, by0, bx1, by1 = info[node]
+            if bx1 < vx0 or bx0 > vx1 or by1 < vy0 or by0 > vy1:
+                continue
+            if count > 1 and (bx1 - bx0) * s < self.lod_summary_px:
+                blobs.append((count, bx0, by0, bx1, by1))
+                continue
+            x, y = positions[node]
+            dots.append((x, y))
+            for child in (getattr(node, 'left_child', None), getattr(node, 'right_child', None)):
+                if child is not None and child in info:
+                    edges.append((x, y) + positions[child])
+                    stack.append(child)
 
-        left = getattr(node, 'left_child', None)
-        right = getattr(node, 'right_child', None)
+        painter.save()
+        painter.resetTransform()
+        painter.setPen(QPen(QColor(107, 114, 128), 1))
+        for x, y, cx, cy in edges:
+            painter.drawLine(QPointF(*self._to_screen(x, y)), QPointF(*self._to_screen(cx, cy)))
 
-        painter.setPen(QPen(QColor(31, 41, 55), 2))
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(QColor(56, 189, 248)))
+        for x, y in dots:
+            painter.drawEllipse(QPointF(*self._to_screen(x, y)), dot_r, dot_r)
 
-        # 画连线
-        if left and left in self.node_positions:
-            lx, ly = self.node_positions[left]
-            painter.drawLine(self._safe_point(x, y), self._safe_point(lx, ly))
-            self._draw_tree_recursive(painter, left)
+        painter.setFont(QFont("Arial", 8, QFont.Bold))
+        for count, bx0, by0, bx1, by1 in blobs:
+            sx0, sy0 = self._to_screen(bx0, by0)
+            sx1, sy1 = self._to_screen(bx1, by1)
+            rect = QRectF(sx0 - dot_r, sy0 - dot_r, sx1 - sx0 + 2 * dot_r, sy1 - sy0 + 2 * dot_r)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(QColor(14, 165, 233, 90)))
+            painter.drawRoundedRect(rect, 4, 4)
+            if rect.width() >= 18 and rect.height() >= 12:
+                painter.setPen(QColor(12, 74, 110))
+                painter.drawText(rect, Qt.AlignCenter, str(count))
+        painter.restore()
+
+    def _draw_linear_summary(self, painter, start, step, extent, count, cross_start, cross_size, vertical=False):
+        """
+        线性结构的折叠绘制：把连续的若干格合并为一个区段（屏幕上至少 lod_summary_px 宽），
+        标注下标范围。start/step 为第 0 格的位置与步长（沿排列方向），cross_* 为垂直方向的位置与厚度。
+        """
+        s = self.view_scale
+        group = max(1, int(math.ceil(self.lod_summary_px / max(abs(step) * s, 1e-9))))
+        vx0, vy0, vx1, vy1 = self.visible_world_rect()
+        lo, hi = (vy0, vy1) if vertical else (vx0, vx1)
+        first, last = self._visible_index_range(start, step, extent, count, lo, hi, pad=0)
+        first -= first % group
 
-        if right and right in self.node_positions:
-            rx, ry = self.node_positions[right]
-            painter.drawLine(self._safe_point(x, y), self._safe_point(rx, ry))
-            self._draw_tree_recursive(painter, right)
+        painter.save()
+        painter.resetTransform()
+        painter.setFont(QFont("Arial", 8))
+        for g_start in range(first, last, group):
+            g_end = min(g_start + group, count) - 1
+            a = start + g_start * step
+            b = start + g_end * step + extent
+            if vertical:
+                a, b = start + g_end * step, start + g_start * step + extent
+                sx0, sy0 = self._to_screen(cross_start, a)
+                sx1, sy1 = self._to_screen(cross_start + cross_size, b)
+            else:
+                sx0, sy0 = self._to_screen(a, cross_start)
+                sx1, sy1 = self._to_screen(b, cross_start + cross_size)
+            rect = QRectF(sx0, sy0, max(sx1 - sx0, 1), max(sy1 - sy0, 1))
+            painter.setPen(QPen(QColor(30, 58, 138), 1))
+            painter.setBrush(QBrush(QColor(219, 234, 254) if (g_start // group) % 2 == 0 else QColor(191, 219, 254)))
+            painter.drawRect(rect)
+            label = f"{g_start}-{g_end}" if g_end > g_start else str(g_start)
+            if painter.fontMetrics().horizontalAdvance(label) + 4 <= rect.width() and rect.height() >= 10:
+                painter.setPen(QColor(17, 24, 39))
+                painter.drawText(rect, Qt.AlignCenter, label)
+        painter.restore()
 
-        # 画节点
-        self.draw_single_node(painter, node, x, y, self.anim_state)
+    def _tree_node_fill(self, node, state):
+        """树节点的填充色：旋转支点 > 新根 > 高亮 > 默认浅蓝"""
+        if state.get('pivot') == node:
+            return (252, 211, 77)
+        if state.get('new_root') == node:
+            return (16, 185, 129)
+        if self.highlighted_node == node:
+            return self.highlight_color
+        return (186, 230, 253)
 
     def draw_single_node(self, painter, node, x, y, state):
         radius = self.node_radius
-        bg_color = QColor(186, 230, 253)  # 默认浅蓝
-        border_color = QColor(31, 41, 55)
-
-        is_pivot = (state.get('pivot') == node)
-        is_new_root = (state.get('new_root') == node)
-        is_highlight = (self.highlighted_node == node)
+        styles = self.styles
 
-        if is_pivot:
-            bg_color = QColor(252, 211, 77)
-        elif is_new_root:
-            bg_color = QColor(16, 185, 129)
-        elif is_highlight:
-            bg_color = self.highlight_color
-
-        painter.setBrush(QBrush(bg_color))
-        painter.setPen(QPen(border_color, 2))
+        painter.setBrush(styles.brush(self._tree_node_fill(node, state)))
+        painter.setPen(styles.pen((31, 41, 55), 2))
 
         # 使用 safe_point 防止崩溃
         center = self._safe_point(x, y)
         painter.drawEllipse(center, radius, radius)
 
-        painter.setPen(QPen(Qt.black, 1))
-        painter.setFont(QFont("Arial", 9, QFont.Bold))
-
+        painter.setPen(styles.pen(Qt.black, 1))
         rect = QRectF(center.x() - radius, center.y() - radius, radius * 2, radius * 2)
-        painter.drawText(rect, Qt.AlignCenter, str(node.data))
+        self.text_cache.draw_centered(painter, rect, str(node.data), styles.font("Arial", 9, QFont.Bold))
+
+    def prepare_morph(self, state):
+        """为 morph 动画状态预计算插值方案（动画开始时调用一次），返回 MorphPlan"""
+        plan = MorphPlan(state['start_positions'], state['end_positions'],
+                         fill=lambda node: self._tree_node_fill(node, state))
+        state['plan'] = plan
+        return plan
 
     def draw_morph_frame(self, painter, state):
-        """Morph 动画帧绘制"""
+        """Morph 动画帧绘制：预计算方案上的一次向量化插值 + 批量绘制"""
         t = state.get('progress', 0.0)
-        start_pos = state['start_positions']
-        end_pos = state['end_positions']
-
-        current_positions = {}
-        all_nodes = set(start_pos.keys()) | set(end_pos.keys())
-
-        for node in all_nodes:
-            p_start = start_pos.get(node)
-            p_end = end_pos.get(node)
-
-            cx, cy, opacity = 0, 0, 1.0
-
-            if p_start and p_end:
-                cx = p_start[0] + (p_end[0] - p_start[0]) * t
-                cy = p_start[1] + (p_end[1] - p_start[1]) * t
-            elif p_start and not p_end:
-                cx, cy = p_start
-                opacity = 1.0 - t
-            elif not p_start and p_end:
-                cx, cy = p_end
-                opacity = t
-
-            if opacity < 0: opacity = 0
-            if opacity > 1: opacity = 1
-            current_positions[node] = (cx, cy, opacity)
-
-        # 绘制连线
-        painter.setPen(QPen(QColor(100, 100, 100), 2))
-        for node, (cx, cy, opacity) in current_positions.items():
-            parent = getattr(node, 'parent', None)
-            if parent and parent in current_positions:
-                px, py, p_opacity = current_positions[parent]
-                line_opacity = min(opacity, p_opacity)
-                if line_opacity > 0.05:
-                    painter.setOpacity(line_opacity)
-                    painter.drawLine(self._safe_point(cx, cy), self._safe_point(px, py))
-
-        # 绘制节点
-        for node, (cx, cy, opacity) in current_positions.items():
-            if opacity > 0.05:
-                painter.setOpacity(opacity)
-                self.draw_single_node(painter, node, cx, cy, state)
+        plan = state.get('plan') or self.prepare_morph(state)
+
+        # 只绘制与可见区域相交的部分
+        nodes, edges = plan.frame(t, self.visible_world_rect(margin=self.node_radius))
 
+        # 绘制连线：不透明的连线合并为一次 drawLines，渐隐中的连线单独绘制
+        painter.setPen(self.styles.pen((100, 100, 100), 2))
+        opaque_edges = []
+        for cx, cy, px, py, opacity in edges:
+            if opacity >= 1.0:
+                opaque_edges.append((cx, cy, px, py))
+            else:
+                painter.setOpacity(opacity)
+                painter.drawLine(self._safe_point(cx, cy), self._safe_point(px, py))
         painter.setOpacity(1.0)
+        self._draw_line_batch(painter, opaque_edges)
+
+        # 绘制节点：同上，不透明节点批量绘制
+        fills, labels = plan.fills, plan.labels
+        opaque_nodes = []
+        for i, cx, cy, opacity in nodes:
+            if opacity >= 1.0:
+                opaque_nodes.append(((cx, cy), fills[i], labels[i]))
+            else:
+                painter.setOpacity(opacity)
+                self.draw_single_node(painter, plan.nodes[i], cx, cy, state)
+        painter.setOpacity(1.0)
+        self._draw_node_batch(painter, opaque_nodes,
+                              self.styles.pen((31, 41, 55), 2), self.styles.font("Arial", 9, QFont.Bold))
 
     # === [辅助绘制] 占位符与网格 ===
     def _draw_placeholder(self, painter, text="可视化区域准备就绪"):
@@ -742,19 +1441,86 @@ class VisualArea(QWidget):
         painter.drawText(20, 30, 400, 30, Qt.AlignLeft, f"{t_type} - 节点数: {count}")
 
     def _draw_background_grid(self, painter):
+        w, h = self.width(), self.height()
+        if w <= 0 or h <= 0:
+            return
+        pixmap = self._layer_pixmap('grid', None, w, h, 1.0, self._render_background_grid)
+        if pixmap is None:
+            self._render_background_grid(painter)
+        else:
+            painter.drawPixmap(0, 0, pixmap)
+
+    def _render_background_grid(self, painter):
         painter.save()
         painter.setPen(QPen(QColor(243, 244, 246), 1))
         step = 40
         w, h = self.width(), self.height()
-        if w > 0 and h > 0:
-            for x in range(0, w, step):
-                painter.drawLine(x, 0, x, h)
-            for y in range(0, h, step):
-                painter.drawLine(0, y, w, y)
-        if isinstance(self.data_structure, list) and len(self.data_structure) > 0 and isinstance(self.data_structure[0],
-                                                                                                 HuffmanStructNode):
-            painter.setPen(QPen(QColor(209, 213, 219), 2, Qt.DashLine))
-            painter.drawLine(220, 0, 220, h)
+        for x in range(0, w, step):
+            painter.drawLine(x, 0, x, h)
+        for y in range(0, h, step):
+            painter.drawLine(0, y, w, y)
+        painter.restore()
+
+    def _set_linear_axis(self, start, step, extent, count, vertical):
+        """登记滚动时的排布（供下标标尺使用），并把适配视图的范围收窄到当前滚动窗口"""
+        self._linear_axis = (start, step, extent, count, vertical)
+        maximum, page = self._linear_scroll_range()
+        first = min(self.linear_scroll, maximum)
+        last = min(first + page, count) - 1
+        a, b = start + first * step, start + last * step
+        lo, hi = min(a, b), max(a, b) + extent
+        x0, y0, x1, y1 = self.content_bounds
+        self.content_bounds = (x0, lo - 30, x1, hi + 35) if vertical else (lo, y0, hi, y1)
+
+    def _draw_index_ruler(self, painter):
+        """
+        虚拟滚动时沿滚动条绘制下标标尺（屏幕坐标）：刻度间隔取 1、2、5 × 10^k 中
+        屏幕间距不小于 RULER_MIN_TICK_PX 的最小值，并标出当前可见的下标范围。
+        """
+        start, step, extent, count, vertical = self._linear_axis
+        s = self.view_scale
+        interval, factors, k = 1, (2, 2.5, 2), 0
+        while interval * abs(step) * s < self.RULER_MIN_TICK_PX:
+            interval = int(round(interval * factors[k % 3]))
+            k += 1
+
+        w, h = self.width(), self.height()
+        bar, size = self.SCROLLBAR_SIZE + 1, self.RULER_SIZE
+        if vertical:
+            band = QRect(w - bar - size * 3, 0, size * 3, h)
+            lo, hi = -self.view_offset.y() / s, (h - self.view_offset.y()) / s
+        else:
+            band = QRect(0, h - bar - size, w, size)
+            lo, hi = -self.view_offset.x() / s, (w - self.view_offset.x()) / s
+        first, last = self._visible_index_range(start, step, extent, count, lo, hi, pad=0)
+
+        painter.save()
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(249, 250, 251, 220))
+        painter.drawRect(band)
+        painter.setFont(QFont("Arial", 8))
+        painter.setPen(QPen(QColor(107, 114, 128), 1))
+        for i in range(first + (-first) % interval, last, interval):
+            pos = (start + i * step + extent / 2) * s
+            if vertical:
+                y = int(pos + self.view_offset.y())
+                painter.drawLine(band.right() - 5, y, band.right(), y)
+                painter.drawText(QRect(band.left(), y - 8, band.width() - 8, 16), Qt.AlignRight | Qt.AlignVCenter, str(i))
+            else:
+                x = int(pos + self.view_offset.x())
+                painter.drawLine(x, band.top(), x, band.top() + 5)
+                painter.drawText(QRect(x - 40, band.top() + 4, 80, size - 4), Qt.AlignCenter, str(i))
+
+        # 可见范围：第 first ~ last-1 项 / 共 count 项
+        text = f"{first} - {max(first, last - 1)} / {self.data_structure.length()}"
+        painter.setFont(QFont("Arial", 9, QFont.Bold))
+        text_w = painter.fontMetrics().horizontalAdvance(text) + 12
+        label = QRect(w - bar - text_w - (band.width() if vertical else 4), 4, text_w, 20)
+        painter.setPen(QPen(QColor(191, 219, 254), 1))
+        painter.setBrush(QColor(239, 246, 255))
+        painter.drawRoundedRect(label, 4, 4)
+        painter.setPen(QColor(30, 64, 175))
+        painter.drawText(label, Qt.AlignCenter, text)
         painter.restore()
 
     def _draw_traversal_text(self, painter):
@@ -784,15 +1550,34 @@ class VisualArea(QWidget):
             start_y = (area_height + stack_height) // 2
             if start_y + 40 > area_height: start_y = area_height - 40
 
-            for i in range(length):
+            step = self.cell_height + self.cell_spacing
+            scroll_start = self._linear_scroll_start(-step)
+            if scroll_start is not None:
+                start_y = scroll_start
+            self.content_bounds = (start_x - 40, start_y - (length - 1) * step - 30,
+                                   start_x + self.cell_width, start_y + self.cell_height + 35)
+            if scroll_start is not None:
+                self._set_linear_axis(start_y, -step, self.cell_height, length, True)
+            tier = self.lod_tier(self.cell_height)
+            if tier == LOD_SUMMARY and not self.anim_state:
+                self._draw_linear_summary(painter, start_y, -step, self.cell_height, length,
+                                          start_x, self.cell_width, vertical=True)
+                return
+            _, vy0, _, vy1 = self.visible_world_rect()
+            first, last = self._visible_index_range(start_y, -step, self.cell_height, length, vy0, vy1)
+            styles, text_cache = self.styles, self.text_cache
+            for i, value in enumerate(_iter_range(ds, first, last), first):
                 painter.save()
                 x_pos = start_x
                 y_pos = start_y - i * (self.cell_height + self.cell_spacing)
-                bg_color = QColor(219, 234, 254)
-                if i == self.highlighted_index: bg_color = QColor(250, 204, 21)
+                bg_color = (219, 234, 254)
+                if i == self.highlighted_index: bg_color = (250, 204, 21)
 
                 if self.anim_state and self.anim_state.get('index') == i:
                     anim_type = self.anim_state.get('type')
+                    # 动画包络（含左侧下标）：缩放不超出格子本身；出栈时从原位一直上移到 offset_end
+                    offset_end = self.anim_state.get('offset_end', 0) if anim_type == 'pop' else 0
+                    self.mark_animated(x_pos - 35, y_pos + offset_end, x_pos + self.cell_width, y_pos + self.cell_height)
                     if anim_type == 'push':
                         scale = self.anim_state.get('scale', 1.0)
                         cx, cy = x_pos + self.cell_width / 2, y_pos + self.cell_height / 2
@@ -800,29 +1585,30 @@ class VisualArea(QWidget):
                         painter.scale(scale, scale);
                         painter.translate(-cx, -cy)
                         if scale < 0.8:
-                            bg_color = QColor(16, 185, 129)
+                            bg_color = (16, 185, 129)
                         else:
-                            bg_color = QColor(250, 204, 21)
+                            bg_color = (250, 204, 21)
                     elif anim_type == 'pop':
                         offset_y = self.anim_state.get('offset_y', 0)
                         painter.translate(0, offset_y)
-                        bg_color = QColor(239, 68, 68)
+                        bg_color = (239, 68, 68)
                         painter.setOpacity(max(0, 1.0 + offset_y / 200.0))
                     elif anim_type == 'highlight':
-                        bg_color = QColor(245, 158, 11)
+                        bg_color = (245, 158, 11)
 
-                painter.setBrush(QBrush(bg_color))
-                painter.setPen(QPen(QColor(30, 58, 138), 2))
+                painter.setBrush(styles.brush(bg_color))
+                painter.setPen(styles.pen((30, 58, 138), 2))
                 painter.drawRect(self._safe_rect(x_pos, y_pos, self.cell_width, self.cell_height))
-                painter.setPen(QPen(QColor(107, 114, 128), 1))
-                painter.setFont(QFont("Arial", 9))
-                painter.drawText(self._safe_rect(x_pos - 35, y_pos, 30, self.cell_height),
-                                 Qt.AlignRight | Qt.AlignVCenter, str(i))
-                painter.setPen(QPen(QColor(17, 24, 39), 1))
-                painter.setFont(QFont("Arial", 11, QFont.Bold))
+                if tier != LOD_FULL:
+                    painter.restore()
+                    continue
+                painter.setPen(styles.pen((107, 114, 128), 1))
+                text_cache.draw_aligned(painter, self._safe_rect(x_pos - 35, y_pos, 30, self.cell_height),
+                                        Qt.AlignRight | Qt.AlignVCenter, str(i), styles.font("Arial", 9))
+                painter.setPen(styles.pen((17, 24, 39), 1))
                 try:
-                    painter.drawText(self._safe_rect(x_pos, y_pos, self.cell_width, self.cell_height),
-                                     Qt.AlignCenter, str(ds[i]))
+                    text_cache.draw_centered(painter, self._safe_rect(x_pos, y_pos, self.cell_width, self.cell_height),
+                                             str(value), styles.font("Arial", 11, QFont.Bold))
                 except:
                     pass
                 painter.restore()
@@ -831,10 +1617,10 @@ class VisualArea(QWidget):
                 bottom_y = start_y + self.cell_height + 5
                 painter.setPen(QPen(QColor(75, 85, 99), 2))
                 painter.setFont(QFont("Microsoft YaHei", 10, QFont.Bold))
-                painter.drawText(int(start_x), int(bottom_y), self.cell_width, 30, Qt.AlignCenter, "Stack Bottom")
+                painter.drawText(int(start_x), self._safe_int(bottom_y), self.cell_width, 30, Qt.AlignCenter, "Stack Bottom")
                 top_y = start_y - (length - 1) * (self.cell_height + self.cell_spacing) - 30
                 painter.setPen(QPen(QColor(220, 38, 38), 2))
-                painter.drawText(int(start_x), int(top_y), self.cell_width, 25, Qt.AlignCenter, "Stack Top")
+                painter.drawText(int(start_x), self._safe_int(top_y), self.cell_width, 25, Qt.AlignCenter, "Stack Top")
             return
 
         # SequenceList
@@ -843,7 +1629,12 @@ class VisualArea(QWidget):
         mem_spacing = self.cell_spacing + 5
         max_capacity = max(length + 2, 10)
         total_width = max_capacity * mem_w + (max_capacity - 1) * mem_spacing
-        start_x = 20 if total_width > area_width - 40 else (area_width - total_width) // 2
+        slot_step = mem_w + mem_spacing
+        scroll_start = self._linear_scroll_start(slot_step)
+        if scroll_start is not None:
+            start_x = scroll_start
+        else:
+            start_x = 20 if total_width > area_width - 40 else (area_width - total_width) // 2
         base_y = area_height // 2 - mem_h // 2
         state = self.anim_state
         anim_type = state.get('type', '')
@@ -853,19 +1644,23 @@ class VisualArea(QWidget):
         shift_idx = state.get('shift_index', -1)
         new_val = state.get('new_val')
 
-        painter.save()
-        painter.setPen(QPen(QColor(209, 213, 219), 1, Qt.DotLine))
-        painter.setBrush(Qt.NoBrush)
-        painter.setFont(QFont("Arial", 8, QFont.Bold))
-        for i in range(max_capacity):
-            mx = start_x + i * (mem_w + mem_spacing)
-            painter.drawRect(self._safe_rect(mx, base_y, mem_w, mem_h))
-            painter.setPen(QPen(QColor(220, 38, 38)))
-            painter.drawText(self._safe_rect(mx, base_y - 15, 30, 15), Qt.AlignLeft, str(i))
-            painter.setPen(QPen(QColor(209, 213, 219), 1, Qt.DotLine))
-        painter.restore()
+        self.content_bounds = (start_x, base_y - 100, start_x + total_width, base_y + mem_h + 100)
+        if scroll_start is not None:
+            self._set_linear_axis(start_x, slot_step, mem_w, max_capacity, False)
+        vx0, _, vx1, _ = self.visible_world_rect()
+        tier = self.lod_tier(self.cell_height)
+        if tier == LOD_SUMMARY and not state:
+            self._draw_linear_summary(painter, start_x, slot_step, mem_w, length, base_y, mem_h)
+            return
 
-        for i in range(length):
+        # 内存槽位与下标是静态的，缓存为图层
+        slots = (start_x, base_y, slot_step, mem_w, mem_h, max_capacity, tier == LOD_FULL)
+        self._draw_world_layer(painter, 'seq_slots', slots, (start_x - 2, base_y - 16, total_width + 4, mem_h + 18),
+                               lambda p, clip: self._render_sequence_slots(p, clip, *slots))
+
+        first, last = self._visible_index_range(start_x, slot_step, mem_w, length, vx0, vx1)
+        styles, text_cache = self.styles, self.text_cache
+        for i, value in enumerate(_iter_range(ds, first, last), first):
             painter.save()
             offset_x = (mem_w - self.cell_width) / 2
             offset_y = (mem_h - self.cell_height) / 2
@@ -873,7 +1668,7 @@ class VisualArea(QWidget):
             oy_pos = base_y + offset_y
             x_pos = ox_pos
             y_pos = oy_pos
-            bg_color = QColor(219, 234, 254)
+            bg_color = (219, 234, 254)
             opacity = 1.0
 
             if anim_type == 'seq_insert':
@@ -884,15 +1679,19 @@ class VisualArea(QWidget):
                             x_pos += move_unit
                         elif i == shift_idx:
                             x_pos += progress * move_unit
+                            self.mark_animated(ox_pos, oy_pos, ox_pos + move_unit + self.cell_width,
+                                               oy_pos + self.cell_height)
                     elif phase in ['hover', 'move_in', 'shift_complete']:
                         x_pos += move_unit
             elif anim_type == 'seq_delete':
                 move_unit = (mem_w + mem_spacing)
+                if i == target_idx and phase in ('flash_target', 'move_out'):
+                    self.mark_animated(ox_pos, oy_pos - 100, ox_pos + self.cell_width, oy_pos + self.cell_height)
                 if i == target_idx:
                     if phase == 'flash_target':
                         flash_intensity = abs(math.sin(state.get('flash_count', 0) * math.pi / 2))
-                        bg_color = QColor.fromRgb(255, 100 + int(150 * flash_intensity),
-                                                  100 + int(150 * flash_intensity))
+                        bg_color = (255, 100 + int(150 * flash_intensity),
+                                      100 + int(150 * flash_intensity))
                     elif phase == 'move_out':
                         y_pos -= progress * 100
                         opacity = 1.0 - progress
@@ -904,23 +1703,26 @@ class VisualArea(QWidget):
                         pass
                     elif i == shift_idx:
                         x_pos += move_unit * (1.0 - progress)
+                        self.mark_animated(ox_pos, oy_pos, ox_pos + move_unit + self.cell_width,
+                                           oy_pos + self.cell_height)
                     elif i > shift_idx:
                         x_pos += move_unit
             elif anim_type == 'seq_search' and i == state.get('current_idx'):
-                bg_color = QColor(255, 215, 0)
-            if i == self.highlighted_index: bg_color = QColor(250, 204, 21)
+                bg_color = (255, 215, 0)
+                self.mark_animated(x_pos, y_pos, x_pos + self.cell_width, y_pos + self.cell_height)
+            if i == self.highlighted_index: bg_color = (250, 204, 21)
 
             painter.setOpacity(opacity)
-            painter.setBrush(QBrush(bg_color))
-            painter.setPen(QPen(QColor(30, 58, 138), 2))
+            painter.setBrush(styles.brush(bg_color))
+            painter.setPen(styles.pen((30, 58, 138), 2))
             painter.drawRect(self._safe_rect(x_pos, y_pos, self.cell_width, self.cell_height))
-            painter.setPen(QPen(QColor(17, 24, 39), 1))
-            painter.setFont(QFont("Arial", 11, QFont.Bold))
-            try:
-                painter.drawText(self._safe_rect(x_pos, y_pos, self.cell_width, self.cell_height), Qt.AlignCenter,
-                                 str(ds[i]))
-            except:
-                pass
+            if tier == LOD_FULL:
+                painter.setPen(styles.pen((17, 24, 39), 1))
+                try:
+                    text_cache.draw_centered(painter, self._safe_rect(x_pos, y_pos, self.cell_width, self.cell_height),
+                                             str(value), styles.font("Arial", 11, QFont.Bold))
+                except:
+                    pass
             painter.restore()
 
         if anim_type == 'seq_insert' and phase in ['hover', 'move_in', 'shift_forward']:
@@ -932,6 +1734,7 @@ class VisualArea(QWidget):
             ty_target = base_y + offset_y
             y_pos_new = ty_hover
             if phase == 'move_in': y_pos_new = lerp(ty_hover, ty_target, progress)
+            self.mark_animated(tx, ty_hover, tx + self.cell_width, ty_target + self.cell_height)
             painter.setBrush(QBrush(QColor(16, 185, 129)))
             painter.setPen(QPen(QColor(5, 150, 105), 2))
             painter.drawRect(self._safe_rect(tx, y_pos_new, self.cell_width, self.cell_height))
@@ -940,6 +1743,21 @@ class VisualArea(QWidget):
                              str(new_val))
             painter.restore()
 
+    def _render_sequence_slots(self, painter, clip, start_x, base_y, slot_step, mem_w, mem_h, capacity, show_labels):
+        """绘制顺序表的虚线内存槽位及下标（只绘制 clip 范围内的槽位）"""
+        painter.save()
+        painter.setPen(QPen(QColor(209, 213, 219), 1, Qt.DotLine))
+        painter.setBrush(Qt.NoBrush)
+        painter.setFont(QFont("Arial", 8, QFont.Bold))
+        for i in range(*self._visible_index_range(start_x, slot_step, mem_w, capacity, clip[0], clip[2])):
+            mx = start_x + i * slot_step
+            painter.drawRect(self._safe_rect(mx, base_y, mem_w, mem_h))
+            if show_labels:
+                painter.setPen(QPen(QColor(220, 38, 38)))
+                painter.drawText(self._safe_rect(mx, base_y - 15, mem_w, 15), Qt.AlignLeft, str(i))
+                painter.setPen(QPen(QColor(209, 213, 219), 1, Qt.DotLine))
+        painter.restore()
+
     def _draw_linked_list(self, painter):
         ll = self.data_structure
         length = ll.length()
@@ -957,7 +1775,16 @@ class VisualArea(QWidget):
         total_w = disp_cnt * step_w + (step_w if anim_type == 'linked_insert' else 0)
         start_x = 40 if total_w > self.width() - 40 else (self.width() - total_w) // 2 + 20
         base_y = self.height() // 2 - node_h // 2
-        for i in range(length):
+        self.content_bounds = (start_x, base_y - 30, start_x + total_w, base_y + node_h + 120)
+        self._mark_linked_list_animation(state, start_x, base_y, step_w, length)
+        tier = self.lod_tier(node_h)
+        if tier == LOD_SUMMARY and not state:
+            self._draw_linear_summary(painter, start_x, step_w, node_w, length, base_y, node_h)
+            return
+        vx0, _, vx1, _ = self.visible_world_rect()
+        first, last = self._visible_index_range(start_x, step_w, node_w + gap, length, vx0, vx1)
+        styles, text_cache = self.styles, self.text_cache
+        for i, value in enumerate(islice(ll, first, last), first):
             curr_x = start_x + i * step_w
             curr_y = base_y
             if anim_type == 'linked_insert' and i >= target_idx:
@@ -975,33 +1802,34 @@ class VisualArea(QWidget):
                         curr_y += 100
                 elif i > target_idx:
                     if phase == 'close': curr_x -= lerp(0, step_w, progress)
-            bg = QColor(219, 234, 254)
-            border = QColor(30, 58, 138)
-            if i == self.highlighted_index: bg = QColor(250, 204, 21)
+            bg = (219, 234, 254)
+            border = (30, 58, 138)
+            if i == self.highlighted_index: bg = (250, 204, 21)
             if anim_type == 'linked_search' and i == state.get('current_idx'):
                 if phase == 'scanning':
-                    bg = QColor(147, 197, 253)
+                    bg = (147, 197, 253)
                 elif phase == 'found':
                     t = state.get('flash_time', 0)
-                    bg = QColor(50, 205, 50) if int(t * 5) % 2 == 0 else QColor(250, 204, 21)
+                    bg = (50, 205, 50) if int(t * 5) % 2 == 0 else (250, 204, 21)
             if anim_type == 'linked_delete' and i == target_idx:
-                bg = QColor(254, 202, 202)
-                border = QColor(220, 38, 38)
+                bg = (254, 202, 202)
+                border = (220, 38, 38)
                 if phase == 'close': painter.setOpacity(1.0 - progress)
             painter.save()
-            painter.setBrush(QBrush(bg))
-            painter.setPen(QPen(border, 2))
+            painter.setBrush(styles.brush(bg))
+            painter.setPen(styles.pen(border, 2))
             painter.drawRect(self._safe_rect(curr_x, curr_y, node_w, node_h))
-            painter.setPen(QPen(QColor(17, 24, 39), 1))
-            painter.setFont(QFont("Arial", 11, QFont.Bold))
-            painter.drawText(self._safe_rect(curr_x, curr_y, node_w, node_h), Qt.AlignCenter, str(ll[i]))
-            painter.setPen(QPen(QColor(220, 38, 38)))
-            painter.setFont(QFont("Arial", 8, QFont.Bold))
-            painter.drawText(self._safe_rect(curr_x, curr_y - 5, 30, 15), Qt.AlignLeft, str(i))
+            if tier == LOD_FULL:
+                painter.setPen(styles.pen((17, 24, 39), 1))
+                text_cache.draw_centered(painter, self._safe_rect(curr_x, curr_y, node_w, node_h),
+                                         str(value), styles.font("Arial", 11, QFont.Bold))
+                painter.setPen(styles.pen((220, 38, 38)))
+                text_cache.draw_aligned(painter, self._safe_rect(curr_x, curr_y - 5, 30, 15), Qt.AlignLeft,
+                                        str(i), styles.font("Arial", 8, QFont.Bold))
             if i == 0:
-                painter.setPen(QPen(Qt.black))
-                painter.setFont(QFont("Arial", 10, QFont.Bold))
-                painter.drawText(self._safe_rect(curr_x, curr_y - 25, node_w, 20), Qt.AlignCenter, "HEAD")
+                painter.setPen(styles.pen(Qt.black))
+                text_cache.draw_centered(painter, self._safe_rect(curr_x, curr_y - 25, node_w, 20),
+                                         "HEAD", styles.font("Arial", 10, QFont.Bold))
             painter.restore()
             if i < length - 1:
                 ni = i + 1
@@ -1091,63 +1919,76 @@ class VisualArea(QWidget):
                     self.drawArrow(painter, nx + node_w, ny + node_h / 2, nnx, nny + node_h / 2,
                                    color=QColor(16, 185, 129), progress=g)
 
+    def _mark_linked_list_animation(self, state, start_x, base_y, step_w, length):
+        """链表动画包络：目标节点两侧的箭头与下沉 / 抬起的节点；整体平移阶段覆盖到表尾"""
+        anim_type = state.get('type', '')
+        phase = state.get('phase', '')
+        top, bottom = base_y - 30, base_y + 100 + self.cell_height + 10
+        if anim_type == 'linked_search':
+            x = start_x + state.get('current_idx', 0) * step_w
+            self.mark_animated(x, base_y, x + self.cell_width, base_y + self.cell_height)
+        elif anim_type in ('linked_insert', 'linked_delete'):
+            target_idx = state.get('target_idx', 0)
+            x0 = start_x + (target_idx - 1) * step_w
+            if phase in ('shift', 'close'):
+                x1 = start_x + (length + 1) * step_w
+            else:
+                x1 = start_x + (target_idx + 2) * step_w
+            self.mark_animated(x0, top, x1, bottom)
+
     def _draw_huffman_array_process(self, painter):
         struct_array = self.data_structure
+        x0, y0, x1, y1 = self.visible_world_rect(margin=self.node_radius)
         painter.save()
-        painter.setPen(QPen(QColor(156, 163, 175), 2))
-
-        for idx, pos_data in self.node_positions.items():
-            if idx < 0 or idx >= len(struct_array): continue
-            node = struct_array[idx]
-            current_pos = self._get_safe_pos(idx)
-            if not current_pos: continue
-            cx, cy = current_pos
-
-            if node.left != -1:
-                l_pos = self._get_safe_pos(node.left)
-                if l_pos:
-                    lx, ly = l_pos
-                    painter.drawLine(self._safe_point(cx, cy), self._safe_point(lx, ly))
-
-            if node.right != -1:
-                r_pos = self._get_safe_pos(node.right)
-                if r_pos:
-                    rx, ry = r_pos
-                    painter.drawLine(self._safe_point(cx, cy), self._safe_point(rx, ry))
-        painter.restore()
+        # 左侧排序区与森林区的分隔线
+        painter.setPen(QPen(QColor(209, 213, 219), 2, Qt.DashLine))
+        painter.drawLine(QPointF(220, y0), QPointF(220, y1))
+        painter.setPen(self.styles.pen((156, 163, 175), 2))
 
+        safe_positions = {}
         for idx in self.node_positions.keys():
-            if idx < 0 or idx >= len(struct_array): continue
+            if 0 <= idx < len(struct_array):
+                pos = self._get_safe_pos(idx)
+                if pos: safe_positions[idx] = pos
+
+        edges = []
+        for idx, (cx, cy) in safe_positions.items():
             node = struct_array[idx]
-            pos = self._get_safe_pos(idx)
-            if pos: self._draw_single_huffman_struct_node(painter, node, pos[0], pos[1])
+            for child in (node.left, node.right):
+                if child != -1 and child in safe_positions:
+                    edges.append((cx, cy) + safe_positions[child])
+        self._draw_line_batch(painter, edges)
+        painter.restore()
 
-    def _draw_single_huffman_struct_node(self, painter, node, x, y):
-        radius = self.node_radius
+        xs, ys = [], []
+        items = []
+        for idx, pos in safe_positions.items():
+            xs.append(pos[0]); ys.append(pos[1])
+            if x0 <= pos[0] <= x1 and y0 <= pos[1] <= y1:
+                node = struct_array[idx]
+                items.append((pos, self._huffman_node_fill(node), self._huffman_node_label(node)))
         painter.save()
-        if node.left == -1 and node.right == -1:
-            bg_color = QColor(167, 243, 208)
-        else:
-            bg_color = QColor(254, 215, 170)
+        self._draw_node_batch(painter, items, self.styles.pen((31, 41, 55), 2), self.styles.font("Arial", 8, QFont.Bold))
+        painter.restore()
+        if xs:
+            r = self.node_radius
+            self.content_bounds = (min(xs) - r, min(ys) - r, max(xs) + r, max(ys) + r)
+
+    def _huffman_node_fill(self, node):
+        """哈夫曼结构数组节点的填充色：参与当前合并的节点为黄色，叶子为绿色，内部节点为橙色"""
         anim_targets = self.anim_state.get('targets', {})
         active_parent_idx = self.anim_state.get('active_parent_idx', -1)
-        if (node.index in anim_targets) or (node.index == active_parent_idx): bg_color = QColor(250, 204, 21)
-        painter.setBrush(QBrush(bg_color))
-        painter.setPen(QPen(QColor(31, 41, 55), 2))
-
-        center = self._safe_point(x, y)
-        painter.drawEllipse(center, radius, radius)
+        if (node.index in anim_targets) or (node.index == active_parent_idx):
+            return (250, 204, 21)
+        if node.left == -1 and node.right == -1:
+            return (167, 243, 208)
+        return (254, 215, 170)
 
-        painter.setPen(QPen(QColor(0, 0, 0), 1))
-        painter.setFont(QFont("Arial", 8, QFont.Bold))
+    @staticmethod
+    def _huffman_node_label(node):
         if node.data:
-            disp = f"{node.data}\n{node.weight}"
-        else:
-            disp = f"{node.weight}"
-
-        text_rect = QRectF(center.x() - radius, center.y() - radius, radius * 2, radius * 2)
-        painter.drawText(text_rect, Qt.AlignCenter, disp)
-        painter.restore()
+            return f"{node.data}\n{node.weight}"
+        return f"{node.weight}"
 
     def drawArrow(self, painter, start_x, start_y, end_x, end_y, color=QColor(59, 130, 246), opacity=1.0, progress=1.0):
         if progress <= 0.01 or opacity <= 0.01: return
@@ -1228,8 +2069,22 @@ class VisualArea(QWidget):
         painter.restore()
 
 
+# 渲染后端：painter 为 VisualArea（QPainter 即时绘制），scene 为 SceneVisualArea（QGraphicsScene 常驻图元）
+BACKEND_PAINTER = 'painter'
+BACKEND_SCENE = 'scene'
+RENDER_BACKENDS = {BACKEND_PAINTER: VisualArea, BACKEND_SCENE: SceneVisualArea}
+
+
 class BaseVisualizer(QWidget):
     response_received = pyqtSignal(str)
+    render_backend = BACKEND_PAINTER  # 默认后端；运行中可在设置区切换，或调用 set_render_backend
+    # 切换渲染后端时从旧可视化区域转交给新区域的显示状态（哈夫曼的节点坐标也在 node_positions 中）
+    CARRIED_AREA_STATE = ('data_structure', 'highlighted_index', 'highlighted_node', 'highlight_color',
+                          'traversal_text', 'bfs_index_map', 'node_positions')
+    supports_index_jump = False  # 线性结构在设置区显示“跳转到下标”
+    is_animating = False  # 多步动画播放期间为 True，树类可视化据此拒绝新的操作
+    running_file = False  # 从文件执行 DSL 期间为 True，此时不允许关闭窗口
+    MAX_REPORTED_ERRORS = 20  # 从文件执行 DSL 时弹窗中最多列出的错误条数
 
     def __init__(self, main_window=None, last_window=None, title="数据结构可视化工具"):
         super().__init__()
@@ -1249,7 +2104,8 @@ class BaseVisualizer(QWidget):
         }
         self.current_structure_type = self.structure_type_mapping.get(title, "")
         self.data_structure = None
-        self.animation_speed = 500
+        self.animation_speed = 500  # 动画节奏（毫秒），默认 500，数值越大越慢
+        self.active_animation = None  # 当前运行的 Tween / Timeline
         self.animating = False
         self.current_operation = None
         self.operation_data = None
@@ -1291,7 +2147,7 @@ class BaseVisualizer(QWidget):
         self.setLayout(root_layout)
 
         # === 侧边栏 ===
-        sidebar = QWidget()
+        sidebar = self.sidebar = QWidget()
         sidebar.setFixedWidth(320)
         sidebar.setStyleSheet("background-color: #f3f4f6; border-right: 1px solid #e5e7eb;")
         sidebar_layout = QVBoxLayout(sidebar)
@@ -1389,9 +2245,16 @@ class BaseVisualizer(QWidget):
         self.run_btn = QPushButton("执行 / AI生成")
         self.run_btn.setStyleSheet(STYLES["btn_primary"])
         self.run_btn.clicked.connect(self.run_dsl)
+        # 大型脚本 / 操作记录：从文件逐行流式执行
+        self.run_file_btn = QPushButton("从文件执行")
+        self.run_file_btn.setStyleSheet(STYLES["btn_secondary"])
+        self.run_file_btn.clicked.connect(self.run_dsl_file)
 
         dsl_layout.addWidget(self.dsl_input)
-        dsl_layout.addWidget(self.run_btn)
+        dsl_btn_layout = QHBoxLayout()
+        dsl_btn_layout.addWidget(self.run_btn)
+        dsl_btn_layout.addWidget(self.run_file_btn)
+        dsl_layout.addLayout(dsl_btn_layout)
         dsl_group.setLayout(dsl_layout)
 
         sidebar_layout.addWidget(dsl_group, 0)
@@ -1409,6 +2272,12 @@ class BaseVisualizer(QWidget):
         self.anim_checkbox.setStyleSheet("font-family: 'Microsoft YaHei'; color: #4b5563; padding-left: 0;")
         settings_layout.addWidget(self.anim_checkbox)
 
+        self.scene_checkbox = QCheckBox("保留模式渲染 (图元场景)")
+        self.scene_checkbox.setChecked(self.render_backend == BACKEND_SCENE)
+        self.scene_checkbox.stateChanged.connect(self._toggle_render_backend)
+        self.scene_checkbox.setStyleSheet("font-family: 'Microsoft YaHei'; color: #4b5563; padding-left: 0;")
+        settings_layout.addWidget(self.scene_checkbox)
+
         speed_layout = QHBoxLayout()
         speed_lbl = QLabel("动画速度(ms):")
         speed_lbl.setStyleSheet("font-family: 'Microsoft YaHei'; color: #4b5563;")
@@ -1419,6 +2288,22 @@ class BaseVisualizer(QWidget):
         speed_layout.addWidget(self.speed_slider)
         settings_layout.addLayout(speed_layout)
 
+        if self.supports_index_jump:
+            jump_layout = QHBoxLayout()
+            jump_lbl = QLabel("跳转到下标:")
+            jump_lbl.setStyleSheet("font-family: 'Microsoft YaHei'; color: #4b5563;")
+            jump_layout.addWidget(jump_lbl)
+            self.jump_input = QLineEdit()
+            self.jump_input.setPlaceholderText("0")
+            self.jump_input.setStyleSheet(STYLES["input"])
+            self.jump_input.returnPressed.connect(self.jump_to_index)
+            jump_layout.addWidget(self.jump_input)
+            jump_btn = QPushButton("跳转")
+            jump_btn.setStyleSheet(STYLES["btn_secondary"])
+            jump_btn.clicked.connect(self.jump_to_index)
+            jump_layout.addWidget(jump_btn)
+            settings_layout.addLayout(jump_layout)
+
         ret_layout = QHBoxLayout()
         self.button_return = QPushButton("返回上一级")
         self.button_return.clicked.connect(self.on_button_return_clicked)
@@ -1442,7 +2327,8 @@ class BaseVisualizer(QWidget):
             "QGroupBox { background-color: white; border: 1px solid #d1d5db; border-radius: 8px; font-size: 16px; font-weight: bold; color: #1f2937; } QGroupBox::title { subcontrol-origin: margin; left: 15px; padding: 0 5px; top: 10px; }")
         vb_layout = QVBoxLayout()
         vb_layout.setContentsMargins(5, 30, 5, 5)
-        self.visual_area = VisualArea(self)
+        self.visual_layout = vb_layout
+        self.visual_area = self.create_visual_area()
         vb_layout.addWidget(self.visual_area)
         visual_box.setLayout(vb_layout)
         content_layout.addWidget(visual_box)
@@ -1454,14 +2340,107 @@ class BaseVisualizer(QWidget):
         root_layout.addWidget(sidebar)
         root_layout.addWidget(content_widget)
 
+    def create_visual_area(self):
+        """按 render_backend 创建可视化区域"""
+        area_class = RENDER_BACKENDS.get(self.render_backend)
+        if area_class is None:
+            raise ValueError(f"未知的渲染后端: {self.render_backend}")
+        return area_class(self)
+
+    def set_render_backend(self, backend):
+        """
+        切换渲染后端：新建可视化区域替换旧区域，并转交当前显示状态。
+        动画播放中不能切换（多步动画的回调持有旧区域的状态），返回是否已切换。
+        """
+        if backend not in RENDER_BACKENDS:
+            raise ValueError(f"未知的渲染后端: {backend}")
+        if backend == self.render_backend:
+            return True
+        if self.is_animating or self.running_file or (
+                self.active_animation is not None and self.active_animation.is_running()):
+            return False
+        self.stop_animations()
+        old = self.visual_area
+        self.render_backend = backend
+        area = self.create_visual_area()
+        for name in self.CARRIED_AREA_STATE:
+            setattr(area, name, getattr(old, name))
+        area.node_positions = dict(old.node_positions)
+        self.visual_layout.replaceWidget(old, area)
+        old.deleteLater()
+        self.visual_area = area
+        self.update_display()
+        return True
+
+    def _toggle_render_backend(self, state):
+        backend = BACKEND_SCENE if state == Qt.Checked else BACKEND_PAINTER
+        if not self.set_render_backend(backend):
+            self.scene_checkbox.blockSignals(True)
+            self.scene_checkbox.setChecked(self.render_backend == BACKEND_SCENE)
+            self.scene_checkbox.blockSignals(False)
+            self.status_label.setText("动画播放中，请在结束后再切换渲染方式")
+            return
+        self.status_label.setText(f"渲染方式: {'保留模式 (图元场景)' if backend == BACKEND_SCENE else '即时绘制'}")
+
     def _toggle_animation(self, state):
         self.anim_enabled = state == Qt.Checked
-        if not self.anim_enabled and hasattr(self, 'anim_timer') and self.anim_timer.isActive():
-            self.anim_timer.stop()
+        if not self.anim_enabled and self.stop_animations():
             self.visual_area.anim_state = {}
             self.update_display()
         self.status_label.setText(f"动画 {'已启用' if self.anim_enabled else '已禁用'}")
 
+    # --- 动画引擎 ---
+    def speed_factor(self):
+        """播放速度倍率：animation_speed 为默认值 500 时为 1，数值越大播放越慢"""
+        return 500 / self.animation_speed
+
+    def scaled_duration(self, msec):
+        """按当前播放速度换算动画时长"""
+        return msec / self.speed_factor()
+
+    def create_anim_timer(self):
+        """创建由共享动画时钟驱动的定时器（接口同 QTimer）"""
+        timer = ClockTimer(self)
+        timer.speed = self.speed_factor()
+        return timer
+
+    def play(self, animation):
+        """启动 Tween / Timeline，并替换掉仍在运行的上一个动画"""
+        if self.active_animation is not None:
+            self.active_animation.stop()
+        self.active_animation = animation
+        animation.start()
+        return animation
+
+    def state_tween(self, state, msec, key='progress', start=0.0, end=1.0, easing=linear):
+        """
+        让动画状态 state[key] 在 msec 毫秒（按播放速度换算）内从 start 变到 end。
+        由共享时钟逐帧推进，每帧只登记一次可视化区域的局部重绘，不再调用 update_display。
+        """
+        return Tween(self.scaled_duration(msec), lambda v: state.__setitem__(key, v), start, end,
+                     easing=easing, widget=self.visual_area)
+
+    def _set_phase(self, state, phase, message=None):
+        """切换到下一个动画阶段（时间线中的回调步骤），进度归零"""
+        state['phase'] = phase
+        state['progress'] = 0.0
+        if message:
+            self.status_label.setText(message)
+
+    def stop_animations(self):
+        """停止定时器与正在运行的动画，返回是否确实停止了某个动画"""
+        stopped = False
+        timer = getattr(self, 'anim_timer', None)
+        if timer is not None and timer.isActive():
+            timer.stop()
+            stopped = True
+        if self.active_animation is not None:
+            stopped = stopped or self.active_animation.is_running()
+            self.active_animation.stop()
+            self.active_animation = None
+        self.is_animating = False
+        return stopped
+
     def _create_input_layout(self):
         raise NotImplementedError
 
@@ -1477,6 +2456,14 @@ class BaseVisualizer(QWidget):
     def back_to_main(self):
         (self.main_window.show() if self.main_window else None); self.close()
 
+    def closeEvent(self, event):
+        # 执行文件时进度回调会处理界面事件，窗口在此期间被关闭的话回调会访问已销毁的控件
+        if self.running_file:
+            event.ignore()
+            self.status_label.setText("正在从文件执行 DSL，请等待执行完毕后再关闭窗口")
+            return
+        super().closeEvent(event)
+
     def update_display(self):
         try:
             self.visual_area.update_visualization(self.data_structure, self.highlighted_index)
@@ -1487,6 +2474,28 @@ class BaseVisualizer(QWidget):
     def _update_status_text(self):
         raise NotImplementedError
 
+    def reveal_index(self, index):
+        """把下标为 index 的元素滚动到可视区域中部（场景后端没有虚拟滚动，直接忽略）"""
+        if hasattr(self.visual_area, 'scroll_to_index'):
+            self.visual_area.scroll_to_index(index)
+
+    def jump_to_index(self):
+        """滚动到输入的下标并高亮该元素"""
+        text = self.jump_input.text().strip()
+        length = self.data_structure.length()
+        try:
+            index = int(text)
+        except ValueError:
+            QMessageBox.warning(self, "错误", "请输入整数下标")
+            return
+        if not 0 <= index < length:
+            QMessageBox.warning(self, "错误", f"下标超出范围 (0 ~ {length - 1})" if length else "结构为空")
+            return
+        self.reveal_index(index)
+        self.highlighted_index = index
+        self.update_display()
+        self.status_label.setText(f"已跳转到下标 {index}: {self.data_structure.get(index)}")
+
     def update_speed(self):
         try:
             val = int(self.speed_slider.text())
@@ -1494,6 +2503,8 @@ class BaseVisualizer(QWidget):
         except:
             pass
         self.speed_slider.setText(str(self.animation_speed))
+        if isinstance(getattr(self, 'anim_timer', None), ClockTimer):
+            self.anim_timer.speed = self.speed_factor()
 
     def load_recent_files(self):
         try:
@@ -1641,6 +2652,42 @@ class BaseVisualizer(QWidget):
         else:
             QMessageBox.warning(self, "执行错误", result)
 
+    def run_dsl_file(self):
+        """从文件流式执行 DSL：逐行读取执行，状态栏显示进度，执行期间界面保持响应"""
+        path, _ = QFileDialog.getOpenFileName(self, "选择 DSL 脚本", "", "DSL 脚本 (*.dsl *.txt);;所有文件 (*)")
+        if not path:
+            return
+        name = os.path.basename(path)
+        reported = []
+
+        def on_error(line_num, message):
+            if len(reported) < self.MAX_REPORTED_ERRORS:
+                reported.append(f"Line {line_num}: {message}")
+
+        def on_progress(stats):
+            percent = f" ({stats.fraction:.0%})" if stats.fraction is not None else ""
+            self.status_label.setText(f"正在执行 {name}: 第 {stats.lines} 行{percent}，错误 {stats.errors} 条")
+            QApplication.processEvents()
+
+        # 进度回调中会处理界面事件：执行期间锁住整个侧边栏、拒绝关闭窗口，并停掉动画，避免操作与脚本同时修改结构
+        self.stop_animations()
+        self.visual_area.anim_state = {}
+        self.sidebar.setEnabled(False)
+        self.running_file = True
+        try:
+            stats = DSLHandler(self).run_file(path, on_progress=on_progress, on_error=on_error)
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.critical(self, "错误", f"读取文件失败: {str(e)}")
+            return
+        finally:
+            self.running_file = False
+            self.sidebar.setEnabled(True)
+
+        self.status_label.setText(f"{name} 执行完毕：{stats.operations} 条指令，错误 {stats.errors} 条")
+        if stats.errors:
+            more = f"\n... 共 {stats.errors} 条错误" if stats.errors > len(reported) else ""
+            QMessageBox.warning(self, "执行错误", "\n".join(reported) + more)
+
     def _get_dsl_system_prompt(self):
         """生成 Prompt，包含严格的防代码生成指令"""
         stype = self.current_structure_type
@@ -1734,12 +2781,12 @@ class BaseVisualizer(QWidget):
             QTimer.singleShot(200, lambda: self._execute_dsl_directly(final_dsl))
 
 class StackVisualizer(BaseVisualizer):
+    supports_index_jump = True
+
     def __init__(self, main_window=None, lastwindow=None):
         super().__init__(main_window, lastwindow, "栈 (Stack) 可视化工具")
         self.data_structure = Stack()
         self.visual_area.set_data_structure(self.data_structure)
-        self.anim_timer = QTimer()
-        self.anim_timer.timeout.connect(self.update_animation)
 
     def _create_input_layout(self):
         l = QHBoxLayout()
@@ -1779,10 +2826,11 @@ class StackVisualizer(BaseVisualizer):
             if self.anim_enabled:
                 self.data_structure.push(text)  # 先入栈，后动画
                 self.push_input.clear()
-                self.visual_area.anim_state = {'type': 'push', 'index': self.data_structure.length() - 1, 'scale': 0.1}
-                self.anim_timer.setInterval(30)
-                self.anim_timer.start()
+                state = {'type': 'push', 'index': self.data_structure.length() - 1, 'scale': 0.1}
+                self.visual_area.anim_state = state
                 self.update_display()
+                self.play(Tween(self.scaled_duration(300), lambda v: state.update(scale=v), 0.1, 1.0,
+                                easing=ease_out_cubic, widget=self.visual_area, on_finished=self._finish_push))
             else:
                 self.data_structure.push(text)
                 self.push_input.clear()
@@ -1798,10 +2846,15 @@ class StackVisualizer(BaseVisualizer):
                 return
 
             if self.anim_enabled:
-                self.visual_area.anim_state = {'type': 'highlight', 'index': self.data_structure.length() - 1,
-                                               'offset_y': 0}
+                index = self.data_structure.length() - 1
+                self.visual_area.anim_state = {'type': 'highlight', 'index': index, 'offset_y': 0}
                 self.update_display()
-                QTimer.singleShot(500, self.start_pop_animation)
+                pop_state = {'type': 'pop', 'index': index, 'offset_y': 0, 'offset_end': -300}
+                self.play(Timeline(on_finished=self._finish_pop)
+                          .wait(self.scaled_duration(500))
+                          .call(lambda: setattr(self.visual_area, 'anim_state', pop_state))
+                          .then(Tween(self.scaled_duration(600), lambda v: pop_state.update(offset_y=v), 0, pop_state['offset_end'],
+                                      easing=ease_in_quad, widget=self.visual_area)))
             else:
                 val = self.data_structure.pop()
                 self.update_display()
@@ -1810,39 +2863,15 @@ class StackVisualizer(BaseVisualizer):
         except Exception as e:
             QMessageBox.warning(self, "错误", str(e))
 
-    def start_pop_animation(self):
-        self.visual_area.anim_state = {'type': 'pop', 'index': self.data_structure.length() - 1,
-                                       'offset_y': 0}
-        self.anim_timer.setInterval(30)
-        self.anim_timer.start()
-
-    def update_animation(self):
-        state = self.visual_area.anim_state
-        if not state:
-            self.anim_timer.stop()
-            return
-
-        # 确保动画开关开启
-        if not self.anim_enabled:
-            self.anim_timer.stop()
-            self.visual_area.anim_state = {}
-            self.update_display()
-            return
+    def _finish_push(self):
+        self.visual_area.anim_state = {}
+        self.status_label.setText(f"入栈完成, 当前栈深: {self.data_structure.length()}")
+        self.update_display()
 
-        if state['type'] == 'push':
-            state['scale'] += 0.1
-            if state['scale'] >= 1.0:
-                state['scale'] = 1.0
-                self.anim_timer.stop()
-                self.visual_area.anim_state = {}
-                self.status_label.setText(f"入栈完成, 当前栈深: {self.data_structure.length()}")
-        elif state['type'] == 'pop':
-            state['offset_y'] -= 15
-            if state['offset_y'] < -300:
-                self.anim_timer.stop()
-                self.visual_area.anim_state = {}
-                self.data_structure.pop()  # 动画结束后才真正移除数据
-                self.status_label.setText(f"出栈完成, 当前栈深: {self.data_structure.length()}")
+    def _finish_pop(self):
+        self.visual_area.anim_state = {}
+        self.data_structure.pop()  # 动画结束后才真正移除数据
+        self.status_label.setText(f"出栈完成, 当前栈深: {self.data_structure.length()}")
         self.update_display()
 
     def handle_clear(self):
@@ -1861,13 +2890,13 @@ class StackVisualizer(BaseVisualizer):
 
 
 class QueueVisualizer(BaseVisualizer):
+    supports_index_jump = True
+
     def __init__(self, main_window=None, lastwindow=None):
         super().__init__(main_window, lastwindow, "队列 (Queue) 可视化工具")
         # 确保 Queue 已在 model.py 中定义
         self.data_structure = Queue()
         self.visual_area.set_data_structure(self.data_structure)
-        self.anim_timer = QTimer()
-        self.anim_timer.timeout.connect(self.update_animation)
 
     def _create_input_layout(self):
         l = QHBoxLayout()
@@ -1928,16 +2957,16 @@ class QueueVisualizer(BaseVisualizer):
         if self.anim_enabled:
             # 启动入队动画：先不插入数据，只播放动画
             target_idx = self.data_structure.length()
-            self.visual_area.anim_state = {
+            state = self.visual_area.anim_state = {
                 'type': 'queue_enqueue',
                 'target_idx': target_idx,
                 'new_val': text,
                 'phase': 'move_in',
                 'progress': 0.0
             }
-            # 速度适中
-            self.anim_timer.setInterval(30)
-            self.anim_timer.start()
+            self.update_display()
+            self.play(Timeline(on_finished=lambda: self._finish_enqueue(text))
+                      .then(self.state_tween(state, 600)))
             self.status_label.setText(f"元素 {text} 正在入队...")
             self.enqueue_input.clear()
         else:
@@ -1955,18 +2984,24 @@ class QueueVisualizer(BaseVisualizer):
 
             # 出队无需输入值，直接操作队头
             if self.anim_enabled:
-                # 启动出队动画序列
-                self.visual_area.anim_state = {
+                # 启动出队动画序列：队头闪烁约 2 秒 -> 向左移出 -> 剩余元素整体前移
+                state = self.visual_area.anim_state = {
                     'type': 'queue_dequeue',
                     'phase': 'flash_head',  # 第一阶段：队头闪烁
                     'progress': 0.0,
-                    'flash_count': 0,  # 计数器
+                    'flash_count': 0,  # 闪烁计数（每 5 次切换一次颜色）
                     'target_idx': 0
                 }
-                # 设置定时器，闪烁需要持续约2秒
-                # 50ms * 40次 = 2000ms
-                self.anim_timer.setInterval(50)
-                self.anim_timer.start()
+                self.update_display()
+                timeline = (Timeline(on_finished=self._finish_dequeue)
+                            .then(Tween(self.scaled_duration(2000), lambda v: state.update(flash_count=int(v)), 0, 40,
+                                        easing=linear, widget=self.visual_area))
+                            .call(lambda: self._set_phase(state, 'move_out', "队头元素移出中..."))
+                            .then(self.state_tween(state, 600))
+                            .call(lambda: self._dequeue_head(state)))
+                if self.data_structure.length() > 1:
+                    timeline.then(self.state_tween(state, 390))  # 剩余元素前移（稍快）
+                self.play(timeline)
                 val = self.data_structure.peek()
                 self.status_label.setText(f"队头元素 {val} 准备出队...")
             else:
@@ -1977,81 +3012,27 @@ class QueueVisualizer(BaseVisualizer):
         except Exception as e:
             QMessageBox.warning(self, "错误", str(e))
 
-    def update_animation(self):
-        state = self.visual_area.anim_state
-        if not state:
-            self.anim_timer.stop()
-            return
-
-        if not self.anim_enabled:
-            self.anim_timer.stop()
-            self.visual_area.anim_state = {}
-            self.update_display()
-            return
-
-        anim_type = state['type']
-
-        # === 入队动画 ===
-        if anim_type == 'queue_enqueue':
-            if state['phase'] == 'move_in':
-                # 进场速度
-                state['progress'] += 0.05
-                if state['progress'] >= 1.0:
-                    # 动画结束，实际插入数据
-                    self.anim_timer.stop()
-                    self.data_structure.enqueue(state['new_val'])
-                    self.visual_area.anim_state = {}
-                    self.update_display()
-                    self.status_label.setText(f"入队完成, 当前长度: {self.data_structure.length()}")
-
-        # === 出队动画 ===
-        elif anim_type == 'queue_dequeue':
-            # 阶段 1: 队头闪烁 (持续 2 秒)
-            if state['phase'] == 'flash_head':
-                state['flash_count'] += 1
-                # 50ms * 40 = 2000ms
-                if state['flash_count'] >= 40:
-                    # 切换到移出阶段
-                    state['phase'] = 'move_out'
-                    state['progress'] = 0.0
-                    self.anim_timer.setInterval(30)  # 加速移动
-                    self.status_label.setText("队头元素移出中...")
-                else:
-                    self.update_display()  # 刷新颜色
-                    return
-
-                    # 阶段 2: 队头向左移出并消失
-            elif state['phase'] == 'move_out':
-                state['progress'] += 0.05
-                if state['progress'] >= 1.0:
-                    # 移出动画完成，此时才进行【物理删除】
-                    removed = self.data_structure.dequeue()
-
-                    if self.data_structure.length() > 0:
-                        # 阶段 3: 如果还有元素，剩下的整体前移
-                        # 此时 data_structure 已经是删除后的状态 (下标0是原来的下标1)
-                        # 但绘图函数会通过 offset 让它们看起来还在原位，准备滑过来
-                        state['phase'] = 'shift_forward'
-                        state['progress'] = 0.0
-                        self.status_label.setText("队列前移整队...")
-                    else:
-                        # 队列空了，直接结束
-                        self.anim_timer.stop()
-                        self.visual_area.anim_state = {}
-                        self.update_display()
-                        self.status_label.setText(f"出队完成: {removed}")
-                        return
-
-            # 阶段 3: 剩余元素前移填补空缺
-            elif state['phase'] == 'shift_forward':
-                state['progress'] += 0.08  # 移动稍快
-                if state['progress'] >= 1.0:
-                    self.anim_timer.stop()
-                    self.visual_area.anim_state = {}
-                    self.update_display()
-                    self.status_label.setText("出队及整理完成")
+    def _finish_enqueue(self, value):
+        # 动画结束，实际插入数据
+        self.data_structure.enqueue(value)
+        self.visual_area.anim_state = {}
+        self.update_display()
+        self.status_label.setText(f"入队完成, 当前长度: {self.data_structure.length()}")
+
+    def _dequeue_head(self, state):
+        """移出动画完成，此时才进行【物理删除】"""
+        state['removed'] = self.data_structure.dequeue()
+        # 此时 data_structure 已经是删除后的状态（下标0是原来的下标1），
+        # 绘图函数会通过 offset 让剩余元素看起来还在原位，再滑过来
+        self._set_phase(state, 'shift_forward')
+        self.update_display()
+        self.status_label.setText("队列前移整队...")
 
+    def _finish_dequeue(self):
+        removed = self.visual_area.anim_state.get('removed')
+        self.visual_area.anim_state = {}
         self.update_display()
+        self.status_label.setText(f"出队完成: {removed}")
 
     def handle_clear(self):
         self.data_structure.clear()
@@ -2070,12 +3051,12 @@ class QueueVisualizer(BaseVisualizer):
 
 
 class SequenceListVisualizer(BaseVisualizer):
+    supports_index_jump = True
+
     def __init__(self, main_window=None, lastwindow=None):
         super().__init__(main_window, lastwindow, "顺序表 (SequenceList) 可视化工具")
         self.data_structure = SequenceList()
         self.visual_area.set_data_structure(self.data_structure)
-        self.anim_timer = QTimer()
-        self.anim_timer.timeout.connect(self.update_animation)
 
     def _create_input_layout(self):
         l = QVBoxLayout()
@@ -2157,18 +3138,27 @@ class SequenceListVisualizer(BaseVisualizer):
                 else:
                     start_phase = 'shift_forward'
 
-                self.visual_area.anim_state = {
+                length = self.data_structure.length()
+                state = self.visual_area.anim_state = {
                     'type': 'seq_insert',
                     'target_idx': idx,
                     'new_val': val,
                     'phase': start_phase,
-                    'shift_index': self.data_structure.length() - 1,
+                    'shift_index': length - 1,
                     'progress': 0.0,
-                    'original_length': self.data_structure.length()
+                    'original_length': length
                 }
+                self.update_display()
 
-                self.anim_timer.setInterval(30)
-                self.anim_timer.start()
+                timeline = Timeline(on_finished=lambda: self._finish_insert(state))
+                shifts = length - idx
+                if shifts > 0:
+                    # 从表尾开始逐个后移，每个元素 750ms；下标与进度由同一个补间换算，长表也只占一个动画对象
+                    timeline.then(Tween(self.scaled_duration(750 * shifts),
+                                        lambda v: state.update(shift_index=length - 1 - int(v), progress=v - int(v)),
+                                        0, shifts, easing=linear, widget=self.visual_area))
+                    timeline.call(lambda: self._set_phase(state, 'move_in', "腾出空间，新元素移入..."))
+                self.play(timeline.then(self.state_tween(state, 750)))
                 self.status_label.setText(f"元素 {val} 悬浮在索引 {idx}，准备位移...")
             else:
                 # 禁用动画：直接插入
@@ -2220,137 +3210,86 @@ class SequenceListVisualizer(BaseVisualizer):
                         QMessageBox.information(self, "查找结果", f"未找到元素: {val}")
                     return
 
-                # 启用动画：按值删除，先启动查找动画
-                self.visual_area.anim_state = {
+                # 启用动画：按值删除，先启动查找动画（每 400ms 检查一个下标，直到找到目标或到表尾）
+                state = self.visual_area.anim_state = {
                     'type': 'seq_search',
                     'target_val': val,
                     'current_idx': 0,
                     'progress': 0.0
                 }
-                self.anim_timer.setInterval(400)
-                self.anim_timer.start()
+                self.update_display()
+                steps = target_idx + 1 if target_idx != -1 else self.data_structure.length()
+                self.play(Timeline(on_finished=lambda: self._finish_search(state, target_idx))
+                          .then(Tween(self.scaled_duration(400 * steps),
+                                      lambda v: self._search_step(state, min(int(v), steps) - 1),
+                                      0, steps, easing=linear, widget=self.visual_area)))
                 self.status_label.setText(f"开始查找元素 {val}...")
 
         except Exception as e:
             QMessageBox.warning(self, "错误", str(e))
 
     def start_deletion_phase(self, idx):
-        """开始执行删除动画的各个阶段"""
+        """开始执行删除动画的各个阶段：闪烁 -> 移出 -> 后置元素逐个前移"""
         if self.data_structure.is_empty(): return
 
-        self.visual_area.anim_state = {
+        state = self.visual_area.anim_state = {
             'type': 'seq_delete',
             'target_idx': idx,
             'phase': 'flash_target',
             'progress': 0.0,
             'flash_count': 0
         }
-        self.anim_timer.setInterval(100)
-        self.anim_timer.start()
+        self.update_display()
+        remaining = self.data_structure.length() - 1 - idx  # 删除后需要前移的元素个数
+        timeline = (Timeline(on_finished=self._finish_delete)
+                    .then(Tween(self.scaled_duration(1500), lambda v: state.update(flash_count=int(v)), 0, 15,
+                                easing=linear, widget=self.visual_area))
+                    .call(lambda: self._set_phase(state, 'move_out', "目标元素移出..."))
+                    .then(self.state_tween(state, 750))
+                    .call(lambda: self._remove_target(state)))
+        if remaining > 0:
+            timeline.then(Tween(self.scaled_duration(750 * remaining),
+                                lambda v: state.update(shift_index=idx + int(v), progress=v - int(v)),
+                                0, remaining, easing=linear, widget=self.visual_area))
+        self.play(timeline)
         self.status_label.setText(f"找到待删除元素，索引: {idx}，准备删除...")
 
-    # --- 动画更新逻辑修改 (降低速度，修正跳跃) ---
-    def update_animation(self):
-        state = self.visual_area.anim_state
-        if not state:
-            self.anim_timer.stop()
-            self.update_display()
+    def _search_step(self, state, i):
+        """查找动画检查到下标 i（下标变化时才刷新高亮与提示）"""
+        if i < 0 or i == self.highlighted_index:
             return
+        state['current_idx'] = i
+        self.highlighted_index = self.visual_area.highlighted_index = i
+        self.status_label.setText(f"查找中... 检查索引 {i} (值: {self.data_structure.get(i)})")
 
-        # 确保动画开关开启
-        if not self.anim_enabled:
-            self.anim_timer.stop()
-            self.visual_area.anim_state = {}
-            self.update_display()
+    def _finish_search(self, state, idx):
+        self.highlighted_index = -1
+        if idx != -1:
+            self.start_deletion_phase(idx)
             return
+        self.visual_area.anim_state = {}
+        self.update_display()
+        QMessageBox.information(self, "查找结果", f"未找到元素: {state['target_val']}")
 
-        anim_type = state['type']
-
-        if anim_type == 'seq_insert':
-            self.anim_timer.setInterval(30)
-            state['progress'] += 0.04
-
-            if state['phase'] == 'shift_forward':
-                if state['progress'] >= 1.0:
-                    state['progress'] = 0.0
-                    state['shift_index'] -= 1
-
-                    if state['shift_index'] < state['target_idx']:
-                        state['phase'] = 'move_in'
-                        self.status_label.setText("腾出空间，新元素移入...")
-
-            elif state['phase'] == 'move_in':
-                if state['progress'] >= 1.0:
-                    self.anim_timer.stop()
-                    self.data_structure.insert(state['target_idx'], state['new_val'])
-                    self.visual_area.anim_state = {}
-                    self.update_display()
-                    self.status_label.setText(f"插入完成: {state['new_val']} @ {state['target_idx']}")
-                    return
-
-        elif anim_type == 'seq_search':
-            self.highlighted_index = state['current_idx']
-            if state['current_idx'] < self.data_structure.length():
-                curr_val = self.data_structure.get(state['current_idx'])
-                self.status_label.setText(f"查找中... 检查索引 {state['current_idx']} (值: {curr_val})")
-
-                if str(curr_val) == str(state['target_val']):
-                    self.anim_timer.stop()
-                    self.highlighted_index = -1
-                    self.start_deletion_phase(state['current_idx'])
-                    return
-                else:
-                    state['current_idx'] += 1
-            else:
-                self.anim_timer.stop()
-                self.highlighted_index = -1
-                self.visual_area.anim_state = {}
-                self.update_display()
-                QMessageBox.information(self, "查找结果", f"未找到元素: {state['target_val']}")
-                return
-
-        elif anim_type == 'seq_delete':
-            self.anim_timer.setInterval(30)
-            state['progress'] += 0.04
-
-            if state['phase'] == 'flash_target':
-                state['flash_count'] += 1
-                if state['flash_count'] >= 15:
-                    state['progress'] = 0.0
-                    state['phase'] = 'move_out'
-                    self.anim_timer.setInterval(30)
-                    self.status_label.setText("目标元素移出...")
-                else:
-                    self.anim_timer.setInterval(100)
-
-            elif state['phase'] == 'move_out':
-                if state['progress'] >= 1.0:
-                    state['progress'] = 0.0
-                    self.data_structure.remove(state['target_idx'])
-
-                    if state['target_idx'] >= self.data_structure.length():
-                        state['phase'] = 'cleanup'
-                    else:
-                        state['phase'] = 'shift_backward'
-                        state['shift_index'] = state['target_idx']
-                        self.status_label.setText("后置元素向前位移...")
-
-            elif state['phase'] == 'shift_backward':
-                if state['progress'] >= 1.0:
-                    state['progress'] = 0.0
-                    state['shift_index'] += 1
-
-                    if state['shift_index'] >= self.data_structure.length():
-                        state['phase'] = 'cleanup'
+    def _finish_insert(self, state):
+        self.data_structure.insert(state['target_idx'], state['new_val'])
+        self.visual_area.anim_state = {}
+        self.update_display()
+        self.status_label.setText(f"插入完成: {state['new_val']} @ {state['target_idx']}")
 
-            elif state['phase'] == 'cleanup':
-                self.anim_timer.stop()
-                self.visual_area.anim_state = {}
-                self.update_display()
-                self.status_label.setText("删除并位移完成")
-                return
+    def _remove_target(self, state):
+        """移出动画结束，真正删除元素，然后让后置元素依次前移"""
+        self.data_structure.remove(state['target_idx'])
+        if state['target_idx'] >= self.data_structure.length():
+            self._set_phase(state, 'cleanup')
+        else:
+            self._set_phase(state, 'shift_backward', "后置元素向前位移...")
+            state['shift_index'] = state['target_idx']
 
+    def _finish_delete(self):
+        self.visual_area.anim_state = {}
         self.update_display()
+        self.status_label.setText("删除并位移完成")
 
     def handle_locate(self):
         text = self.input_val.text()
@@ -2361,6 +3300,7 @@ class SequenceListVisualizer(BaseVisualizer):
         idx = self.data_structure.locate(val)
         if idx != -1:
             self.highlighted_index = idx
+            self.reveal_index(idx)
             self.update_display()
             self.status_label.setText(f"找到元素 {val} 在索引: {idx}")
         else:
@@ -2389,8 +3329,6 @@ class LinkedListVisualizer(BaseVisualizer):
         super().__init__(main_window, lastwindow, "链表 (LinkedList) 可视化工具")
         self.data_structure = LinkedList()
         self.visual_area.set_data_structure(self.data_structure)
-        self.anim_timer = QTimer()
-        self.anim_timer.timeout.connect(self.update_animation)
 
     def _create_input_layout(self):
         l = QVBoxLayout()
@@ -2456,13 +3394,14 @@ class LinkedListVisualizer(BaseVisualizer):
             self.status_label.setText(f"已插入: {val} @ {idx}")
             return
 
-        start_phase = 'shift'
-        if idx >= self.data_structure.length():
-            start_phase = 'appear'
-        self.visual_area.anim_state = {'type': 'linked_insert', 'target_idx': idx, 'new_val': val, 'phase': start_phase,
-                                       'progress': 0.0}
-        self.anim_timer.setInterval(20)
-        self.anim_timer.start()
+        # 各阶段依次播放 400ms：后移 -> 出现 -> 连接后继 -> 连接前驱 -> 抬回链中
+        length = self.data_structure.length()
+        phases = (['shift'] if idx < length else []) + ['appear'] + (['link_next'] if idx < length else []) \
+            + (['link_prev'] if idx > 0 else []) + ['lift']
+        state = self.visual_area.anim_state = {'type': 'linked_insert', 'target_idx': idx, 'new_val': val,
+                                               'phase': phases[0], 'progress': 0.0}
+        self.update_display()
+        self.play(self._phase_timeline(state, phases, lambda: self._finish_insert(state)))
 
     def start_delete_animation(self, idx):
         if not self.anim_enabled:
@@ -2471,14 +3410,15 @@ class LinkedListVisualizer(BaseVisualizer):
             self.status_label.setText(f"已删除: {val} @ {idx}")
             return
 
-        self.visual_area.anim_state = {'type': 'linked_delete', 'target_idx': idx, 'phase': 'fade_prev_link',
-                                       'progress': 0.0}
-        self.anim_timer.setInterval(20)
-        self.anim_timer.start()
+        phases = ['fade_prev_link', 'drop', 'connect_bypass', 'fade_next_link', 'close']
+        state = self.visual_area.anim_state = {'type': 'linked_delete', 'target_idx': idx, 'phase': phases[0],
+                                               'progress': 0.0}
+        self.update_display()
+        self.play(self._phase_timeline(state, phases, lambda: self._finish_delete(state)))
 
     def start_search_animation(self, val):
+        idx = self.data_structure.locate(val)
         if not self.anim_enabled:
-            idx = self.data_structure.locate(val)
             if idx != -1:
                 self.highlighted_index = idx
                 self.status_label.setText(f"找到元素 {val} 在索引: {idx}")
@@ -2488,103 +3428,53 @@ class LinkedListVisualizer(BaseVisualizer):
             self.update_display()
             return
 
-        self.visual_area.anim_state = {'type': 'linked_search', 'current_idx': 0, 'target_val': val,
-                                       'phase': 'scanning', 'flash_time': 0}
-        self.visual_area.highlighted_index = -1
+        # 每 400ms 扫描一个节点；找到后闪烁约 3 秒
+        state = self.visual_area.anim_state = {'type': 'linked_search', 'current_idx': 0, 'target_val': val,
+                                               'phase': 'scanning', 'flash_time': 0}
+        self.highlighted_index = -1
         self.update_display()
-        self.anim_timer.setInterval(400)
-        self.anim_timer.start()
-
-    def update_animation(self):
-        state = self.visual_area.anim_state
-        if not state:
-            self.anim_timer.stop()
-            return
-
-        # 确保动画开关开启
-        if not self.anim_enabled:
-            self.anim_timer.stop()
-            self.visual_area.anim_state = {}
-            self.update_display()
-            return
+        steps = idx + 1 if idx != -1 else self.data_structure.length()
+        timeline = Timeline(on_finished=lambda: self._finish_search(idx)).then(
+            Tween(self.scaled_duration(400 * steps), lambda v: state.update(current_idx=min(int(v), steps - 1)),
+                  0, steps, easing=linear, widget=self.visual_area))
+        if idx != -1:
+            timeline.call(lambda: self._found(state, idx)).then(
+                Tween(self.scaled_duration(3100), lambda v: state.update(flash_time=int(v)), 0, 31,
+                      easing=linear, widget=self.visual_area))
+        self.play(timeline)
+
+    def _phase_timeline(self, state, phases, on_finished):
+        """按顺序播放各阶段，每个阶段的进度在 400ms 内从 0 走到 1"""
+        timeline = Timeline(on_finished=on_finished)
+        for i, phase in enumerate(phases):
+            if i:
+                timeline.call(lambda phase=phase: self._set_phase(state, phase))
+            timeline.then(self.state_tween(state, 400))
+        return timeline
+
+    def _found(self, state, idx):
+        state['phase'] = 'found'
+        self.highlighted_index = self.visual_area.highlighted_index = idx
+        self.status_label.setText(f"找到元素 {self.data_structure.get(idx)} 在索引 {idx}")
+
+    def _finish_search(self, idx):
+        self.visual_area.anim_state = {}
+        self.highlighted_index = -1
+        self.update_display()
+        if idx == -1:
+            QMessageBox.information(self, "提示", "未找到元素")
 
-        # Search Animation
-        if state['type'] == 'linked_search':
-            if state['phase'] == 'scanning':
-                idx = state['current_idx']
-                if idx < self.data_structure.length():
-                    self.visual_area.highlighted_index = -1
-                    curr_val = self.data_structure.get(idx)
-                    if str(curr_val) == str(state['target_val']):
-                        state['phase'] = 'found'
-                        self.highlighted_index = idx
-                        self.anim_timer.setInterval(100)
-                        self.status_label.setText(f"找到元素 {curr_val} 在索引 {idx}")
-                    else:
-                        state['current_idx'] += 1
-                else:
-                    self.highlighted_index = -1
-                    self.anim_timer.stop()
-                    self.visual_area.anim_state = {}
-                    self.update_display()
-                    QMessageBox.information(self, "提示", "未找到元素")
-                    return
-            elif state['phase'] == 'found':
-                state['flash_time'] += 1
-                if state['flash_time'] > 30:
-                    self.anim_timer.stop()
-                    self.visual_area.anim_state = {}
-                    self.highlighted_index = -1
-                    self.update_display()
-                    return
-            self.update_display()
-            if state['phase'] == 'found':
-                self.status_label.setText(f"找到元素 {state['target_val']} 在索引 {state['current_idx']}")
-            return
+    def _finish_insert(self, state):
+        self.data_structure.insert(state['target_idx'], state['new_val'])
+        self.visual_area.anim_state = {}
+        self.update_display()
+        self.status_label.setText("插入完成")
 
-        # Insert/Delete Animation
-        state['progress'] += 0.05
-        if state['progress'] >= 1.0:
-            state['progress'] = 0.0
-            if state['type'] == 'linked_insert':
-                curr = state['phase']
-                if curr == 'shift':
-                    state['phase'] = 'appear'
-                elif curr == 'appear':
-                    if state['target_idx'] < self.data_structure.length():
-                        state['phase'] = 'link_next'
-                    elif state['target_idx'] > 0:
-                        state['phase'] = 'link_prev'
-                    else:
-                        state['phase'] = 'lift'
-                elif curr == 'link_next':
-                    if state['target_idx'] > 0:
-                        state['phase'] = 'link_prev'
-                    else:
-                        state['phase'] = 'lift'
-                elif curr == 'link_prev':
-                    state['phase'] = 'lift'
-                elif curr == 'lift':
-                    self.data_structure.insert(state['target_idx'], state['new_val'])
-                    self.visual_area.anim_state = {}
-                    self.anim_timer.stop()
-                    self.status_label.setText("插入完成")
-            elif state['type'] == 'linked_delete':
-                curr = state['phase']
-                if curr == 'fade_prev_link':
-                    state['phase'] = 'drop'
-                elif curr == 'drop':
-                    state['phase'] = 'connect_bypass'
-                elif curr == 'connect_bypass':
-                    state['phase'] = 'fade_next_link'
-                elif curr == 'fade_next_link':
-                    state['phase'] = 'close'
-                elif curr == 'close':
-                    val = self.data_structure.remove(state['target_idx'])
-                    self.visual_area.anim_state = {}
-                    self.anim_timer.stop()
-                    self.status_label.setText(f"删除完成: {val}")
+    def _finish_delete(self, state):
+        val = self.data_structure.remove(state['target_idx'])
+        self.visual_area.anim_state = {}
         self.update_display()
+        self.status_label.setText(f"删除完成: {val}")
 
     def handle_head_insert(self):
         text = self.input_val.text()
@@ -2688,8 +3578,6 @@ class BinaryTreeVisualizer(BaseVisualizer):
         self.data_structure = BinaryTree()
         self.visual_area.set_data_structure(self.data_structure)
         self.current_traversal_result = []
-        self.anim_timer = QTimer()
-        self.anim_timer.timeout.connect(self.update_animation)
         self.is_animating = False  # 新增属性
 
     def _create_input_layout(self):
@@ -2796,10 +3684,14 @@ class BinaryTreeVisualizer(BaseVisualizer):
             new_node = parent_node.left_child if is_left else parent_node.right_child
 
             self.is_animating = True
-            self.visual_area.anim_state = {'type': 'tree_insert', 'target_node': new_node, 'phase': 'extend_line',
-                                           'progress': 0.0}
-            self.anim_timer.setInterval(30)
-            self.anim_timer.start()
+            state = self.visual_area.anim_state = {'type': 'tree_insert', 'target_node': new_node,
+                                                   'phase': 'extend_line', 'progress': 0.0}
+            self.update_display()
+            # 先伸出连线，再长出节点，各 600ms
+            self.play(Timeline(on_finished=lambda: self._finish_tree_animation("添加完成"))
+                      .then(self.state_tween(state, 600))
+                      .call(lambda: self._set_phase(state, 'grow_node'))
+                      .then(self.state_tween(state, 600)))
         else:
             if is_left:
                 self.data_structure.insert_left(p_idx, val)
@@ -2863,66 +3755,30 @@ class BinaryTreeVisualizer(BaseVisualizer):
 
             if self.anim_enabled:
                 self.is_animating = True
-                self.visual_area.anim_state = {'type': 'tree_delete', 'target_node': node_to_del, 'phase': 'fade',
-                                               'progress': 0.0}
-                self.anim_timer.setInterval(30)
-                self.anim_timer.start()
+                state = self.visual_area.anim_state = {'type': 'tree_delete', 'target_node': node_to_del,
+                                                       'phase': 'fade', 'progress': 0.0}
+                self.update_display()
+                self.play(Timeline(on_finished=lambda: self._finish_delete(node_to_del))
+                          .then(self.state_tween(state, 600)))
             else:
-                if parent_node.left_child == node_to_del:
-                    parent_node.left_child = None
-                elif parent_node.right_child == node_to_del:
-                    parent_node.right_child = None
-
-                # 简单更新 size (不精确，但比没做好)
-                # 由于 _get_node 依赖索引，删除子树后索引会变化，这里先不精确更新
-                self.data_structure._size -= 1  # 这是一个不精确的简化，实际应该递归计算
-
+                self.data_structure.remove_subtree(node_to_del)
                 self.update_display()
                 self.status_label.setText(f"已删除索引 {idx} 及其子树")
 
         except Exception as e:
             QMessageBox.warning(self, "删除失败", str(e))
 
-    def update_animation(self):
-        state = self.visual_area.anim_state
-        if not state:
-            self.anim_timer.stop()
-            self.is_animating = False
-            return
-
-        # 确保动画开关开启
-        if not self.anim_enabled:
-            self.anim_timer.stop()
-            self.visual_area.anim_state = {}
-            self.is_animating = False
-            self.update_display()
-            return
+    def _finish_delete(self, node):
+        # 淡出结束后才真正移除子树
+        if node.parent:
+            self.data_structure.remove_subtree(node)
+        self._finish_tree_animation("删除完成")
 
-        state['progress'] += 0.05
-        if state['progress'] >= 1.0:
-            state['progress'] = 0.0
-            if state['type'] == 'tree_insert':
-                if state['phase'] == 'extend_line':
-                    state['phase'] = 'grow_node'
-                elif state['phase'] == 'grow_node':
-                    self.visual_area.anim_state = {}
-                    self.anim_timer.stop()
-                    self.is_animating = False
-                    self.status_label.setText("添加完成")
-            elif state['type'] == 'tree_delete':
-                if state['phase'] == 'fade':
-                    node = state['target_node']
-                    if node.parent:
-                        if node.parent.left_child == node:
-                            node.parent.left_child = None
-                        else:
-                            node.parent.right_child = None
-                        self.data_structure._size -= 1  # 简化处理
-                    self.visual_area.anim_state = {}
-                    self.anim_timer.stop()
-                    self.is_animating = False
-                    self.status_label.setText("删除完成")
+    def _finish_tree_animation(self, message):
+        self.visual_area.anim_state = {}
+        self.is_animating = False
         self.update_display()
+        self.status_label.setText(message)
 
     def start_traversal(self, type_):
         if self.data_structure.is_empty():
@@ -2934,13 +3790,13 @@ class BinaryTreeVisualizer(BaseVisualizer):
         self.visual_area.traversal_text = ""
 
         if type_ == 'pre':
-            self._get_preorder_nodes(self.data_structure.root, self.animation_steps)
+            self.animation_steps = list(self.data_structure.iter_preorder())
             name = "前序"
         elif type_ == 'in':
-            self._get_inorder_nodes(self.data_structure.root, self.animation_steps)
+            self.animation_steps = list(self.data_structure.iter_inorder())
             name = "中序"
         else:
-            self._get_postorder_nodes(self.data_structure.root, self.animation_steps)
+            self.animation_steps = list(self.data_structure.iter_postorder())
             name = "后序"
 
         self.is_animating = True
@@ -2958,24 +3814,6 @@ class BinaryTreeVisualizer(BaseVisualizer):
             self.status_label.setText(f"{name}遍历完成: {self.visual_area.traversal_text}")
             QTimer.singleShot(5000, self.clear_traversal_text)
 
-    def _get_preorder_nodes(self, node, res):
-        if node:
-            res.append(node)
-            self._get_preorder_nodes(node.left_child, res)
-            self._get_preorder_nodes(node.right_child, res)
-
-    def _get_inorder_nodes(self, node, res):
-        if node:
-            self._get_inorder_nodes(node.left_child, res)
-            res.append(node)
-            self._get_inorder_nodes(node.right_child, res)
-
-    def _get_postorder_nodes(self, node, res):
-        if node:
-            self._get_postorder_nodes(node.left_child, res)
-            self._get_postorder_nodes(node.right_child, res)
-            res.append(node)
-
     def _run_traversal_animation(self):
         if not self.animation_steps or not self.anim_enabled:  # 再次检查开关
             self.visual_area.highlighted_node = None
@@ -3022,9 +3860,6 @@ class HuffmanTreeVisualizer(BaseVisualizer):
         self.struct_array = []
         self.visual_area.set_data_structure(self.struct_array)
 
-        self.anim_timer = QTimer()
-        self.anim_timer.timeout.connect(self.update_animation)
-
         self.forest_indices = []
         self.current_run_token = 0
         self.is_animating = False  # 新增属性
@@ -3049,13 +3884,39 @@ class HuffmanTreeVisualizer(BaseVisualizer):
         btn_rand = QPushButton("随机生成")
         btn_rand.setStyleSheet(STYLES["btn_random"])
         btn_rand.clicked.connect(self.random_build)
+        btn_file = QPushButton("从文件统计")
+        btn_file.setStyleSheet(STYLES["btn_random"])
+        btn_file.clicked.connect(self.build_from_files)
         l.addWidget(btn)
         l.addWidget(btn_rand)
+        l.addWidget(btn_file)
         return l
 
+    def build_from_files(self):
+        """统计所选文件的字节频率，填入权重输入框后构建"""
+        fnames, _ = QFileDialog.getOpenFileNames(self, "选择要统计的文件", "", "所有文件 (*)")
+        if not fnames: return
+        try:
+            from frequency_counter import count_frequencies
+            weights = count_frequencies(fnames)
+        except Exception as e:
+            QMessageBox.warning(self, "错误", f"统计失败: {e}")
+            return
+        if not weights:
+            QMessageBox.warning(self, "错误", "所选文件均为空")
+            return
+
+        # 可打印的字母数字直接显示，其余字节用十六进制表示，避免与 "," ":" 分隔符冲突
+        def label(b):
+            ch = chr(b)
+            return ch if ch.isascii() and ch.isalnum() else f"0x{b:02X}"
+
+        self.weight_input.setPlainText(", ".join(f"{label(b)}:{c}" for b, c in weights.items()))
+        self.build()
+
     def reset_environment(self):
         """强制重置环境，防止动画冲突"""
-        self.anim_timer.stop()
+        self.stop_animations()
         self.visual_area.anim_state = {}
         self.visual_area.node_positions = {}
 
@@ -3145,6 +4006,7 @@ class HuffmanTreeVisualizer(BaseVisualizer):
         if self.struct_array:
             root_idx = len(self.struct_array) - 1
             self.forest_indices = [root_idx]
+            self.visual_area.set_data_structure(self.struct_array)  # struct_array 已被替换为新列表
             self.calculate_final_positions(root_idx)
             self.update_display()
 
@@ -3167,13 +4029,11 @@ class HuffmanTreeVisualizer(BaseVisualizer):
             else:
                 pass
 
-        self.visual_area.anim_state = {
+        self._play_phase({
             'type': 'SORT',
             'targets': target_positions,
             'progress': 0.0
-        }
-        self.anim_timer.setInterval(30)
-        self.anim_timer.start()
+        })
         self.status_label.setText("按权重排序 (结构体数组索引)...")
 
     def _recursively_move_tree_by_index(self, idx, delta_x, delta_y, new_positions, visited=None):
@@ -3317,60 +4177,35 @@ class HuffmanTreeVisualizer(BaseVisualizer):
 
             curr_x += fspec['width'] + eff_gap
 
-        self.visual_area.anim_state = {
+        self._play_phase({
             'type': 'MOVE_TO_STAGE',
             'targets': target_positions,
             'left_idx': left_idx,
             'right_idx': right_idx,
             'parent_pos': new_parent_pos,
             'progress': 0.0
-        }
+        })
         self.status_label.setText(f"合并: {left_node.weight} + {right_node.weight}")
-        self.anim_timer.setInterval(30)
-        self.anim_timer.start()
-
-    def update_animation(self):
-        state = self.visual_area.anim_state
-        if not state:
-            self.anim_timer.stop()
-            self.is_animating = False
-            return
-
-        if not self.anim_enabled:  # 再次检查
-            self.anim_timer.stop()
-            self.visual_area.anim_state = {}
-            self.is_animating = False
-            self.update_display()
-            return
-
-        state['progress'] += 0.05
-        prog = state['progress']
-
-        if prog >= 1.0:
-            prog = 1.0
-            self.anim_timer.stop()
-            self.handle_phase_end(state)
-        else:
-            if 'targets' in state:
-                for idx, target in state['targets'].items():
-                    curr = self.visual_area.node_positions.get(idx)
-                    if not curr: curr = target
-
-                    # 平滑插值
-                    nx = curr[0] + (target[0] - curr[0]) * 0.2
-                    ny = curr[1] + (target[1] - curr[1]) * 0.2
-
-                    if abs(nx - target[0]) < 1 and abs(ny - target[1]) < 1:
-                        nx, ny = target
 
-                    self.visual_area.node_positions[idx] = [nx, ny]
+    def _play_phase(self, state, duration=570):
+        """
+        播放一个阶段：state 中的 targets 节点在 duration 毫秒内从当前位置缓动到目标位置，
+        结束后交给 handle_phase_end 进入下一阶段。
+        """
+        self.visual_area.anim_state = state
+        targets = state.get('targets', {})
+        starts = {idx: tuple(self.visual_area.node_positions.get(idx) or target) for idx, target in targets.items()}
 
-            if prog >= 0.95:
-                self.anim_timer.stop()
-                self.handle_phase_end(state)
-                return
+        def on_update(value):
+            state['progress'] = value
+            positions = self.visual_area.node_positions
+            for idx, (tx, ty) in targets.items():
+                sx, sy = starts[idx]
+                positions[idx] = [sx + (tx - sx) * value, sy + (ty - sy) * value]
 
         self.update_display()
+        self.play(Tween(self.scaled_duration(duration), on_update, easing=ease_out_cubic, widget=self.visual_area,
+                        on_finished=lambda: self.handle_phase_end(state)))
 
     def handle_phase_end(self, state):
         stype = state['type']
@@ -3378,6 +4213,7 @@ class HuffmanTreeVisualizer(BaseVisualizer):
 
         if stype == 'SORT':
             self.visual_area.anim_state = {}
+            self.update_display()
             QTimer.singleShot(300, lambda: self.safe_callback(token, self.start_merge_cycle))
 
         elif stype == 'MOVE_TO_STAGE':
@@ -3405,22 +4241,22 @@ class HuffmanTreeVisualizer(BaseVisualizer):
 
             self.visual_area.node_positions[new_idx] = p_pos
 
-            self.visual_area.anim_state = {
+            self._play_phase({
                 'type': 'MERGE_FLASH',
                 'active_parent_idx': new_idx,
                 'progress': 0.0
-            }
+            })
             self.status_label.setText(f"生成父节点 [{new_idx}] 权重: {new_weight}")
-            self.anim_timer.setInterval(30)
-            self.anim_timer.start()
 
         elif stype == 'MERGE_FLASH':
             self.visual_area.anim_state = {}
+            self.update_display()
             self.status_label.setText(f"合并完成，准备下一轮...")
             QTimer.singleShot(500, lambda: self.safe_callback(token, self.start_sorting_phase))
 
         elif stype == 'FINAL_MOVE':
             self.visual_area.anim_state = {}
+            self.update_display()
             self.is_animating = False
             self.status_label.setText("构建完成")
 
@@ -3430,27 +4266,32 @@ class HuffmanTreeVisualizer(BaseVisualizer):
         self.calculate_final_positions(root_idx)
 
         if self.anim_enabled:
-            self.visual_area.anim_state = {
+            self._play_phase({
                 'type': 'FINAL_MOVE',
                 'targets': self.visual_area.node_positions.copy(),
                 'progress': 0.0
-            }
+            })
             self.status_label.setText("构建完成！展示最终哈夫曼树")
-            self.anim_timer.setInterval(30)
-            self.anim_timer.start()
         else:
             self.is_animating = False
             self.status_label.setText("构建完成 (无动画)")
             self.update_display()
 
     def calculate_final_positions(self, root_idx):
-        """非动画模式或最终移动模式下，直接计算所有节点的最终位置"""
+        """非动画模式或最终移动模式下，直接计算所有节点的最终位置（整齐布局）"""
         self.visual_area.node_positions = {}
         if root_idx == -1: return
 
+        def children(idx):
+            node = self.struct_array[idx]
+            return (node.left if node.left != -1 else None,
+                    node.right if node.right != -1 else None)
+
+        layout = tidy_tree_layout(root_idx, children)
+        min_x, max_x = layout_extent(layout)
+
         UNIT_W = 50
-        width_leaves = self._get_tree_width(root_idx)
-        raw_width = width_leaves * UNIT_W
+        raw_width = (max_x - min_x + 1) * UNIT_W
 
         available_w = self.visual_area.width()
         scale = 1.0
@@ -3459,32 +4300,14 @@ class HuffmanTreeVisualizer(BaseVisualizer):
             if scale < 0.4: scale = 0.4
 
         eff_unit = UNIT_W * scale
-        cx = available_w // 2
+        level_h = 60 * max(0.6, scale)
+        cx = available_w / 2 - (min_x + max_x) / 2 * eff_unit
         cy = 80
 
         # 使用一个独立的字典来存储计算出的位置，避免影响动画
-        final_targets = {}
-
-        def place_node(idx, x, y, current_unit):
-            if idx == -1: return
-            final_targets[idx] = [x, y]
-            node = self.struct_array[idx]
-
-            my_rel = self._get_root_relative_x(idx, current_unit)
-
-            if node.left != -1:
-                l_rel = self._get_root_relative_x(node.left, current_unit)
-                l_x = (x - my_rel) + l_rel
-                place_node(node.left, l_x, y + 60 * max(0.6, scale), current_unit)
-
-            if node.right != -1:
-                w_l = self._get_tree_width(node.left) * current_unit
-                r_rel = self._get_root_relative_x(node.right, current_unit)
-                r_x = (x - my_rel) + w_l + r_rel
-                place_node(node.right, r_x, y + 60 * max(0.6, scale), current_unit)
-
-        place_node(root_idx, cx, cy, eff_unit)
-        self.visual_area.node_positions = final_targets
+        self.visual_area.node_positions = {
+            idx: [cx + x * eff_unit, cy + depth * level_h] for idx, (x, depth) in layout.items()
+        }
 
     def random_build(self):
         self.reset_environment()
@@ -3503,14 +4326,14 @@ class HuffmanTreeVisualizer(BaseVisualizer):
 
 
 class BinarySearchTreeVisualizer(BaseVisualizer):
+    PATH_END_HOLD = 2.0  # 查找路径走完后在终点停留的进度（每 1.0 为 750ms）
+
     def __init__(self, main_window=None, last_window=None):
         super().__init__(main_window, last_window, "二叉搜索树 (BST) 可视化工具")
         self.data_structure = BinarySearchTree()
         self.visual_area.set_data_structure(self.data_structure)
 
         self.is_animating = False
-        self.anim_timer = QTimer()
-        self.anim_timer.timeout.connect(self.update_animation)
 
         # 预设一些数据
         for v in [50, 30, 70, 20, 40, 60, 80]:
@@ -3592,9 +4415,8 @@ class BinarySearchTreeVisualizer(BaseVisualizer):
             'progress': 0.0,
             'path_history': []
         }
-        self.anim_timer.setInterval(30)
-        self.anim_timer.start()
         self.update_display()
+        self.play(self._path_timeline(self.visual_area.anim_state))
 
     def start_delete(self):
         """启动删除动画"""
@@ -3628,9 +4450,8 @@ class BinarySearchTreeVisualizer(BaseVisualizer):
             'progress': 0.0,
             'path_history': []
         }
-        self.anim_timer.setInterval(30)
-        self.anim_timer.start()
         self.update_display()
+        self.play(self._path_timeline(self.visual_area.anim_state))
 
     def start_search(self):
         """启动查找动画"""
@@ -3671,109 +4492,75 @@ class BinarySearchTreeVisualizer(BaseVisualizer):
             'progress': 0.0,
             'path_history': []
         }
-
-        self.anim_timer.setInterval(30)
-        self.anim_timer.start()
         self.update_display()
+        self.play(self._path_timeline(self.visual_area.anim_state))
 
-    def update_animation(self):
-        state = self.visual_area.anim_state
-        anim_type = state.get('type')
-        if not state or anim_type not in ['bst_search', 'bst_insert', 'bst_delete']:
-            self.anim_timer.stop()
-            self.is_animating = False
-            return
-
-        if not self.anim_enabled:  # 再次检查
-            self.anim_timer.stop()
-            self.visual_area.anim_state = {}
-            self.is_animating = False
-            self.update_display()
-            return
-
-        status = state['status']
+    def _path_timeline(self, state):
+        """
+        把查找路径展开为时间线：出现 -> 逐层（比较 -> 移动到子节点）-> 终点停留，结束后调用 _finish_path。
+        动画期间树不会被修改，因此路径与终点状态可以预先算出。
+        """
+        anim_type = state['type']
         target_val = state['target_val']
+        timeline = Timeline(on_finished=lambda: self._finish_path(state)).then(self.state_tween(state, 300))
         curr = state['current_node']
-
-        # 1. 出现阶段
-        if status == 'appear':
-            state['progress'] += 0.1
-            if state['progress'] >= 1.0:
-                state['progress'] = 0.0
-                state['status'] = 'compare'
-
-        # 2. 比较阶段
-        elif status == 'compare':
-            state['progress'] += 0.05
-            if state['progress'] >= 1.0:
-                state['progress'] = 0.0
-
-                if target_val == curr.data:
-                    if anim_type == 'bst_search':
-                        state['status'] = 'found'
-                        self.status_label.setText(f"找到元素: {target_val}")
-                    elif anim_type == 'bst_insert':
-                        state['status'] = 'found'
-                        self.status_label.setText(f"元素 {target_val} 已存在，不执行插入")
-                    elif anim_type == 'bst_delete':
-                        state['status'] = 'delete_found'
-                        self.status_label.setText(f"找到待删元素: {target_val}")
-
-                elif target_val < curr.data:
-                    if curr.left_child:
-                        state['next_node'] = curr.left_child
-                        state['status'] = 'move'
-                    else:
-                        if anim_type == 'bst_search' or anim_type == 'bst_delete':
-                            state['status'] = 'not_found'
-                            self.status_label.setText("元素不存在")
-                        elif anim_type == 'bst_insert':
-                            state['status'] = 'insert_found'
-                            self.status_label.setText("找到插入位置 (左)")
-
+        while True:
+            timeline.call(lambda: self._set_status(state, 'compare')).then(self.state_tween(state, 600))
+            if target_val == curr.data:
+                status, message = {
+                    'bst_search': ('found', f"找到元素: {target_val}"),
+                    'bst_insert': ('found', f"元素 {target_val} 已存在，不执行插入"),
+                    'bst_delete': ('delete_found', f"找到待删元素: {target_val}"),
+                }[anim_type]
+                break
+            go_left = target_val < curr.data
+            next_node = curr.left_child if go_left else curr.right_child
+            if next_node is None:
+                if anim_type == 'bst_insert':
+                    status, message = 'insert_found', f"找到插入位置 ({'左' if go_left else '右'})"
                 else:
-                    if curr.right_child:
-                        state['next_node'] = curr.right_child
-                        state['status'] = 'move'
-                    else:
-                        if anim_type == 'bst_search' or anim_type == 'bst_delete':
-                            state['status'] = 'not_found'
-                            self.status_label.setText("元素不存在")
-                        elif anim_type == 'bst_insert':
-                            state['status'] = 'insert_found'
-                            self.status_label.setText("找到插入位置 (右)")
-
-        # 3. 移动阶段
-        elif status == 'move':
-            state['progress'] += 0.05
-            if state['progress'] >= 1.0:
-                state['path_history'].append(curr)
-                state['current_node'] = state['next_node']
-                state['next_node'] = None
-                state['progress'] = 0.0
-                state['status'] = 'compare'
-
-        # 4. 终结阶段处理
-        elif status in ['found', 'not_found', 'insert_found', 'delete_found']:
-            state['progress'] += 0.04
-            if state['progress'] >= 2.0:
-                self.anim_timer.stop()
-                self.is_animating = False
-
-                if status == 'insert_found':
-                    self.data_structure.insert(target_val)
-                    self.status_label.setText(f"已插入: {target_val}")
-                elif status == 'delete_found':
-                    self.data_structure.delete(target_val)
-                    self.status_label.setText(f"已删除: {target_val}")
-                elif status == 'not_found' and anim_type == 'bst_search':
-                    QMessageBox.information(self, "查找结果", f"未找到元素: {target_val}")
-
-                self.visual_area.anim_state = {}
-                self.value_input.setFocus()
-                self.update_display()
-                return
+                    status, message = 'not_found', "元素不存在"
+                break
+            timeline.call(lambda next_node=next_node: self._set_status(state, 'move', next_node=next_node))
+            timeline.then(self.state_tween(state, 600))
+            timeline.call(lambda curr=curr: self._step_down(state, curr))
+            curr = next_node
+        timeline.call(lambda: self._set_status(state, status, message=message))
+        return timeline.then(self.state_tween(state, 750 * self.PATH_END_HOLD, end=self.PATH_END_HOLD))
+
+    def _set_status(self, state, status, message=None, **changes):
+        """查找路径动画切换到下一个状态，进度归零"""
+        state.update(changes, status=status, progress=0.0)
+        if message:
+            self.status_label.setText(message)
+
+    @staticmethod
+    def _step_down(state, node):
+        """移动结束：当前节点记入路径，下移到子节点"""
+        state['path_history'].append(node)
+        state['current_node'] = state['next_node']
+        state['next_node'] = None
+
+    def _finish_path(self, state):
+        """查找路径动画结束：按终点状态执行插入 / 删除或给出提示"""
+        self.is_animating = False
+        status = state['status']
+        target_val = state['target_val']
+        if status == 'insert_found':
+            self.data_structure.insert(target_val)
+            self.visual_area.notify_subtree_changed(self.data_structure.search(target_val))
+            self.status_label.setText(f"已插入: {target_val}")
+        elif status == 'delete_found':
+            node = self.data_structure.search(target_val)
+            if node is not None:
+                # 与 delete() 相同，但拿到被物理移除节点的父节点，只需局部更新布局
+                self.visual_area.notify_subtree_changed(self.data_structure._delete_node(node))
+            self.status_label.setText(f"已删除: {target_val}")
+        elif status == 'not_found' and state['type'] == 'bst_search':
+            QMessageBox.information(self, "查找结果", f"未找到元素: {target_val}")
 
+        self.visual_area.anim_state = {}
+        self.value_input.setFocus()
         self.update_display()
 
     def clear_tree(self):
@@ -3792,6 +4579,9 @@ class BinarySearchTreeVisualizer(BaseVisualizer):
 
 
 class AVLTreeVisualizer(BinarySearchTreeVisualizer):
+    MORPH_DURATION = 600  # 单次 Morph（布局过渡 / 旋转）动画时长，毫秒
+    PATH_END_HOLD = 1.0  # 找到位置后停留较短时间即进入 Morph
+
     def __init__(self, main_window=None, last_window=None):
         super().__init__(main_window, last_window)
         self.title = "AVL树 (分步旋转演示版)"
@@ -3800,6 +4590,7 @@ class AVLTreeVisualizer(BinarySearchTreeVisualizer):
         # 初始化 AVL 树
         self.data_structure = AVLTree()
         self.visual_area.set_data_structure(self.data_structure)
+        self.anim_timer = self.create_anim_timer()  # 平衡检查逐节点回溯
 
         # 核心变量
         self.balance_check_start_node = None
@@ -3850,7 +4641,8 @@ class AVLTreeVisualizer(BinarySearchTreeVisualizer):
             'current_node': self.data_structure.root, 'next_node': None,
             'status': 'appear', 'progress': 0.0, 'path_history': []
         }
-        self._connect_timer(self.update_insert_animation)
+        self.update_display()
+        self.play(self._path_timeline(self.visual_area.anim_state))
         self.status_label.setText(f"查找插入位置: {val}...")
 
     def start_delete(self):
@@ -3874,68 +4666,62 @@ class AVLTreeVisualizer(BinarySearchTreeVisualizer):
             'current_node': self.data_structure.root, 'next_node': None,
             'status': 'appear', 'progress': 0.0, 'path_history': []
         }
-        self._connect_timer(self.update_delete_animation)
+        self.update_display()
+        self.play(self._path_timeline(self.visual_area.anim_state))
 
     # --- 动画逻辑 ---
-    def update_insert_animation(self):
-        state = self.visual_area.anim_state
-        if state.get('type') == 'bst_insert' and state.get('status') in ['insert_found', 'found'] and state.get('progress') >= 1.0:
-            self.anim_timer.stop()
-            val = state['target_val']
-
-            if state['status'] == 'found':
-                self.finish_operation("元素已存在")
-                return
-
-            start_positions = self.visual_area.calculate_all_node_positions()
-            new_node = self.data_structure.insert(val, auto_balance=False)
-            self.balance_check_start_node = new_node
-            self._sync_root()
-            end_positions = self.visual_area.calculate_all_node_positions()
+    def _finish_path(self, state):
+        """查找路径走完：关闭自动平衡执行插入 / 删除，再用 Morph 动画过渡到新布局"""
+        if state['type'] == 'bst_insert':
+            self._finish_insert_path(state)
+        elif state['type'] == 'bst_delete':
+            self._finish_delete_path(state)
+        else:
+            super()._finish_path(state)
 
-            self.visual_area.anim_state = {
-                'type': 'morph', 'start_positions': start_positions, 'end_positions': end_positions,
-                'pivot': None, 'new_root': None, 'progress': 0.0, 'next_action': 'check_balance'
-            }
-            self.status_label.setText(f"插入完成，准备检查平衡...")
-            self._connect_timer(self.update_morph_animation)
+    def _finish_insert_path(self, state):
+        if state['status'] == 'found':
+            self.finish_operation("元素已存在")
             return
-        super().update_animation()
 
-    def update_delete_animation(self):
-        state = self.visual_area.anim_state
-        target_statuses = ['found', 'delete_found', 'not_found']
+        start_positions = dict(self.visual_area.get_node_positions())
+        new_node = self.data_structure.insert(state['target_val'], auto_balance=False)
+        self.balance_check_start_node = new_node
+        self._sync_root()
+        end_positions = self._relayout_after(new_node)
 
-        if state.get('type') == 'bst_delete' and state.get('status') in target_statuses and state.get('progress') >= 1.0:
-            self.anim_timer.stop()
-            try:
-                val = state['target_val']
-                if state['status'] == 'not_found':
-                    self.finish_operation("元素不存在")
-                    return
+        self.visual_area.anim_state = {
+            'type': 'morph', 'start_positions': start_positions, 'end_positions': end_positions,
+            'pivot': None, 'new_root': None, 'progress': 0.0, 'next_action': 'check_balance'
+        }
+        self.status_label.setText(f"插入完成，准备检查平衡...")
+        self._start_morph_animation()
 
-                start_positions = self.visual_area.calculate_all_node_positions()
+    def _finish_delete_path(self, state):
+        if state['status'] == 'not_found':
+            self.finish_operation("元素不存在")
+            return
+        try:
+            start_positions = dict(self.visual_area.get_node_positions())
 
-                # 物理删除，关闭自动平衡以展示动画
-                balance_start_node = self.data_structure.delete(val, auto_balance=False)
+            # 物理删除，关闭自动平衡以展示动画
+            balance_start_node = self.data_structure.delete(state['target_val'], auto_balance=False)
 
-                self.balance_check_start_node = balance_start_node
-                self._sync_root()
-                end_positions = self.visual_area.calculate_all_node_positions()
+            self.balance_check_start_node = balance_start_node
+            self._sync_root()
+            end_positions = self._relayout_after(balance_start_node)
 
-                is_tree_empty = self.data_structure.root is None
-                self.visual_area.anim_state = {
-                    'type': 'morph', 'start_positions': start_positions, 'end_positions': end_positions,
-                    'pivot': None, 'new_root': None, 'progress': 0.0,
-                    'next_action': 'finish' if is_tree_empty else 'check_balance'
-                }
-                self.status_label.setText(f"删除完成，调整布局...")
-                self._connect_timer(self.update_morph_animation)
-            except Exception as e:
-                print(f"Delete Error: {e}")
-                self.finish_operation("删除发生错误")
-            return
-        super().update_animation()
+            is_tree_empty = self.data_structure.root is None
+            self.visual_area.anim_state = {
+                'type': 'morph', 'start_positions': start_positions, 'end_positions': end_positions,
+                'pivot': None, 'new_root': None, 'progress': 0.0,
+                'next_action': 'finish' if is_tree_empty else 'check_balance'
+            }
+            self.status_label.setText(f"删除完成，调整布局...")
+            self._start_morph_animation()
+        except Exception as e:
+            print(f"Delete Error: {e}")
+            self.finish_operation("删除发生错误")
 
     # --- 平衡与旋转核心逻辑 ---
 
@@ -4031,7 +4817,7 @@ class AVLTreeVisualizer(BinarySearchTreeVisualizer):
         direction, node = self.rotation_queue.pop(0)
 
         # 1. 记录当前状态
-        start_pos = self.visual_area.calculate_all_node_positions()
+        start_pos = dict(self.visual_area.get_node_positions())
 
         # 2. 执行单步物理旋转
         pivot = node
@@ -4047,8 +4833,8 @@ class AVLTreeVisualizer(BinarySearchTreeVisualizer):
 
         self._sync_root() # 关键：防止布局计算崩溃
 
-        # 3. 记录新状态
-        end_pos = self.visual_area.calculate_all_node_positions()
+        # 3. 记录新状态：旋转只改变以 new_root 为根的局部结构，增量更新布局
+        end_pos = self._relayout_after(new_root)
 
         # 4. 启动 Morph 动画
         self.visual_area.anim_state = {
@@ -4062,30 +4848,33 @@ class AVLTreeVisualizer(BinarySearchTreeVisualizer):
         }
 
         self.status_label.setText(f"执行: {desc}")
-        self._connect_timer(self.update_morph_animation)
+        self._start_morph_animation()
+
+    def _relayout_after(self, changed_node):
+        """局部结构变化后增量更新布局，返回变化后的全部节点坐标（副本，供 morph 动画使用）"""
+        self.visual_area.notify_subtree_changed(changed_node)
+        return dict(self.visual_area.get_node_positions())
 
-    def update_morph_animation(self):
-        """处理 Morph 动画帧"""
+    def _start_morph_animation(self):
+        """启动 Morph 动画：由共享时钟按真实时间推进进度，结束后执行 next_action"""
+        self.anim_timer.stop()
         state = self.visual_area.anim_state
-        state['progress'] += 0.05
+        if hasattr(self.visual_area, 'prepare_morph'):
+            self.visual_area.prepare_morph(state)  # 起止坐标、透明度与连线只整理一次
+        self.play(Tween(self.scaled_duration(self.MORPH_DURATION), lambda v: state.__setitem__('progress', v),
+                        easing=ease_in_out_quad, widget=self.visual_area,
+                        on_finished=lambda: self._on_morph_finished(state)))
 
-        if state['progress'] >= 1.0:
-            self.anim_timer.stop()
-            state['progress'] = 1.0
-            self.visual_area.update() # 绘制最后一帧
-
-            next_action = state.get('next_action')
-
-            if next_action == 'check_balance':
-                self.start_balance_check_animation()
-            elif next_action == 'next_rotation_step':
-                # 继续执行队列中的下一个旋转
-                self.process_rotation_queue()
-            elif next_action == 'finish':
-                self.finish_operation("操作完成")
-            return
+    def _on_morph_finished(self, state):
+        next_action = state.get('next_action')
 
-        self.visual_area.update()
+        if next_action == 'check_balance':
+            self.start_balance_check_animation()
+        elif next_action == 'next_rotation_step':
+            # 继续执行队列中的下一个旋转
+            self.process_rotation_queue()
+        elif next_action == 'finish':
+            self.finish_operation("操作完成")
 
     def finish_operation(self, msg=""):
         self.is_animating = False
@@ -4093,7 +4882,7 @@ class AVLTreeVisualizer(BinarySearchTreeVisualizer):
         if msg: self.status_label.setText(msg)
         try: self.anim_timer.timeout.disconnect()
         except: pass
-        self.anim_timer.stop()
+        self.stop_animations()
         self.update_display()
 
     def random_build(self):